@@ -1,33 +1,116 @@
 """FastAPI dependency providers."""
-from fastapi import Depends, Request
+from collections.abc import AsyncIterator
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db_session
-from app.utils.rate_limiter import RateLimiter
+from app.core.cache import get_user_cache
+from app.core.config import get_settings
+from app.core.database import get_db_session, get_read_session_factory, get_session_factory
+from app.utils.rate_limiter import BaseRateLimiter
 from app.services.analysis_service import AnalysisService
+from app.services.chat_service import ChatService
 from app.services.conversation_service import ConversationService
+from app.services.crisis_detection_service import get_crisis_detector
+from app.services.crisis_event_log import get_crisis_event_log
+from app.services.integrations.claude import get_llm_client
+from app.services.trends import TrendConfig
 from app.services.user_service import UserService
 
 
-async def get_user_service(session: AsyncSession = Depends(get_db_session)) -> UserService:
-    return UserService(session)
+# Function scope ends the session dependency before the response is sent, so the request's
+# unit of work has committed (or failed with a 500) by the time the client sees a status.
+DbSession = Annotated[AsyncSession, Depends(get_db_session, scope="function")]
+
+
+async def get_read_db_session(session: DbSession) -> AsyncIterator[AsyncSession]:
+    """Session for replica-tolerant reads; the request's primary session without a replica."""
+
+    factory = get_read_session_factory()
+    if factory is None:
+        yield session
+        return
+    async with factory() as read_session:
+        yield read_session
+
+
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db_session, scope="function")]
+
+
+async def get_user_service(session: DbSession) -> UserService:
+    return UserService(
+        session,
+        cache=get_user_cache(),
+        broadcast_invalidations=get_settings().user_cache_broadcast,
+    )
+
+
+async def get_conversation_service(
+    session: DbSession,
+    read_session: ReadDbSession,
+) -> ConversationService:
+    return ConversationService(
+        session,
+        read_session=read_session,
+        crisis_detector=get_crisis_detector(),
+        on_crisis=get_crisis_event_log().record,
+    )
+
+
+async def get_analysis_service(
+    session: DbSession,
+    read_session: ReadDbSession,
+) -> AnalysisService:
+    return AnalysisService(
+        session, read_session=read_session, trend_config=TrendConfig.from_settings()
+    )
+
+
+async def get_chat_service() -> ChatService:
+    return ChatService(
+        get_session_factory(),
+        get_llm_client(),
+        history_messages=get_settings().chat_history_messages,
+        crisis_detector=get_crisis_detector(),
+        on_crisis=get_crisis_event_log().record,
+    )
+
+
+# Environments where the unauthenticated ``X-User-ID`` header may identify the caller.
+# Anything else (staging, production, a typo) fails closed.
+HEADER_AUTH_ENVIRONMENTS = frozenset({"local", "development", "test"})
 
 
-async def get_conversation_service(session: AsyncSession = Depends(get_db_session)) -> ConversationService:
-    return ConversationService(session)
+async def get_current_user_id(x_user_id: Annotated[UUID, Header(alias="X-User-ID")]) -> UUID:
+    """Identify the caller from ``X-User-ID``.
 
+    Placeholder until bearer-token authentication exists; routes depend on this, so
+    swapping in token verification needs no route changes. The header is trusted as-is,
+    so it is refused outside ``HEADER_AUTH_ENVIRONMENTS``.
+    """
 
-async def get_analysis_service(session: AsyncSession = Depends(get_db_session)) -> AnalysisService:
-    return AnalysisService(session)
+    if get_settings().environment not in HEADER_AUTH_ENVIRONMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication is required."
+        )
+    return x_user_id
 
 
-async def get_signup_rate_limiter(request: Request) -> RateLimiter:
+async def get_signup_rate_limiter(request: Request) -> BaseRateLimiter:
     return request.app.state.signup_rate_limiter
 
 
 __all__ = [
+    "HEADER_AUTH_ENVIRONMENTS",
+    "DbSession",
+    "ReadDbSession",
+    "get_read_db_session",
     "get_user_service",
     "get_conversation_service",
     "get_analysis_service",
+    "get_chat_service",
+    "get_current_user_id",
     "get_signup_rate_limiter",
 ]
@@ -0,0 +1,229 @@
+"""Prometheus ``/metrics`` endpoint and the collectors behind it."""
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import get_user_cache
+from app.core.database import get_pool_stats, get_session_factory
+from app.core.logging import log_event
+from app.core.metrics import MetricFamily, MetricsMiddleware, MetricsRegistry
+from app.core.security import get_hashing_pool
+from app.repositories.job import JobQueueStats, JobRepository
+from app.services.crisis_event_log import peek_crisis_event_log
+from app.services.integrations.claude import peek_llm_client
+from app.utils.rate_limiter import BaseRateLimiter, RateLimiter
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Well under a typical scrape timeout, so a stalled database costs one family, not the scrape.
+JOB_QUEUE_TIMEOUT_SECONDS = 2.0
+
+
+def install_metrics(app: FastAPI) -> MetricsRegistry:
+    """Add request metrics middleware, register collectors and mount ``GET /metrics``."""
+
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route.",
+        ("method", "route", "status"),
+    )
+    in_flight = registry.gauge(
+        "http_requests_in_flight", "HTTP requests currently being served.", ("method",)
+    )
+    app.add_middleware(MetricsMiddleware, latency=latency, in_flight=in_flight)
+
+    async def collect_rate_limiters() -> Iterable[MetricFamily]:
+        return _rate_limiter_families({"signup": app.state.signup_rate_limiter})
+
+    registry.add_collector(_collect_job_queue)  # first, so the pool stats include its checkout
+    registry.add_collector(_collect_db_pool)
+    registry.add_collector(_collect_hashing_pool)
+    registry.add_collector(collect_rate_limiters)
+    registry.add_collector(_collect_user_cache)
+    registry.add_collector(_collect_llm_client)
+    registry.add_collector(_collect_crisis_event_log)
+
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(await registry.render(), media_type=CONTENT_TYPE)
+
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    app.state.metrics = registry
+    return registry
+
+
+async def _collect_db_pool() -> Iterable[MetricFamily]:
+    stats = get_pool_stats()
+    if stats is None:
+        return []
+    return [
+        MetricFamily("db_pool_size", "gauge", "Configured pool size.").add(stats.size),
+        MetricFamily("db_pool_checked_out", "gauge", "Connections in use.").add(
+            stats.checked_out
+        ),
+        MetricFamily("db_pool_overflow", "gauge", "Overflow connections open.").add(
+            stats.overflow
+        ),
+        MetricFamily("db_pool_checkouts_total", "counter", "Connection checkouts.").add(
+            stats.checkouts
+        ),
+        MetricFamily(
+            "db_pool_overflow_checkouts_total", "counter", "Checkouts served above pool size."
+        ).add(stats.overflow_checkouts),
+        MetricFamily("db_pool_timeouts_total", "counter", "Checkouts that timed out.").add(
+            stats.timeouts
+        ),
+        MetricFamily(
+            "db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection."
+        ).add(stats.checkout_wait_seconds),
+        MetricFamily(
+            "db_pool_checkout_wait_seconds_max", "gauge", "Longest wait for a connection."
+        ).add(stats.max_checkout_wait_seconds),
+    ]
+
+
+async def _collect_hashing_pool() -> Iterable[MetricFamily]:
+    stats = get_hashing_pool().stats
+    return [
+        MetricFamily("password_hash_pending", "gauge", "Hashes queued or running.").add(
+            stats.pending
+        ),
+        MetricFamily("password_hash_completed_total", "counter", "Hashes completed.").add(
+            stats.completed
+        ),
+        MetricFamily(
+            "password_hash_rejected_total", "counter", "Hashes rejected as over capacity."
+        ).add(stats.rejected),
+        MetricFamily(
+            "password_hash_queue_wait_seconds_total", "counter", "Time hashes spent queued."
+        ).add(stats.queue_wait_seconds),
+        MetricFamily(
+            "password_hash_seconds_total", "counter", "Time spent computing hashes."
+        ).add(stats.hash_seconds),
+    ]
+
+
+def _rate_limiter_families(limiters: dict[str, BaseRateLimiter]) -> list[MetricFamily]:
+    decisions = MetricFamily(
+        "rate_limit_decisions_total", "counter", "Rate limiter decisions.", ("scope", "decision")
+    )
+    keys = MetricFamily(
+        "rate_limit_tracked_keys", "gauge", "Keys held by in-memory limiters.", ("scope",)
+    )
+    evictions = MetricFamily(
+        "rate_limit_evictions_total", "counter", "Keys evicted at the memory cap.", ("scope",)
+    )
+    for scope, limiter in limiters.items():
+        stats = limiter.stats
+        decisions.add(stats.allowed, scope, "allowed").add(stats.rejected, scope, "rejected")
+        if isinstance(limiter, RateLimiter):
+            keys.add(stats.keys, scope)
+            evictions.add(stats.evictions, scope)
+    return [decisions, keys, evictions]
+
+
+async def _collect_user_cache() -> Iterable[MetricFamily]:
+    cache = get_user_cache()
+    if cache is None:
+        return []
+    stats = cache.stats
+    lookups = MetricFamily(
+        "user_cache_lookups_total", "counter", "User cache lookups by outcome.", ("result",)
+    )
+    lookups.add(stats.hits, "hit").add(stats.misses, "miss").add(stats.coalesced, "coalesced")
+    return [
+        lookups,
+        MetricFamily("user_cache_entries", "gauge", "Cached user snapshots.").add(stats.size),
+        MetricFamily("user_cache_evictions_total", "counter", "LRU evictions.").add(
+            stats.evictions
+        ),
+    ]
+
+
+async def _collect_llm_client() -> Iterable[MetricFamily]:
+    client = peek_llm_client()
+    if client is None:
+        return []
+    stats = client.stats
+    breaker = client.breaker.stats
+    state = MetricFamily(
+        "llm_circuit_state", "gauge", "1 for the breaker's current state.", ("state",)
+    )
+    for name in ("closed", "open", "half_open"):
+        state.add(1 if breaker.state == name else 0, name)
+    return [
+        MetricFamily("llm_requests_in_flight", "gauge", "LLM calls holding a slot.").add(
+            stats.in_flight
+        ),
+        MetricFamily("llm_requests_total", "counter", "LLM HTTP attempts.").add(stats.requests),
+        MetricFamily("llm_retries_total", "counter", "LLM attempts retried.").add(stats.retries),
+        MetricFamily("llm_failures_total", "counter", "LLM calls that failed.").add(
+            stats.failures
+        ),
+        MetricFamily(
+            "llm_rejected_total", "counter", "LLM calls refused by the breaker or queue timeout."
+        ).add(stats.rejected),
+        state,
+        MetricFamily("llm_circuit_opened_total", "counter", "Times the breaker opened.").add(
+            breaker.opened
+        ),
+    ]
+
+
+async def _collect_crisis_event_log() -> Iterable[MetricFamily]:
+    log = peek_crisis_event_log()
+    if log is None:
+        return []
+    stats = log.stats
+    return [
+        MetricFamily("crisis_events_pending", "gauge", "Crisis events queued for writing.").add(
+            stats.pending
+        ),
+        MetricFamily("crisis_events_written_total", "counter", "Crisis events written.").add(
+            stats.written
+        ),
+        MetricFamily(
+            "crisis_event_batches_total", "counter", "Multi-row crisis event inserts."
+        ).add(stats.batches),
+        MetricFamily(
+            "crisis_event_flush_failures_total", "counter", "Crisis event batches that failed."
+        ).add(stats.failures),
+        MetricFamily(
+            "crisis_events_dropped_total", "counter", "Crisis events that could not be written."
+        ).add(stats.dropped),
+    ]
+
+
+async def _collect_job_queue() -> Iterable[MetricFamily]:
+    errors = MetricFamily(
+        "metrics_collector_errors",
+        "gauge",
+        "1 when the collector failed during this scrape.",
+        ("collector",),
+    )
+    try:
+        queue = await asyncio.wait_for(_job_queue_stats(), JOB_QUEUE_TIMEOUT_SECONDS)
+    except (SQLAlchemyError, OSError) as exc:  # TimeoutError is an OSError
+        log_event("metrics_job_queue_unavailable", level=logging.WARNING, error=repr(exc))
+        return [errors.add(1, "job_queue")]
+    depth = MetricFamily(
+        "job_queue_depth", "gauge", "Pending jobs by name and state.", ("name", "state")
+    )
+    age = MetricFamily(
+        "job_queue_oldest_ready_seconds", "gauge", "Age of the oldest due job.", ("name",)
+    )
+    for stats in queue:
+        depth.add(stats.ready, stats.name, "ready").add(stats.delayed, stats.name, "delayed")
+        age.add(stats.oldest_ready_seconds, stats.name)
+    return [depth, age, errors.add(0, "job_queue")]
+
+
+async def _job_queue_stats() -> list[JobQueueStats]:
+    async with get_session_factory()() as session:
+        return await JobRepository(session).queue_stats()
+
+
+__all__ = ["install_metrics"]
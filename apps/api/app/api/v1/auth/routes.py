@@ -2,10 +2,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from app.api.dependencies import get_signup_rate_limiter, get_user_service
+from app.core.security import PasswordHasherBusyError
 from app.schemas.user import SignupResponse, UserCreate, UserRead
 from app.services.exceptions import EmailAlreadyExistsError
 from app.services.user_service import UserService
-from app.utils.rate_limiter import RateLimiter
+from app.utils.rate_limiter import BaseRateLimiter
 
 router = APIRouter()
 
@@ -15,7 +16,7 @@ async def signup(
     payload: UserCreate,
     request: Request,
     service: UserService = Depends(get_user_service),
-    limiter: RateLimiter = Depends(get_signup_rate_limiter),
+    limiter: BaseRateLimiter = Depends(get_signup_rate_limiter),
 ) -> SignupResponse:
     """Create a new user using the provided credentials.
 
@@ -32,6 +33,12 @@ async def signup(
         user = await service.register_user(payload)
     except EmailAlreadyExistsError as exc:  # pragma: no cover - thin handler
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    except PasswordHasherBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Signup is temporarily busy. Try again shortly.",
+            headers={"Retry-After": "1"},
+        ) from exc
     except ValueError as exc:  # pragma: no cover
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
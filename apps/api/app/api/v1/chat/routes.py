@@ -0,0 +1,81 @@
+"""Chat routes."""
+import json
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import get_chat_service, get_current_user_id
+from app.core.logging import log_event
+from app.schemas.chat import ChatSendRequest
+from app.services.chat_service import ChatService, ChatTurn
+from app.services.exceptions import LLMError, UserNotFoundError
+
+router = APIRouter()
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.post("/send", response_class=StreamingResponse)
+async def send_message(
+    payload: ChatSendRequest,
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    service: Annotated[ChatService, Depends(get_chat_service)],
+) -> StreamingResponse:
+    """Save the message and stream the coach reply as Server-Sent Events.
+
+    Events: ``start`` with the saved message ID and, if the message reads as a crisis, its
+    severity and the resources to show (sent before the model is called, so the first
+    byte does not wait on generation), one ``delta`` per text fragment, then ``done``
+    with the saved reply, or ``error`` if the model or saving the reply fails. The user's
+    message is kept either way; a reply is only saved once it is complete.
+    """
+
+    try:
+        turn = await service.start_turn(user_id, payload.message)
+    except UserNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return StreamingResponse(
+        _reply_events(service, turn), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+async def _reply_events(service: ChatService, turn: ChatTurn) -> AsyncIterator[str]:
+    start: dict[str, Any] = {"message_id": str(turn.message_id), "crisis_detected": False}
+    if turn.crisis.detected:
+        start.update(
+            crisis_detected=True,
+            severity=turn.crisis.severity,
+            resources=[asdict(resource) for resource in turn.crisis.resources],
+        )
+    yield _sse("start", start)
+    parts: list[str] = []
+    try:
+        async for text in service.stream_reply(turn):
+            parts.append(text)
+            yield _sse("delta", {"text": text})
+        reply = await service.save_reply(turn, "".join(parts))
+    except LLMError as exc:
+        log_event(
+            "chat_reply_failed", level=logging.WARNING, user_id=str(turn.user_id), error=str(exc)
+        )
+        yield _sse("error", {"detail": "The coach is unavailable right now. Please try again."})
+        return
+    except Exception as exc:  # noqa: BLE001 - the 200 is already sent; end with an error event
+        log_event(
+            "chat_reply_failed", level=logging.ERROR, user_id=str(turn.user_id), error=repr(exc)
+        )
+        yield _sse("error", {"detail": "The reply could not be completed. Please try again."})
+        return
+    yield _sse("done", {"message_id": str(reply.id), "response": reply.message_text})
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+__all__ = ["router"]
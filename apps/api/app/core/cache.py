@@ -0,0 +1,196 @@
+"""In-process async caching with LRU eviction, TTL expiry and single-flight loads."""
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import get_settings
+from .listener import NotificationListener
+from .logging import log_event
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+USER_CACHE_CHANNEL = "user_cache"
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class AsyncLRUCache(Generic[K, V]):
+    """LRU + TTL cache whose misses are coalesced into a single load per key.
+
+    Values should be immutable: the same object is handed to every caller. ``None`` results
+    are not cached, so a row created after a miss is visible on the next lookup.
+
+    Invalidating a key also discards any load already in flight for it, so a read that raced
+    with a write cannot repopulate the cache with the pre-write value. Callers waiting on a
+    load whose caller is cancelled start a new load rather than being cancelled too.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Future[V | None]] = {}
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.size = len(self._entries)
+        return self._stats
+
+    def peek(self, key: K) -> V | None:
+        """Return a fresh cached value without loading or touching counters."""
+
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                return await self._load(key, loader)
+            self._stats.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not pending.cancelled() or (current is not None and current.cancelling()):
+                    raise
+                # The caller running the load was cancelled, not us: load again.
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        self._stats.misses += 1
+        future: asyncio.Future[V | None] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as exc:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()  # waiters retry instead of inheriting the cancellation
+            else:
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+            if value is not None:
+                self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+        self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+
+class CacheInvalidationListener(NotificationListener):
+    """Invalidates cache keys received on a Postgres ``LISTEN`` channel.
+
+    Lets each worker process drop entries that another process changed; publishers call
+    ``pg_notify(channel, key)`` inside the writing transaction so the message is only
+    delivered once the change is committed. The connection is health-checked and
+    re-established like the job queue's (see :class:`NotificationListener`); invalidations
+    sent while it was down are lost, so the whole cache is cleared on reconnect.
+    """
+
+    log_prefix = "cache_listener"
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        cache: AsyncLRUCache[Any, Any],
+        channel: str,
+        parse_key: Callable[[str], Hashable] = str,
+        *,
+        health_check_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        reconnect_delay_max: float = 30.0,
+    ) -> None:
+        super().__init__(
+            engine,
+            channel,
+            health_check_interval=health_check_interval,
+            reconnect_delay=reconnect_delay,
+            reconnect_delay_max=reconnect_delay_max,
+        )
+        self._cache = cache
+        self._parse_key = parse_key
+
+    def _reconnected(self) -> None:
+        self._cache.clear()
+
+    def _notify(self, connection: object, pid: int, channel: str, payload: str) -> None:
+        try:
+            key = self._parse_key(payload)
+        except ValueError:
+            log_event("cache_invalidation_ignored", channel=channel, payload=payload)
+            return
+        self._cache.invalidate(key)
+
+
+_user_cache: AsyncLRUCache[Any, Any] | None = None
+
+
+def get_user_cache() -> AsyncLRUCache[Any, Any] | None:
+    """Return the process-wide user snapshot cache, or ``None`` when it is disabled."""
+
+    global _user_cache
+    settings = get_settings()
+    if _user_cache is None and settings.user_cache_ttl_seconds > 0:
+        _user_cache = AsyncLRUCache(
+            max_entries=settings.user_cache_max_entries,
+            ttl_seconds=settings.user_cache_ttl_seconds,
+        )
+    return _user_cache
+
+
+__all__ = [
+    "AsyncLRUCache",
+    "CacheInvalidationListener",
+    "CacheStats",
+    "USER_CACHE_CHANNEL",
+    "get_user_cache",
+]
@@ -1,6 +1,6 @@
 """Application configuration using Pydantic settings."""
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,14 +10,95 @@ class Settings(BaseSettings):
     """Runtime configuration loaded from environment variables."""
 
     database_url: str = Field(alias="DATABASE_URL")
+    database_read_url: Optional[str] = Field(default=None, alias="DATABASE_READ_URL")
     supabase_service_role_key: Optional[str] = Field(default=None, alias="SUPABASE_SERVICE_ROLE_KEY")
     supabase_project_url: Optional[str] = Field(default=None, alias="SUPABASE_PROJECT_URL")
     password_pepper: str = Field(alias="PASSWORD_PEPPER")
     environment: str = Field(default="local", alias="ENVIRONMENT")
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE", ge=1)
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW", ge=0)
+    db_pool_timeout_seconds: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS", gt=0)
+    db_pool_recycle_seconds: int = Field(default=1800, alias="DB_POOL_RECYCLE_SECONDS", ge=-1)
+    db_pool_pre_ping: bool = Field(default=False, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE", ge=0)
+    db_pgbouncer: bool = Field(default=False, alias="DB_PGBOUNCER")
+    db_echo: bool = Field(default=False, alias="DB_ECHO")
     auth_signup_rate_limit: int = Field(default=10, alias="AUTH_SIGNUP_RATE_LIMIT", ge=1)
     auth_signup_rate_window_seconds: int = Field(
         default=60, alias="AUTH_SIGNUP_RATE_WINDOW_SECONDS", ge=1
     )
+    rate_limit_backend: Literal["memory", "postgres"] = Field(
+        default="memory", alias="RATE_LIMIT_BACKEND"
+    )
+    rate_limit_max_keys: int = Field(default=100_000, alias="RATE_LIMIT_MAX_KEYS", ge=1)
+    rate_limit_sweep_interval_seconds: float = Field(
+        default=30.0, alias="RATE_LIMIT_SWEEP_INTERVAL_SECONDS", gt=0
+    )
+    log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    log_format: Literal["json", "text"] = Field(default="json", alias="LOG_FORMAT")
+    log_debug_sample_rate: float = Field(default=1.0, alias="LOG_DEBUG_SAMPLE_RATE", ge=0, le=1)
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    query_warn_statements: int = Field(default=25, alias="QUERY_WARN_STATEMENTS", ge=1)
+    query_warn_db_ms: float = Field(default=500.0, alias="QUERY_WARN_DB_MS", gt=0)
+    user_cache_max_entries: int = Field(default=10_000, alias="USER_CACHE_MAX_ENTRIES", ge=1)
+    user_cache_ttl_seconds: float = Field(default=60.0, alias="USER_CACHE_TTL_SECONDS", ge=0)
+    user_cache_broadcast: bool = Field(default=False, alias="USER_CACHE_BROADCAST")
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS", ge=1)
+    password_hash_max_pending: int = Field(default=32, alias="PASSWORD_HASH_MAX_PENDING", ge=1)
+    llm_api_url: str = Field(default="https://api.anthropic.com", alias="LLM_API_URL")
+    llm_api_key: Optional[str] = Field(default=None, alias="LLM_API_KEY")
+    llm_model: str = Field(default="claude-sonnet-4-20250514", alias="LLM_MODEL")
+    llm_max_tokens: int = Field(default=1024, alias="LLM_MAX_TOKENS", ge=1)
+    llm_timeout_seconds: float = Field(default=60.0, alias="LLM_TIMEOUT_SECONDS", gt=0)
+    llm_http2: bool = Field(default=True, alias="LLM_HTTP2")
+    llm_requests_per_minute: float = Field(default=50.0, alias="LLM_REQUESTS_PER_MINUTE", gt=0)
+    llm_max_concurrency: int = Field(default=10, alias="LLM_MAX_CONCURRENCY", ge=1)
+    llm_queue_timeout_seconds: float = Field(
+        default=10.0, alias="LLM_QUEUE_TIMEOUT_SECONDS", gt=0
+    )
+    llm_max_retries: int = Field(default=2, alias="LLM_MAX_RETRIES", ge=0)
+    llm_retry_base_seconds: float = Field(default=0.5, alias="LLM_RETRY_BASE_SECONDS", gt=0)
+    llm_retry_max_seconds: float = Field(default=8.0, alias="LLM_RETRY_MAX_SECONDS", gt=0)
+    llm_breaker_failure_threshold: int = Field(
+        default=5, alias="LLM_BREAKER_FAILURE_THRESHOLD", ge=1
+    )
+    llm_breaker_reset_seconds: float = Field(default=30.0, alias="LLM_BREAKER_RESET_SECONDS", gt=0)
+    chat_history_messages: int = Field(default=20, alias="CHAT_HISTORY_MESSAGES", ge=1)
+    crisis_lexicon_path: Optional[str] = Field(default=None, alias="CRISIS_LEXICON_PATH")
+    crisis_lexicon_reload_seconds: float = Field(
+        default=5.0, alias="CRISIS_LEXICON_RELOAD_SECONDS", ge=0
+    )
+    crisis_event_batch_size: int = Field(default=100, alias="CRISIS_EVENT_BATCH_SIZE", ge=1)
+    crisis_event_flush_seconds: float = Field(
+        default=1.0, alias="CRISIS_EVENT_FLUSH_SECONDS", gt=0
+    )
+    crisis_event_max_pending: int = Field(
+        default=10_000, alias="CRISIS_EVENT_MAX_PENDING", ge=1
+    )
+    trend_window: int = Field(default=5, alias="TREND_WINDOW", ge=1)
+    trend_ewma_alpha: float = Field(default=0.3, alias="TREND_EWMA_ALPHA", gt=0, le=1)
+    trend_recompute_chunk_size: int = Field(
+        default=5000, alias="TREND_RECOMPUTE_CHUNK_SIZE", ge=1
+    )
+    graduation_min_score: float = Field(default=10.5, alias="GRADUATION_MIN_SCORE", ge=0)
+    graduation_min_engagement_days: float = Field(
+        default=21.0, alias="GRADUATION_MIN_ENGAGEMENT_DAYS", ge=0
+    )
+    graduation_batch_size: int = Field(default=10_000, alias="GRADUATION_BATCH_SIZE", ge=1)
+    job_worker_concurrency: int = Field(default=8, alias="JOB_WORKER_CONCURRENCY", ge=1)
+    job_worker_batch_size: int = Field(default=16, alias="JOB_WORKER_BATCH_SIZE", ge=1)
+    job_worker_poll_interval_seconds: float = Field(
+        default=1.0, alias="JOB_WORKER_POLL_INTERVAL_SECONDS", gt=0
+    )
+    job_worker_listen: bool = Field(default=True, alias="JOB_WORKER_LISTEN")
+    job_worker_idle_poll_seconds: float = Field(
+        default=30.0, alias="JOB_WORKER_IDLE_POLL_SECONDS", gt=0
+    )
+    job_worker_lease_seconds: int = Field(default=300, alias="JOB_WORKER_LEASE_SECONDS", ge=1)
+    job_retry_backoff_seconds: float = Field(default=5.0, alias="JOB_RETRY_BACKOFF_SECONDS", gt=0)
+    job_retry_backoff_max_seconds: float = Field(
+        default=3600.0, alias="JOB_RETRY_BACKOFF_MAX_SECONDS", gt=0
+    )
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -1,15 +1,110 @@
 """Database engine and session management."""
+import time
 from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
 
-from sqlalchemy import text
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
-from .config import get_settings
+from .config import Settings, get_settings
+from .instrumentation import instrument_engine
+from .uow import unit_of_work
 
 
 _settings = get_settings()
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+_read_engine: AsyncEngine | None = None
+_read_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time view of the engine's connection pool."""
+
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    overflow_checkouts: int
+    timeouts: int
+    checkout_wait_seconds: float
+    max_checkout_wait_seconds: float
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout wait time, overflow use and timeouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.checkout_wait_seconds = 0.0
+        self.max_checkout_wait_seconds = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        self.checkouts += 1
+        self.checkout_wait_seconds += waited
+        self.max_checkout_wait_seconds = max(self.max_checkout_wait_seconds, waited)
+        if self.checkedout() > self.size():
+            self.overflow_checkouts += 1
+        return entry
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+            checkouts=self.checkouts,
+            overflow_checkouts=self.overflow_checkouts,
+            timeouts=self.timeouts,
+            checkout_wait_seconds=self.checkout_wait_seconds,
+            max_checkout_wait_seconds=self.max_checkout_wait_seconds,
+        )
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    """Translate pool settings into ``create_async_engine`` keyword arguments.
+
+    With ``DB_PGBOUNCER`` enabled, prepared statement caching is switched off and statements
+    get unique names, since a transaction-mode PgBouncer may hand each transaction a
+    different server connection.
+    """
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if make_url(settings.database_url).get_driver_name() == "asyncpg":
+        cache_size = 0 if settings.db_pgbouncer else settings.db_statement_cache_size
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": cache_size,
+            "prepared_statement_cache_size": cache_size,
+        }
+        if settings.db_pgbouncer:
+            connect_args["prepared_statement_name_func"] = _unique_statement_name
+        options["connect_args"] = connect_args
+    return options
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
 
 
 def get_engine() -> AsyncEngine:
@@ -17,14 +112,33 @@ def get_engine() -> AsyncEngine:
 
     global _engine
     if _engine is None:
-        _engine = create_async_engine(
-            _settings.database_url,
-            pool_pre_ping=True,
-            echo=_settings.environment == "local",
+        _engine = instrument_engine(
+            create_async_engine(_settings.database_url, **engine_options(_settings))
         )
     return _engine
 
 
+def get_read_engine() -> AsyncEngine | None:
+    """Return the read-replica engine, or ``None`` when ``DATABASE_READ_URL`` is unset."""
+
+    global _read_engine
+    read_url = _settings.database_read_url
+    if _read_engine is None and read_url:
+        replica_settings = _settings.model_copy(update={"database_url": read_url})
+        _read_engine = instrument_engine(
+            create_async_engine(read_url, **engine_options(replica_settings))
+        )
+    return _read_engine
+
+
+def get_pool_stats() -> PoolStats | None:
+    """Return pool metrics for the singleton engine, or ``None`` before it is created."""
+
+    if _engine is None or not isinstance(_engine.pool, InstrumentedPool):
+        return None
+    return _engine.pool.stats()
+
+
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """Create the async session factory if needed."""
 
@@ -38,13 +152,32 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     return _session_factory
 
 
+def get_read_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    """Session factory bound to the read replica, or ``None`` without one."""
+
+    global _read_session_factory
+    engine = get_read_engine()
+    if _read_session_factory is None and engine is not None:
+        _read_session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+    return _read_session_factory
+
+
 async def get_db_session() -> AsyncIterator[AsyncSession]:
-    """FastAPI dependency that yields a database session."""
+    """FastAPI dependency that yields a database session.
+
+    The request runs inside a unit of work: repository writes are flushed as they happen and
+    committed once when the endpoint returns, or rolled back if it raises. Depend on it with
+    ``scope="function"`` (``app.api.dependencies.DbSession``) so the commit happens before the
+    response is sent rather than after.
+    """
 
     session_factory = get_session_factory()
     async with session_factory() as session:
         try:
-            yield session
+            async with unit_of_work(session):
+                yield session
         finally:
             await session.close()
 
@@ -56,4 +189,14 @@ async def verify_database_connection() -> None:
         await session.execute(text("SELECT 1"))
 
 
-__all__ = ["get_db_session", "get_engine", "verify_database_connection"]
+__all__ = [
+    "InstrumentedPool",
+    "PoolStats",
+    "engine_options",
+    "get_db_session",
+    "get_engine",
+    "get_pool_stats",
+    "get_read_engine",
+    "get_read_session_factory",
+    "verify_database_connection",
+]
@@ -0,0 +1,84 @@
+"""Per-request SQL statement, time and row counters built on SQLAlchemy engine events.
+
+``instrument_engine`` attaches cursor listeners once per engine. Counting only happens
+inside ``track_queries()``, whose ``QueryStats`` lives in a context variable, so concurrent
+requests on the same engine never mix their numbers.
+"""
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    """Statements executed, time spent in the database and rows returned or affected."""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_STARTED_KEY = "query_stats_started"
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count queries issued by instrumented engines within the block."""
+
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """Attach the counting listeners to ``engine`` (idempotent) and return it."""
+
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+    return engine
+
+
+def _before_cursor_execute(conn: Connection, *_: Any) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Connection, cursor: Any, *_: Any) -> None:
+    stats = _current.get()
+    started = conn.info.get(_STARTED_KEY)
+    if stats is None or not started:
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - started.pop()
+    stats.rows += max(cursor.rowcount, 0)
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # Failed statements never reach after_cursor_execute; count them and drop the timer.
+    stats = _current.get()
+    started = context.connection.info.get(_STARTED_KEY) if context.connection else None
+    if stats is None or not started:
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - started.pop()
+
+
+__all__ = ["QueryStats", "current_query_stats", "instrument_engine", "track_queries"]
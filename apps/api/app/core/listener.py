@@ -0,0 +1,135 @@
+"""Postgres ``LISTEN`` connections that recover from being dropped."""
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .logging import log_event
+
+
+class NotificationListener:
+    """Holds a dedicated connection subscribed to ``channel``.
+
+    The connection is checked every ``health_check_interval`` seconds and re-established,
+    with ``LISTEN`` re-issued, as soon as it is closed or stops answering. Notifications
+    sent while it was down are lost, so subclasses catch up in :meth:`_reconnected`.
+    Events are logged as ``<log_prefix>_unhealthy``, ``_reconnect_failed`` and
+    ``_reconnected``.
+    """
+
+    log_prefix = "listener"
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str,
+        *,
+        health_check_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        reconnect_delay_max: float = 30.0,
+    ) -> None:
+        self._engine = engine
+        self._channel = channel
+        self._health_check_interval = health_check_interval
+        self._reconnect_delay = reconnect_delay
+        self._reconnect_delay_max = reconnect_delay_max
+        self._connection: AsyncConnection | None = None
+        self._lost = asyncio.Event()
+        self._monitor: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        await self._connect()
+        self._monitor = asyncio.create_task(self._watch())
+
+    async def close(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+            self._monitor = None
+        if self._connection is not None:
+            driver = await driver_connection(self._connection)
+            await driver.remove_listener(self._channel, self._notify)
+            driver.remove_termination_listener(self._terminated)
+            await self._connection.close()
+            self._connection = None
+
+    def _notify(self, connection: object, pid: int, channel: str, payload: str) -> None:
+        raise NotImplementedError
+
+    def _reconnected(self) -> None:
+        """Called once ``LISTEN`` is live again after the connection was lost."""
+
+    async def _connect(self) -> None:
+        connection = await self._engine.connect()
+        try:
+            driver = await driver_connection(connection)
+            await driver.add_listener(self._channel, self._notify)
+            driver.add_termination_listener(self._terminated)
+        except BaseException:
+            await connection.close()
+            raise
+        self._connection = connection
+        self._lost.clear()
+
+    async def _watch(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._lost.wait(), self._health_check_interval)
+            if not self._lost.is_set() and not await self._healthy():
+                self._lost.set()
+            if self._lost.is_set():
+                await self._reconnect()
+
+    async def _healthy(self) -> bool:
+        if self._connection is None:
+            return False
+        try:
+            # On the driver connection, so SQLAlchemy does not leave a transaction open.
+            driver = await driver_connection(self._connection)
+            await driver.execute("SELECT 1", timeout=self._health_check_interval)
+        except Exception as exc:  # noqa: BLE001 - any failure means the connection is gone
+            log_event(f"{self.log_prefix}_unhealthy", level=logging.WARNING, error=repr(exc))
+            return False
+        return True
+
+    async def _reconnect(self) -> None:
+        if self._connection is not None:
+            with contextlib.suppress(Exception):
+                await self._connection.invalidate()
+            self._connection = None
+        delay = self._reconnect_delay
+        while True:
+            try:
+                await self._connect()
+            except Exception as exc:  # noqa: BLE001 - keep retrying until the database is back
+                log_event(
+                    f"{self.log_prefix}_reconnect_failed",
+                    level=logging.WARNING,
+                    error=repr(exc),
+                    retry_in=delay,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._reconnect_delay_max)
+            else:
+                log_event(f"{self.log_prefix}_reconnected", channel=self._channel)
+                self._reconnected()
+                return
+
+    def _terminated(self, connection: object) -> None:
+        self._lost.set()
+
+
+async def driver_connection(connection: AsyncConnection) -> Any:
+    """The DBAPI driver's own connection (asyncpg's) behind ``connection``."""
+
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    if driver is None:
+        raise RuntimeError("the LISTEN connection has been closed")
+    return driver
+
+
+__all__ = ["NotificationListener", "driver_connection"]
@@ -1,22 +1,237 @@
-"""Logging configuration for structured output."""
+"""Structured logging that keeps I/O off the event loop.
+
+``configure_logging`` installs a single ``QueueHandler`` on the root logger, and routes
+uvicorn's loggers to it too. Records are only enqueued on the calling thread (tracebacks
+are rendered there, while they still exist); a ``QueueListener`` thread formats them as
+JSON (or text) and writes them to stdout. Every record carries the current request ID, bound per
+request by :class:`RequestIdMiddleware` (or per job by the worker) through a context
+variable. DEBUG records can be sampled down before they reach the queue.
+"""
+import copy
+import json
 import logging
+import queue
+import sys
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict
 
+from .config import get_settings
+
+REQUEST_ID_HEADER = "x-request-id"
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# uvicorn installs its own stream handlers on these with propagate=False.
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request ID active on the logging thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Pass roughly ``rate`` of DEBUG records, tracked separately per call site.
+
+    Sampling is deterministic (an accumulator per logger, line and unformatted template)
+    so low rates still emit evenly spaced records instead of bursts. Records above DEBUG
+    always pass. Messages built with f-strings would make every record a new template,
+    so only the ``max_sites`` most recently seen are tracked.
+    """
+
+    def __init__(self, rate: float, *, max_sites: int = 1024) -> None:
+        super().__init__()
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1")
+        self._rate = rate
+        self._max_sites = max_sites
+        self._credit: OrderedDict[tuple[str, int, object], float] = OrderedDict()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self._rate >= 1:
+            return True
+        # ``msg`` is still the template here (``%`` args are applied later), and it keeps
+        # events logged through ``log_event``, which share one call site, apart.
+        key = (record.name, record.lineno, record.msg if isinstance(record.msg, str) else None)
+        credit = self._credit.pop(key, 0.0) + self._rate
+        passed = credit >= 1
+        self._credit[key] = credit - 1 if passed else credit
+        if len(self._credit) > self._max_sites:
+            self._credit.popitem(last=False)
+        return passed
+
+
+class StructuredQueueHandler(QueueHandler):
+    """``QueueHandler`` that keeps exceptions as a separate field.
+
+    The stdlib ``prepare`` formats the whole record into ``msg`` and drops ``exc_info``,
+    so the traceback would end up inside the message. Here the traceback is rendered to
+    ``exc_text`` instead, and the message keeps just the event.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the event name, request ID and structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            payload["request_id"] = request_id
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable single-line output for local development."""
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None) or {}
+        extras = " ".join(f"{key}={value!r}" for key, value in fields.items())
+        request_id = getattr(record, "request_id", None)
+        prefix = f"[{request_id}] " if request_id else ""
+        return f"{prefix}{line} {extras}".rstrip()
+
+
+def configure_logging(level: int | None = None) -> None:
+    """Route all logging through a queue drained by a background writer thread.
+
+    Idempotent: later calls only adjust the level and re-route uvicorn's loggers, which
+    uvicorn may have configured in the meantime. ``LOG_LEVEL``, ``LOG_FORMAT`` and
+    ``LOG_DEBUG_SAMPLE_RATE`` come from settings; with ``DB_ECHO`` SQLAlchemy statement
+    logging goes through the same pipeline instead of its own stream handler.
+    """
+
+    global _listener, _queue_handler
+    settings = get_settings()
+    root = logging.getLogger()
+    root.setLevel(level if level is not None else settings.log_level.upper())
+    if settings.db_echo:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+    for name in _UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _queue_handler = StructuredQueueHandler(log_queue)
+    _queue_handler.addFilter(DebugSamplingFilter(settings.log_debug_sample_rate))
+    _queue_handler.addFilter(RequestContextFilter())
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def log_event(event: str, *, level: int = logging.INFO, **extra: Any) -> None:
+    """Helper to emit structured logs; ``extra`` becomes top-level JSON fields."""
+
+    logger = logging.getLogger("noria")
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": extra})
+
+
+@contextmanager
+def bind_request_id(request_id: str | None = None) -> Iterator[str]:
+    """Set the correlation ID for logs emitted inside the block."""
+
+    value = request_id or uuid.uuid4().hex
+    token = request_id_var.set(value)
+    try:
+        yield value
+    finally:
+        request_id_var.reset(token)
+
+
+class RequestIdMiddleware:
+    """ASGI middleware binding ``X-Request-ID`` (or a fresh ID) to the request's logs.
+
+    The ID is echoed in the response so clients and proxies can correlate.
+    """
 
-def configure_logging(level: int = logging.INFO) -> None:
-    """Configure root logger for JSON-like structured output."""
+    def __init__(self, app: Any) -> None:
+        self.app = app
 
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-    )
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.encode())
+        supplied = incoming.decode("latin-1")[:128] if incoming else None
+        with bind_request_id(supplied) as request_id:
 
-def log_event(event: str, **extra: Any) -> None:
-    """Helper to emit structured logs."""
+            async def send_wrapper(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((REQUEST_ID_HEADER.encode(), request_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
 
-    payload: Dict[str, Any] = {"event": event, **extra}
-    logging.getLogger("noria").info(payload)
+            await self.app(scope, receive, send_wrapper)
 
 
-__all__ = ["configure_logging", "log_event"]
+__all__ = [
+    "DebugSamplingFilter",
+    "JsonFormatter",
+    "RequestIdMiddleware",
+    "StructuredQueueHandler",
+    "bind_request_id",
+    "configure_logging",
+    "log_event",
+    "request_id_var",
+    "shutdown_logging",
+]
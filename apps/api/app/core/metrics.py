@@ -0,0 +1,243 @@
+"""Lightweight in-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain Python objects updated from the event loop, so
+recording a sample is a dict lookup and an addition. Values that already live elsewhere
+(pool, limiter and cache stats, queue depth) are read at scrape time by collectors
+registered with :meth:`MetricsRegistry.add_collector`. Metrics are per process; with
+several uvicorn workers each one reports its own.
+"""
+import bisect
+import math
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+Labels = tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0
+)
+
+
+@dataclass
+class MetricFamily:
+    """Samples of one metric produced by a scrape-time collector."""
+
+    name: str
+    kind: str
+    help: str
+    labelnames: Sequence[str] = ()
+    samples: list[tuple[Labels, float]] = field(default_factory=list)
+
+    def add(self, value: float, *labels: str) -> "MetricFamily":
+        self.samples.append((labels, value))
+        return self
+
+
+Collector = Callable[[], Awaitable[Iterable[MetricFamily]]]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        return [
+            _sample(self.name, self.labelnames, labels, value)
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._bounds = sorted(buckets)
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), then sum.
+        self._series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self._bounds) + 1), [0.0])
+        series[0][bisect.bisect_left(self._bounds, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines: list[str] = []
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip([*self._bounds, math.inf], counts, strict=True):
+                cumulative += count
+                lines.append(
+                    _sample(f"{self.name}_bucket", names, (*labels, _format(bound)), cumulative)
+                )
+            lines.append(_sample(f"{self.name}_sum", self.labelnames, labels, total[0]))
+            lines.append(_sample(f"{self.name}_count", self.labelnames, labels, cumulative))
+        return lines
+
+
+class MetricsRegistry:
+    """Owns metric objects and scrape-time collectors."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    async def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(_header(metric.name, metric.kind, metric.help))
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for family in await collector():
+                lines.extend(_header(family.name, family.kind, family.help))
+                lines.extend(
+                    _sample(family.name, family.labelnames, labels, value)
+                    for labels, value in family.samples
+                )
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests.
+
+    Latency covers the whole response, including streamed bodies. Requests that match no
+    route are grouped under ``route="unmatched"`` to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: Any, *, latency: Histogram, in_flight: Gauge) -> None:
+        self.app = app
+        self._latency = latency
+        self._in_flight = in_flight
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = ["500"]
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        method = scope["method"]
+        self._in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._in_flight.dec(method)
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            self._latency.observe(time.perf_counter() - started, method, path, status[0])
+
+
+def _header(name: str, kind: str, help: str) -> list[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+
+
+def _sample(name: str, labelnames: Sequence[str], labels: Labels, value: float) -> str:
+    if not labelnames:
+        return f"{name} {_format(value)}"
+    pairs = ",".join(f'{key}="{_escape(val)}"' for key, val in zip(labelnames, labels, strict=True))
+    return f"{name}{{{pairs}}} {_format(value)}"
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+__all__ = [
+    "Counter",
+    "DEFAULT_LATENCY_BUCKETS",
+    "Gauge",
+    "Histogram",
+    "MetricFamily",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+]
@@ -1,6 +1,11 @@
 """Security utilities for authentication flows."""
+import asyncio
+import contextlib
 import re
-from typing import Final
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Final, TypeVar
 
 from passlib.context import CryptContext
 
@@ -14,6 +19,117 @@ _pwd_context = CryptContext(
     bcrypt__truncate_error=False,
 )
 
+_T = TypeVar("_T")
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when the hashing pool already has its maximum number of pending jobs."""
+
+
+@dataclass
+class HashingPoolStats:
+    """Counters describing hashing pool load."""
+
+    completed: int = 0
+    rejected: int = 0
+    pending: int = 0
+    queue_wait_seconds: float = 0.0
+    hash_seconds: float = 0.0
+
+
+class HashingPool:
+    """Bounded thread pool that keeps bcrypt work off the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism without the
+    pickling overhead of a process pool. ``max_pending`` caps queued plus running jobs;
+    beyond that callers get :class:`PasswordHasherBusyError` instead of an unbounded queue.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_pending < max_workers:
+            raise ValueError("max_pending must be >= max_workers")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._stats = HashingPoolStats()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def max_pending(self) -> int:
+        return self._max_pending
+
+    @property
+    def stats(self) -> HashingPoolStats:
+        return self._stats
+
+    async def run(self, func: Callable[..., _T], *args: object) -> _T:
+        """Execute ``func`` on the pool, recording queue wait and execution time."""
+
+        # Only touched from the event loop thread, so no lock is required.
+        if self._stats.pending >= self._max_pending:
+            self._stats.rejected += 1
+            raise PasswordHasherBusyError("Password hashing capacity exhausted")
+
+        submitted = time.perf_counter()
+
+        def _timed() -> tuple[_T, float, float]:
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(_timed)
+        self._stats.pending += 1
+        # Released when the thread finishes, not when this caller stops waiting: a
+        # cancelled caller leaves the hash running, and it still counts against the cap.
+        future.add_done_callback(lambda _: self._release(loop))
+        result, waited, elapsed = await asyncio.wrap_future(future, loop=loop)
+
+        self._stats.completed += 1
+        self._stats.queue_wait_seconds += waited
+        self._stats.hash_seconds += elapsed
+        return result
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        with contextlib.suppress(RuntimeError):  # the loop is already closed
+            loop.call_soon_threadsafe(self._decrement_pending)
+
+    def _decrement_pending(self) -> None:
+        self._stats.pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hashing_pool: HashingPool | None = None
+
+
+def get_hashing_pool() -> HashingPool:
+    """Return the process-wide hashing pool, creating it from settings on first use."""
+
+    global _hashing_pool
+    if _hashing_pool is None:
+        settings = get_settings()
+        _hashing_pool = HashingPool(
+            settings.password_hash_workers,
+            settings.password_hash_max_pending,
+        )
+    return _hashing_pool
+
+
+def shutdown_hashing_pool() -> None:
+    """Release pool threads; the next call to :func:`get_hashing_pool` recreates it."""
+
+    global _hashing_pool
+    if _hashing_pool is not None:
+        _hashing_pool.shutdown()
+        _hashing_pool = None
+
 
 def validate_password_requirements(password: str) -> None:
     """Ensure password meets policy requirements."""
@@ -40,4 +156,27 @@ def verify_password(password: str, hashed: str) -> bool:
     return _pwd_context.verify(salted, hashed)
 
 
-__all__ = ["validate_password_requirements", "hash_password", "verify_password"]
+async def hash_password_async(password: str) -> str:
+    """Hash password on the hashing pool without blocking the event loop."""
+
+    return await get_hashing_pool().run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verify password on the hashing pool without blocking the event loop."""
+
+    return await get_hashing_pool().run(verify_password, password, hashed)
+
+
+__all__ = [
+    "validate_password_requirements",
+    "hash_password",
+    "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "HashingPool",
+    "HashingPoolStats",
+    "PasswordHasherBusyError",
+    "get_hashing_pool",
+    "shutdown_hashing_pool",
+]
@@ -0,0 +1,59 @@
+"""Unit-of-work helpers that batch repository writes into one transaction."""
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_DEPTH_KEY = "unit_of_work_depth"
+_FAILED_KEY = "unit_of_work_failed"
+
+
+class UnitOfWorkRollbackError(RuntimeError):
+    """Raised when an outer unit of work exits cleanly after an inner one failed."""
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    """Return True when commits on ``session`` are deferred to an enclosing unit of work."""
+
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Defer repository commits until the block exits.
+
+    Repositories only flush while a unit of work is active. The outermost block commits once
+    on success and rolls back on error; nested blocks are no-ops, so services can declare
+    their own boundary and still join a request-wide one.
+
+    Nested blocks take no savepoint, so an inner block's flushed writes cannot be undone on
+    their own. Do not swallow an exception raised out of an inner block: if the outermost
+    block then exits cleanly it rolls everything back and raises
+    :class:`UnitOfWorkRollbackError` instead of committing a partial transaction.
+    """
+
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+        else:
+            session.info[_FAILED_KEY] = True
+        raise
+    else:
+        if depth == 0:
+            if session.info.get(_FAILED_KEY):
+                await session.rollback()
+                raise UnitOfWorkRollbackError(
+                    "an inner unit of work failed; the transaction was rolled back"
+                )
+            await session.commit()
+    finally:
+        session.info[_DEPTH_KEY] = depth
+        if depth == 0:
+            session.info.pop(_FAILED_KEY, None)
+
+
+__all__ = ["UnitOfWorkRollbackError", "in_unit_of_work", "unit_of_work"]
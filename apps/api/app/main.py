@@ -1,11 +1,29 @@
 """FastAPI application factory."""
-from fastapi import FastAPI
+import logging
+from collections.abc import Awaitable, Callable
+from uuid import UUID
 
+from fastapi import FastAPI, Request, Response
+
+from app.api.dependencies import HEADER_AUTH_ENVIRONMENTS
+from app.api.metrics import install_metrics
 from app.api.v1.auth.routes import router as auth_router
+from app.api.v1.chat.routes import router as chat_router
+from app.core.cache import USER_CACHE_CHANNEL, CacheInvalidationListener, get_user_cache
 from app.core.config import get_settings
-from app.core.database import verify_database_connection
-from app.core.logging import configure_logging
-from app.utils.rate_limiter import RateLimiter
+from app.core.database import get_engine, verify_database_connection
+from app.core.instrumentation import track_queries
+from app.core.logging import (
+    RequestIdMiddleware,
+    configure_logging,
+    log_event,
+    shutdown_logging,
+)
+from app.core.security import shutdown_hashing_pool
+from app.services.crisis_detection_service import get_crisis_detector
+from app.services.crisis_event_log import get_crisis_event_log
+from app.services.integrations.claude import close_llm_client
+from app.utils.rate_limiter import create_rate_limiter
 
 
 def create_app() -> FastAPI:
@@ -15,12 +33,49 @@ def create_app() -> FastAPI:
     configure_logging()
     app = FastAPI(title="Noria API", version="0.1.0", docs_url="/docs")
 
-    app.state.signup_rate_limiter = RateLimiter(
+    app.state.signup_rate_limiter = create_rate_limiter(
+        settings.rate_limit_backend,
         settings.auth_signup_rate_limit,
         settings.auth_signup_rate_window_seconds,
+        scope="signup",
+        engine=get_engine() if settings.rate_limit_backend == "postgres" else None,
+        max_keys=settings.rate_limit_max_keys,
     )
 
+    expose_query_stats = settings.environment != "production"
+
+    @app.middleware("http")
+    async def query_stats_middleware(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        with track_queries() as stats:
+            response = await call_next(request)
+        db_ms = stats.db_seconds * 1000
+        if stats.statements > settings.query_warn_statements or db_ms > settings.query_warn_db_ms:
+            log_event(
+                "query_budget_exceeded",
+                level=logging.WARNING,
+                method=request.method,
+                path=request.url.path,
+                statements=stats.statements,
+                db_ms=round(db_ms, 1),
+                rows=stats.rows,
+            )
+        if expose_query_stats:
+            response.headers["X-DB-Queries"] = str(stats.statements)
+            response.headers["X-DB-Time-Ms"] = f"{db_ms:.1f}"
+            response.headers["X-DB-Rows"] = str(stats.rows)
+        return response
+
+    if settings.metrics_enabled:
+        install_metrics(app)
+    app.add_middleware(RequestIdMiddleware)  # outermost, so every log line has the ID
+
     app.include_router(auth_router, prefix="/api/v1/auth", tags=["auth"])
+    if settings.environment in HEADER_AUTH_ENVIRONMENTS:
+        # Chat identifies users by a client-supplied header until bearer authentication
+        # exists, so it is not served anywhere that header could be forged against real data.
+        app.include_router(chat_router, prefix="/api/v1/chat", tags=["chat"])
 
     @app.get("/health", tags=["health"])
     async def healthcheck() -> dict[str, str]:
@@ -29,6 +84,30 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def startup_event() -> None:  # pragma: no cover - wire-up code
         await verify_database_connection()
+        user_cache = get_user_cache()
+        if settings.user_cache_broadcast and user_cache is not None:
+            listener = CacheInvalidationListener(get_engine(), user_cache, USER_CACHE_CHANNEL, UUID)
+            await listener.start()
+            app.state.user_cache_listener = listener
+        # Memory limiters drop expired keys; postgres ones purge rate_limit_buckets rows.
+        app.state.signup_rate_limiter.start_sweeper(settings.rate_limit_sweep_interval_seconds)
+        # Compile the lexicon now rather than on the first message.
+        crisis_detector = get_crisis_detector()
+        if settings.crisis_lexicon_reload_seconds > 0:
+            crisis_detector.start_watcher(settings.crisis_lexicon_reload_seconds)
+        get_crisis_event_log().start(settings.crisis_event_flush_seconds)
+
+    @app.on_event("shutdown")
+    async def shutdown_event() -> None:  # pragma: no cover - wire-up code
+        listener = getattr(app.state, "user_cache_listener", None)
+        if listener is not None:
+            await listener.close()
+        await app.state.signup_rate_limiter.stop_sweeper()
+        await get_crisis_detector().stop_watcher()
+        await get_crisis_event_log().stop()  # writes any events still queued
+        await close_llm_client()
+        shutdown_hashing_pool()
+        shutdown_logging()
 
     return app
 
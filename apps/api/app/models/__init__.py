@@ -1,7 +1,24 @@
 """ORM models package."""
 from .analysis import AnalysisResult
+from .analysis_trend import AnalysisTrend
 from .base import Base
 from .conversation import Conversation
+from .crisis_event import CrisisEvent
+from .job import Job
+from .rate_limit import RateLimitBucket
+from .task_checkpoint import TaskCheckpoint
 from .user import User
+from .user_message_stats import UserMessageStats
 
-__all__ = ["Base", "User", "Conversation", "AnalysisResult"]
+__all__ = [
+    "Base",
+    "User",
+    "Conversation",
+    "AnalysisResult",
+    "AnalysisTrend",
+    "CrisisEvent",
+    "Job",
+    "RateLimitBucket",
+    "TaskCheckpoint",
+    "UserMessageStats",
+]
@@ -0,0 +1,39 @@
+"""Per-user ChAT score trend aggregates."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class AnalysisTrend(Base):
+    """Rolling aggregates over a user's ``analysis_results``, one row per user.
+
+    The least-squares sums use ``t``, the days between a result and ``first_seen``, so
+    a new result only adds to them. ``recent_scores`` holds the latest scores of the
+    trend window, oldest first.
+    """
+
+    __tablename__ = "analysis_trends"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    analysis_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    recent_scores: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    ewma: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_t: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_tt: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_score: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_t_score: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+__all__ = ["AnalysisTrend"]
@@ -2,7 +2,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, String, Text
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -22,12 +22,20 @@ class Conversation(Base):
     )
     message_text: Mapped[str] = mapped_column(Text, nullable=False)
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default="now()"
+        DateTime(timezone=True), nullable=False, server_default=func.clock_timestamp()
     )
     sender_type: Mapped[str] = mapped_column(String(32), nullable=False)
 
     __table_args__ = (
         CheckConstraint("sender_type IN ('user', 'coach', 'system')", name="conversations_sender_type_chk"),
+        Index("ix_conversations_user_id_timestamp_id", "user_id", "timestamp", "id"),
+        Index(
+            "ix_conversations_user_messages",
+            "user_id",
+            "timestamp",
+            "id",
+            postgresql_where=text("sender_type = 'user'"),
+        ),
     )
 
     user: Mapped["User"] = relationship("User", back_populates="conversations")
@@ -0,0 +1,86 @@
+"""Crisis event model definition."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+SEVERITY_LEVELS = ("low", "moderate", "high", "critical")
+# Most severe first. The review-queue index is built on this exact expression, so queries
+# must use it verbatim (with literals, not bound parameters) for the planner to match it.
+SEVERITY_ORDER_SQL = (
+    "CASE severity_level WHEN 'critical' THEN 0 WHEN 'high' THEN 1 "
+    "WHEN 'moderate' THEN 2 ELSE 3 END"
+)
+
+
+class CrisisEvent(Base):
+    """A crisis detected in a user message, kept for follow-up review."""
+
+    __tablename__ = "crisis_events"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    message_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    trigger_type: Mapped[str] = mapped_column(Text, nullable=False)
+    severity_level: Mapped[str] = mapped_column(Text, nullable=False)
+    keywords_detected: Mapped[list[str]] = mapped_column(
+        ARRAY(Text), nullable=False, server_default=text("'{}'")
+    )
+    resources_shown: Mapped[list] = mapped_column(
+        JSONB, nullable=False, server_default=text("'[]'::jsonb")
+    )
+    user_acknowledged: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("false")
+    )
+    followup_required: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("false")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    resolution_timestamp: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "severity_level IN ('low', 'moderate', 'high', 'critical')",
+            name="crisis_events_severity_level_chk",
+        ),
+        Index("ix_crisis_events_user_id_severity", "user_id", "severity_level"),
+        Index(
+            "ix_crisis_events_open_by_severity",
+            text(f"({SEVERITY_ORDER_SQL})"),
+            "created_at",
+            "id",
+            postgresql_where=text("resolution_timestamp IS NULL"),
+        ),
+        Index(
+            "ix_crisis_events_unacknowledged",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT user_acknowledged"),
+        ),
+    )
+
+
+__all__ = ["SEVERITY_LEVELS", "SEVERITY_ORDER_SQL", "CrisisEvent"]
@@ -0,0 +1,22 @@
+"""Shared rate limiter state."""
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RateLimitBucket(Base):
+    """GCRA theoretical arrival time per limiter key.
+
+    The table is UNLOGGED: rate limit state is disposable, so skipping WAL keeps the
+    per-request upsert cheap, at the cost of losing buckets after a crash.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tat: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+__all__ = ["RateLimitBucket"]
@@ -0,0 +1,30 @@
+"""Progress checkpoints for resumable batch tasks."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TaskCheckpoint(Base):
+    """Where a batch task's current run has got to, saved with each chunk it applies.
+
+    ``started_at`` is the run's reference time, kept so a resumed run evaluates every
+    chunk against the same clock. A run is finished once ``finished_at`` is set.
+    """
+
+    __tablename__ = "task_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    position: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    processed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    changed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+__all__ = ["TaskCheckpoint"]
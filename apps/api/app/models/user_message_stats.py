@@ -0,0 +1,33 @@
+"""Per-user message counter maintained by the analysis queue trigger."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class UserMessageStats(Base):
+    """How many user messages each user has ever sent.
+
+    Written only by the ``queue_analysis_check`` trigger on ``conversations`` (migration
+    ``0004_user_message_counter``), which bumps the row on every user message and queues
+    an ``analysis_job`` at each multiple of 25. Deleting messages does not decrement it.
+    """
+
+    __tablename__ = "user_message_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_message_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+__all__ = ["UserMessageStats"]
@@ -1,6 +1,27 @@
 """Repository exports."""
-from .analysis import AnalysisRepository
-from .conversation import ConversationRepository
-from .user import UserRepository
+from .analysis import AnalysisRepository, ScoreHistory
+from .analysis_trend import AnalysisTrendRepository
+from .conversation import AnalysisMessage, ConversationRepository, MessageCursor
+from .crisis_event import CrisisEventRepository, NewCrisisEvent, ReviewCursor
+from .job import ClaimedJob, JobQueueStats, JobRepository
+from .task_checkpoint import TaskCheckpointRepository
+from .user import StageChange, UserRepository, UserSnapshot
 
-__all__ = ["UserRepository", "ConversationRepository", "AnalysisRepository"]
+__all__ = [
+    "UserRepository",
+    "ConversationRepository",
+    "AnalysisRepository",
+    "AnalysisTrendRepository",
+    "CrisisEventRepository",
+    "JobRepository",
+    "TaskCheckpointRepository",
+    "AnalysisMessage",
+    "MessageCursor",
+    "NewCrisisEvent",
+    "ReviewCursor",
+    "ScoreHistory",
+    "StageChange",
+    "ClaimedJob",
+    "JobQueueStats",
+    "UserSnapshot",
+]
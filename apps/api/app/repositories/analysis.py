@@ -1,11 +1,25 @@
 """Analysis repository."""
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Float, any_, cast, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
 from app.models.analysis import AnalysisResult
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, uuid_array
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreHistory:
+    """A user's ChAT scores in time order, with result times as epoch seconds."""
+
+    user_id: UUID
+    first_seen: datetime
+    last_seen: datetime
+    epochs: list[float]
+    scores: list[int]
 
 
 class AnalysisRepository(BaseRepository):
@@ -17,10 +31,13 @@ class AnalysisRepository(BaseRepository):
         chat_score: int,
         message_range: str | None = None,
     ) -> AnalysisResult:
-        record = AnalysisResult(user_id=user_id, chat_score=chat_score, message_range=message_range)
-        self.session.add(record)
-        await self.session.commit()
-        await self.session.refresh(record)
+        result = await self.session.execute(
+            insert(AnalysisResult)
+            .values(user_id=user_id, chat_score=chat_score, message_range=message_range)
+            .returning(AnalysisResult)
+        )
+        record = result.scalar_one()
+        await self.commit()
         return record
 
     async def list_for_user(self, user_id: UUID) -> Sequence[AnalysisResult]:
@@ -40,25 +57,71 @@ class AnalysisRepository(BaseRepository):
         chat_score: int | None = None,
         message_range: str | None = None,
     ) -> Optional[AnalysisResult]:
-        record = await self.get(analysis_id)
-        if record is None:
-            return None
-
+        updates: dict[str, object] = {}
         if chat_score is not None:
-            record.chat_score = chat_score
+            updates["chat_score"] = chat_score
         if message_range is not None:
-            record.message_range = message_range
+            updates["message_range"] = message_range
+        if not updates:
+            return await self.get(analysis_id)
 
-        await self.session.commit()
-        await self.session.refresh(record)
+        result = await self.session.execute(
+            update(AnalysisResult)
+            .where(AnalysisResult.id == analysis_id)
+            .values(**updates)
+            .returning(AnalysisResult)
+        )
+        record = result.scalar_one_or_none()
+        await self.commit()
         return record
 
-    async def delete(self, analysis_id: UUID) -> None:
-        record = await self.get(analysis_id)
-        if record is None:
-            return
-        await self.session.delete(record)
-        await self.session.commit()
+    async def delete(self, analysis_id: UUID) -> Optional[UUID]:
+        """Delete a result; returns its user's ID, or ``None`` if it did not exist."""
+
+        result = await self.session.execute(
+            delete(AnalysisResult)
+            .where(AnalysisResult.id == analysis_id)
+            .returning(AnalysisResult.user_id)
+        )
+        user_id = result.scalar_one_or_none()
+        await self.commit()
+        return user_id
+
+    async def user_ids_after(self, after: UUID | None, limit: int) -> list[UUID]:
+        """Next ``limit`` users with results, in ``user_id`` order after ``after``."""
+
+        stmt = select(AnalysisResult.user_id).distinct()
+        if after is not None:
+            stmt = stmt.where(AnalysisResult.user_id > after)
+        result = await self.session.execute(stmt.order_by(AnalysisResult.user_id).limit(limit))
+        return list(result.scalars())
+
+    async def score_histories(self, user_ids: Sequence[UUID]) -> list[ScoreHistory]:
+        """Every result of ``user_ids``, one aggregated row per user, in ``user_id`` order.
+
+        Users without results are left out.
+        """
+
+        if not user_ids:
+            return []
+        order = (AnalysisResult.timestamp, AnalysisResult.id)
+        epoch = cast(func.extract("epoch", AnalysisResult.timestamp), Float)
+        result = await self.session.execute(
+            select(
+                AnalysisResult.user_id,
+                func.min(AnalysisResult.timestamp),
+                func.max(AnalysisResult.timestamp),
+                func.array_agg(aggregate_order_by(epoch, *order)),
+                func.array_agg(aggregate_order_by(AnalysisResult.chat_score, *order)),
+            )
+            .where(AnalysisResult.user_id == any_(uuid_array(user_ids)))
+            .group_by(AnalysisResult.user_id)
+            .order_by(AnalysisResult.user_id)
+        )
+        return [
+            ScoreHistory(user_id, first_seen, last_seen, list(epochs), list(scores))
+            for user_id, first_seen, last_seen, epochs, scores in result
+        ]
 
 
-__all__ = ["AnalysisRepository"]
+__all__ = ["AnalysisRepository", "ScoreHistory"]
@@ -0,0 +1,192 @@
+"""Analysis trend repository."""
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Optional
+from typing import cast as type_cast
+from uuid import UUID
+
+from sqlalchemy import (
+    CursorResult,
+    Float,
+    Integer,
+    Row,
+    any_,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models.analysis_trend import AnalysisTrend
+from app.models.user import User
+from app.repositories.base import BaseRepository, uuid_array
+
+# Ten bound columns per row keeps each multi-row upsert well under asyncpg's
+# 32767-parameter limit.
+_UPSERT_ROWS = 1000
+_DAY_SECONDS = 86_400.0
+_REPLACED_COLUMNS = (
+    "analysis_count",
+    "first_seen",
+    "last_seen",
+    "recent_scores",
+    "ewma",
+    "sum_t",
+    "sum_tt",
+    "sum_score",
+    "sum_t_score",
+)
+
+
+class AnalysisTrendRepository(BaseRepository):
+    """Per-user trend rows, updated in place as results arrive or rebuilt in bulk."""
+
+    async def record(
+        self, user_id: UUID, score: int, timestamp: datetime, *, alpha: float, window: int
+    ) -> AnalysisTrend:
+        """Fold one new result into the user's trend with a single upsert.
+
+        Only the running sums, EWMA and the ``window`` most recent scores change, so the
+        cost is the same however long the user's history is.
+        """
+
+        trend = AnalysisTrend
+        t = timestamp.timestamp() / _DAY_SECONDS - (
+            func.extract("epoch", trend.first_seen) / _DAY_SECONDS
+        )
+        appended = func.array_append(trend.recent_scores, score, type_=ARRAY(Integer))
+        length = func.cardinality(trend.recent_scores)
+        stmt = self.upsert_insert(trend).values(
+            user_id=user_id,
+            analysis_count=1,
+            first_seen=timestamp,
+            last_seen=timestamp,
+            recent_scores=[score],
+            ewma=score,
+            sum_t=0.0,
+            sum_tt=0.0,
+            sum_score=score,
+            sum_t_score=0.0,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[trend.user_id],
+            set_={
+                "analysis_count": trend.analysis_count + 1,
+                "last_seen": func.greatest(trend.last_seen, timestamp),
+                "recent_scores": appended[func.greatest(length + 2 - window, 1) : length + 1],
+                "ewma": trend.ewma + alpha * (score - trend.ewma),
+                "sum_t": trend.sum_t + t,
+                "sum_tt": trend.sum_tt + t * t,
+                "sum_score": trend.sum_score + score,
+                "sum_t_score": trend.sum_t_score + t * score,
+                "updated_at": func.now(),
+            },
+        )
+        result = await self.session.execute(
+            stmt.returning(trend), execution_options={"populate_existing": True}
+        )
+        record = result.scalar_one()
+        await self.commit()
+        return record
+
+    async def get(self, user_id: UUID) -> Optional[AnalysisTrend]:
+        result = await self.session.execute(
+            select(AnalysisTrend).where(AnalysisTrend.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def for_stage(
+        self, stage: int, *, after: UUID | None = None, limit: int = 10_000
+    ) -> Sequence[Row]:
+        """Trend inputs of users on ``stage``, keyset-paged in ``user_id`` order.
+
+        Each row is ``user_id``, the window size and mean, ``ewma``, the five slope sums
+        (count first) and ``first_seen`` as epoch seconds, all numeric after the ID.
+        """
+
+        score = func.unnest(AnalysisTrend.recent_scores).column_valued("score")
+        window_mean = select(cast(func.coalesce(func.avg(score), 0), Float)).scalar_subquery()
+        stmt = (
+            select(
+                AnalysisTrend.user_id,
+                func.cardinality(AnalysisTrend.recent_scores),
+                window_mean,
+                AnalysisTrend.ewma,
+                AnalysisTrend.analysis_count,
+                AnalysisTrend.sum_t,
+                AnalysisTrend.sum_tt,
+                AnalysisTrend.sum_score,
+                AnalysisTrend.sum_t_score,
+                cast(func.extract("epoch", AnalysisTrend.first_seen), Float),
+            )
+            .join(User, User.id == AnalysisTrend.user_id)
+            .where(User.stage == stage)
+        )
+        if after is not None:
+            stmt = stmt.where(AnalysisTrend.user_id > after)
+        result = await self.session.execute(stmt.order_by(AnalysisTrend.user_id).limit(limit))
+        return result.all()
+
+    async def lock(self, user_ids: Sequence[UUID]) -> None:
+        """Row-lock the trends of ``user_ids``, creating placeholders for missing ones.
+
+        Taken before a rebuild reads result histories, so a result created meanwhile
+        either is in the history or waits and is folded into the rebuilt row.
+        """
+
+        if not user_ids:
+            return
+        ids = func.unnest(uuid_array(user_ids)).table_valued("user_id").render_derived()
+        stmt = self.upsert_insert(AnalysisTrend).from_select(
+            ["user_id", *_REPLACED_COLUMNS],
+            select(
+                ids.c.user_id,
+                literal(0),
+                func.now(),
+                func.now(),
+                literal([], ARRAY(Integer)),
+                *(literal(0.0) for _ in range(5)),
+            ),
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AnalysisTrend.user_id],
+                set_={"user_id": stmt.excluded.user_id},
+            )
+        )
+
+    async def replace_many(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Overwrite whole trend rows, one multi-row upsert per 1000 rows."""
+
+        for start in range(0, len(rows), _UPSERT_ROWS):
+            stmt = self.upsert_insert(AnalysisTrend).values(
+                list(rows[start : start + _UPSERT_ROWS])
+            )
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[AnalysisTrend.user_id],
+                    set_={
+                        **{column: stmt.excluded[column] for column in _REPLACED_COLUMNS},
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        await self.commit()
+        return len(rows)
+
+    async def delete_many(self, user_ids: Sequence[UUID]) -> int:
+        if not user_ids:
+            return 0
+        result = type_cast(
+            CursorResult[Any],
+            await self.session.execute(
+                delete(AnalysisTrend).where(AnalysisTrend.user_id == any_(uuid_array(user_ids)))
+            ),
+        )
+        await self.commit()
+        return result.rowcount
+
+
+__all__ = ["AnalysisTrendRepository"]
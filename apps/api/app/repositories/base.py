@@ -1,6 +1,19 @@
 """Base repository providing common helpers."""
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import BindParameter, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.uow import in_unit_of_work
+
+
+def uuid_array(ids: Sequence[UUID]) -> BindParameter:
+    """Bind ``ids`` as one ``uuid[]`` parameter, for ``= ANY(...)`` over large ID lists."""
+
+    return bindparam(None, list(ids), type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True)))
+
 
 class BaseRepository:
     """Base repository storing the session reference."""
@@ -8,5 +21,26 @@ class BaseRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    @property
+    def dialect_name(self) -> str:
+        """Name of the SQL dialect the session is bound to (e.g. ``postgresql``)."""
+
+        return self.session.get_bind().dialect.name
+
+    async def commit(self) -> None:
+        """Commit, or only flush when an enclosing unit of work owns the transaction."""
+
+        if in_unit_of_work(self.session):
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
+    def upsert_insert(self, entity: type):
+        """Return a dialect-specific ``INSERT`` supporting ``ON CONFLICT`` clauses."""
+
+        if self.dialect_name == "sqlite":
+            return sqlite.insert(entity)
+        return postgresql.insert(entity)
+
 
-__all__ = ["BaseRepository"]
+__all__ = ["BaseRepository", "uuid_array"]
@@ -1,13 +1,37 @@
 """Conversation repository."""
-from typing import Optional, Sequence
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import NamedTuple, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, tuple_, update
 
 from app.models.conversation import Conversation
 from app.repositories.base import BaseRepository
 
 
+class MessageCursor(NamedTuple):
+    """Keyset position of a message in a user's history, ordered by ``(timestamp, id)``."""
+
+    timestamp: datetime
+    id: UUID
+
+    @classmethod
+    def of(cls, message: Conversation) -> "MessageCursor":
+        return cls(message.timestamp, message.id)
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisMessage:
+    """Lightweight, detached view of a message used as analysis input."""
+
+    id: UUID
+    timestamp: datetime
+    sender_type: str
+    message_text: str
+
+
 class ConversationRepository(BaseRepository):
     """Data access for conversations."""
 
@@ -17,17 +41,95 @@ class ConversationRepository(BaseRepository):
         message_text: str,
         sender_type: str,
     ) -> Conversation:
-        record = Conversation(user_id=user_id, message_text=message_text, sender_type=sender_type)
-        self.session.add(record)
-        await self.session.commit()
-        await self.session.refresh(record)
+        result = await self.session.execute(
+            insert(Conversation)
+            .values(user_id=user_id, message_text=message_text, sender_type=sender_type)
+            .returning(Conversation)
+        )
+        record = result.scalar_one()
+        await self.commit()
         return record
 
-    async def list_for_user(self, user_id: UUID) -> Sequence[Conversation]:
-        result = await self.session.execute(
-            select(Conversation).where(Conversation.user_id == user_id).order_by(Conversation.timestamp)
+    async def list_for_user(
+        self,
+        user_id: UUID,
+        *,
+        limit: int | None = None,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> Sequence[Conversation]:
+        """Return messages in ascending ``(timestamp, id)`` order using keyset pagination.
+
+        ``after`` pages forward from a cursor; ``before`` returns the ``limit`` messages
+        immediately preceding it (the usual "load older history" scroll). Without a limit the
+        whole range is returned, which should be reserved for small histories.
+        """
+
+        key = tuple_(Conversation.timestamp, Conversation.id)
+        stmt = select(Conversation).where(Conversation.user_id == user_id)
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after))
+        if before is not None:
+            stmt = stmt.where(key < tuple_(*before))
+
+        descending = before is not None and after is None and limit is not None
+        if descending:
+            stmt = stmt.order_by(Conversation.timestamp.desc(), Conversation.id.desc())
+        else:
+            stmt = stmt.order_by(Conversation.timestamp, Conversation.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        result = await self.session.execute(stmt)
+        records = result.scalars().all()
+        return list(reversed(records)) if descending else records
+
+    async def stream_for_user(
+        self,
+        user_id: UUID,
+        *,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Conversation]:
+        """Yield a user's full history in ascending order through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time, so exports and analysis jobs run in
+        constant memory regardless of history length.
+        """
+
+        stmt = (
+            select(Conversation)
+            .where(Conversation.user_id == user_id)
+            .order_by(Conversation.timestamp, Conversation.id)
+            .execution_options(yield_per=batch_size)
         )
-        return result.scalars().all()
+        result = await self.session.stream(stmt)
+        async for record in result.scalars():
+            yield record
+
+    async def get_messages_for_analysis(
+        self,
+        user_id: UUID,
+        count: int,
+        sender_types: Iterable[str] | None = None,
+    ) -> list[AnalysisMessage]:
+        """Return the ``count`` most recent messages, oldest first, as plain rows.
+
+        Walks the ``(user_id, timestamp, id)`` index backwards with a LIMIT, so the cost is
+        independent of history length. Rows bypass the ORM identity map entirely.
+        """
+
+        stmt = select(
+            Conversation.id,
+            Conversation.timestamp,
+            Conversation.sender_type,
+            Conversation.message_text,
+        ).where(Conversation.user_id == user_id)
+        if sender_types is not None:
+            stmt = stmt.where(Conversation.sender_type.in_(list(sender_types)))
+        stmt = stmt.order_by(Conversation.timestamp.desc(), Conversation.id.desc()).limit(count)
+
+        result = await self.session.execute(stmt)
+        return [AnalysisMessage(*row) for row in reversed(result.all())]
 
     async def get(self, conversation_id: UUID) -> Optional[Conversation]:
         result = await self.session.execute(select(Conversation).where(Conversation.id == conversation_id))
@@ -40,25 +142,27 @@ class ConversationRepository(BaseRepository):
         message_text: str | None = None,
         sender_type: str | None = None,
     ) -> Optional[Conversation]:
-        record = await self.get(conversation_id)
-        if record is None:
-            return None
-
+        updates: dict[str, object] = {}
         if message_text is not None:
-            record.message_text = message_text
+            updates["message_text"] = message_text
         if sender_type is not None:
-            record.sender_type = sender_type
+            updates["sender_type"] = sender_type
+        if not updates:
+            return await self.get(conversation_id)
 
-        await self.session.commit()
-        await self.session.refresh(record)
+        result = await self.session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(**updates)
+            .returning(Conversation)
+        )
+        record = result.scalar_one_or_none()
+        await self.commit()
         return record
 
     async def delete(self, conversation_id: UUID) -> None:
-        record = await self.get(conversation_id)
-        if record is None:
-            return
-        await self.session.delete(record)
-        await self.session.commit()
+        await self.session.execute(delete(Conversation).where(Conversation.id == conversation_id))
+        await self.commit()
 
 
-__all__ = ["ConversationRepository"]
+__all__ = ["AnalysisMessage", "ConversationRepository", "MessageCursor"]
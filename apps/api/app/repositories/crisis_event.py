@@ -0,0 +1,171 @@
+"""Crisis event repository."""
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, NamedTuple, cast
+from uuid import UUID
+
+from sqlalchemy import (
+    CursorResult,
+    Integer,
+    Select,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+
+from app.models.crisis_event import SEVERITY_ORDER_SQL, CrisisEvent
+from app.repositories.base import BaseRepository
+
+SEVERITY_ORDER = {"critical": 0, "high": 1, "moderate": 2, "low": 3}
+# Textual so it renders exactly as the ``ix_crisis_events_open_by_severity`` expression.
+_severity_order = literal_column(f"({SEVERITY_ORDER_SQL})", Integer)
+
+
+@dataclass(frozen=True, slots=True)
+class NewCrisisEvent:
+    """A detected crisis waiting to be written.
+
+    ``created_at`` is the detection time, not the time the buffered event is written.
+    """
+
+    user_id: UUID
+    message_id: UUID
+    trigger_type: str
+    severity_level: str
+    keywords_detected: tuple[str, ...] = ()
+    resources_shown: tuple[dict[str, Any], ...] = ()
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ReviewCursor(NamedTuple):
+    """Keyset position in the review queue, ordered most severe first, then oldest first."""
+
+    severity_level: str
+    created_at: datetime
+    id: UUID
+
+    @classmethod
+    def of(cls, event: CrisisEvent) -> "ReviewCursor":
+        return cls(event.severity_level, event.created_at, event.id)
+
+
+def review_queue_query(
+    *, limit: int, min_severity: str | None = None, after: ReviewCursor | None = None
+) -> Select[Any]:
+    stmt = select(CrisisEvent).where(CrisisEvent.resolution_timestamp.is_(None))
+    if min_severity is not None:
+        stmt = stmt.where(_severity_order <= SEVERITY_ORDER[min_severity])
+    if after is not None:
+        key = tuple_(_severity_order, CrisisEvent.created_at, CrisisEvent.id)
+        stmt = stmt.where(
+            key > tuple_(SEVERITY_ORDER[after.severity_level], after.created_at, after.id)
+        )
+    return stmt.order_by(_severity_order, CrisisEvent.created_at, CrisisEvent.id).limit(limit)
+
+
+def unacknowledged_query(
+    *, limit: int, older_than: timedelta | None = None
+) -> Select[Any]:
+    stmt = select(CrisisEvent).where(~CrisisEvent.user_acknowledged)
+    if older_than is not None:
+        stmt = stmt.where(CrisisEvent.created_at < func.now() - older_than)
+    return stmt.order_by(CrisisEvent.created_at, CrisisEvent.id).limit(limit)
+
+
+class CrisisEventRepository(BaseRepository):
+    """Append crisis events in batches and serve the review queue."""
+
+    async def add_many(self, events: Sequence[NewCrisisEvent]) -> int:
+        """Insert ``events`` with one multi-row ``INSERT``. Returns how many were written."""
+
+        if not events:
+            return 0
+        await self.session.execute(
+            insert(CrisisEvent).values(
+                [
+                    {
+                        "user_id": event.user_id,
+                        "message_id": event.message_id,
+                        "trigger_type": event.trigger_type,
+                        "severity_level": event.severity_level,
+                        "keywords_detected": list(event.keywords_detected),
+                        "resources_shown": list(event.resources_shown),
+                        "created_at": event.created_at,
+                    }
+                    for event in events
+                ]
+            )
+        )
+        await self.commit()
+        return len(events)
+
+    async def review_queue(
+        self,
+        *,
+        limit: int = 50,
+        min_severity: str | None = None,
+        after: ReviewCursor | None = None,
+    ) -> Sequence[CrisisEvent]:
+        """Unresolved events, most severe first and oldest first within a severity.
+
+        Reads ``ix_crisis_events_open_by_severity`` in order, so a page costs the same
+        however many events are open or resolved. Page with ``after=ReviewCursor.of(last)``.
+        """
+
+        result = await self.session.execute(
+            review_queue_query(limit=limit, min_severity=min_severity, after=after)
+        )
+        return result.scalars().all()
+
+    async def unacknowledged(
+        self, *, limit: int = 50, older_than: timedelta | None = None
+    ) -> Sequence[CrisisEvent]:
+        """Events the user has not acknowledged yet, oldest first."""
+
+        result = await self.session.execute(
+            unacknowledged_query(limit=limit, older_than=older_than)
+        )
+        return result.scalars().all()
+
+    async def list_for_user(self, user_id: UUID) -> Sequence[CrisisEvent]:
+        result = await self.session.execute(
+            select(CrisisEvent)
+            .where(CrisisEvent.user_id == user_id)
+            .order_by(CrisisEvent.created_at, CrisisEvent.id)
+        )
+        return result.scalars().all()
+
+    async def acknowledge(self, event_id: UUID) -> bool:
+        return await self._update(event_id, user_acknowledged=True)
+
+    async def resolve(self, event_id: UUID, *, followup_required: bool = False) -> bool:
+        return await self._update(
+            event_id, resolution_timestamp=func.now(), followup_required=followup_required
+        )
+
+    async def _update(self, event_id: UUID, **values: Any) -> bool:
+        result = cast(
+            CursorResult[Any],
+            await self.session.execute(
+                update(CrisisEvent)
+                .where(CrisisEvent.id == event_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        await self.commit()
+        return result.rowcount > 0
+
+
+__all__ = [
+    "CrisisEventRepository",
+    "NewCrisisEvent",
+    "ReviewCursor",
+    "SEVERITY_ORDER",
+    "review_queue_query",
+    "unacknowledged_query",
+]
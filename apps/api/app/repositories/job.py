@@ -0,0 +1,157 @@
+"""Job queue repository."""
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Interval, func, insert, select, type_coerce, update
+
+from app.models.job import Job
+from app.repositories.base import BaseRepository
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedJob:
+    """Job leased to a worker."""
+
+    id: UUID
+    name: str
+    data: dict[str, Any]
+    retry_count: int
+    retry_limit: int
+
+
+@dataclass(frozen=True, slots=True)
+class JobQueueStats:
+    """Pending work for one job name."""
+
+    name: str
+    ready: int
+    delayed: int
+    oldest_ready_seconds: float
+
+
+class JobRepository(BaseRepository):
+    """Enqueue, claim and settle background jobs."""
+
+    async def enqueue(
+        self,
+        name: str,
+        data: dict[str, Any] | None = None,
+        *,
+        priority: int = 0,
+        retry_limit: int = 3,
+        delay: timedelta | None = None,
+    ) -> UUID:
+        values: dict[str, Any] = {
+            "name": name,
+            "data": data or {},
+            "priority": priority,
+            "retry_limit": retry_limit,
+        }
+        if delay is not None:
+            values["start_after"] = func.now() + delay
+        result = await self.session.execute(insert(Job).values(**values).returning(Job.id))
+        job_id = result.scalar_one()
+        await self.commit()
+        return job_id
+
+    async def claim(self, names: Iterable[str], limit: int, lease: timedelta) -> list[ClaimedJob]:
+        """Lease up to ``limit`` due jobs in one statement.
+
+        Candidates are locked with ``FOR UPDATE SKIP LOCKED`` so concurrent workers never pick
+        the same row, and their ``start_after`` is pushed forward by ``lease``. A worker that
+        dies mid-batch therefore releases its jobs once the lease expires.
+        """
+
+        due = (
+            select(Job.id)
+            .where(
+                Job.name.in_(list(names)),
+                Job.completed_at.is_(None),
+                Job.failed_at.is_(None),
+                Job.start_after <= func.now(),
+            )
+            .order_by(Job.priority.desc(), Job.start_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(due))
+            .values(start_after=func.now() + lease)
+            .returning(Job.id, Job.name, Job.data, Job.retry_count, Job.retry_limit)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = [ClaimedJob(*row) for row in result.all()]
+        await self.commit()
+        return jobs
+
+    async def seconds_until_next_due(self, names: Iterable[str]) -> float | None:
+        """Seconds until the earliest pending job becomes due (``0`` if one is due now)."""
+
+        result = await self.session.execute(
+            select(type_coerce(func.min(Job.start_after) - func.now(), Interval)).where(
+                Job.name.in_(list(names)),
+                Job.completed_at.is_(None),
+                Job.failed_at.is_(None),
+            )
+        )
+        delay = result.scalar_one_or_none()
+        if delay is None:
+            return None
+        return max(delay.total_seconds(), 0.0)
+
+    async def queue_stats(self) -> list[JobQueueStats]:
+        """Ready and delayed (scheduled, retrying or leased) job counts per name.
+
+        Only reads pending rows, so it stays on ``ix_job_queue_pending`` however many
+        completed jobs the table holds.
+        """
+
+        due = Job.start_after <= func.now()
+        result = await self.session.execute(
+            select(
+                Job.name,
+                func.count().filter(due),
+                func.count().filter(~due),
+                func.extract("epoch", func.now() - func.min(Job.start_after).filter(due)),
+            )
+            .where(Job.completed_at.is_(None), Job.failed_at.is_(None))
+            .group_by(Job.name)
+        )
+        return [
+            JobQueueStats(name, ready, delayed, float(oldest or 0.0))
+            for name, ready, delayed, oldest in result.all()
+        ]
+
+    async def complete_many(self, job_ids: Sequence[UUID]) -> None:
+        if not job_ids:
+            return
+        await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(list(job_ids)))
+            .values(completed_at=func.now(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.commit()
+
+    async def retry_or_fail(self, job: ClaimedJob, error: str, backoff: timedelta) -> None:
+        """Reschedule ``job`` after ``backoff`` or park it once its retries are exhausted."""
+
+        values: dict[str, Any] = {"retry_count": job.retry_count + 1, "last_error": error}
+        if job.retry_count >= job.retry_limit:
+            values["failed_at"] = func.now()
+        else:
+            values["start_after"] = func.now() + backoff
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.commit()
+
+
+__all__ = ["ClaimedJob", "JobQueueStats", "JobRepository"]
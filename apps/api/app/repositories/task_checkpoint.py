@@ -0,0 +1,71 @@
+"""Task checkpoint repository."""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import func, select, update
+
+from app.models.task_checkpoint import TaskCheckpoint
+from app.repositories.base import BaseRepository
+
+
+class TaskCheckpointRepository(BaseRepository):
+    """Save and read batch task progress.
+
+    Call ``advance`` in the same transaction as the chunk it records, so the saved
+    position never runs ahead of, or behind, the work actually committed.
+    """
+
+    async def get(self, name: str) -> Optional[TaskCheckpoint]:
+        result = await self.session.execute(
+            select(TaskCheckpoint)
+            .where(TaskCheckpoint.name == name)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def start(self, name: str, started_at: datetime) -> TaskCheckpoint:
+        """Begin a new run of ``name``, discarding the previous run's progress."""
+
+        values = {
+            "position": None,
+            "started_at": started_at,
+            "processed": 0,
+            "changed": 0,
+            "finished_at": None,
+        }
+        stmt = self.upsert_insert(TaskCheckpoint).values(name=name, **values)
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TaskCheckpoint.name],
+                set_={**values, "updated_at": func.now()},
+            ).returning(TaskCheckpoint),
+            execution_options={"populate_existing": True},
+        )
+        checkpoint = result.scalar_one()
+        await self.commit()
+        return checkpoint
+
+    async def advance(self, name: str, position: str, *, processed: int, changed: int) -> None:
+        """Move the run past ``position``, adding to its counters."""
+
+        await self._update(
+            name,
+            position=position,
+            processed=TaskCheckpoint.processed + processed,
+            changed=TaskCheckpoint.changed + changed,
+        )
+
+    async def finish(self, name: str) -> None:
+        await self._update(name, finished_at=func.now())
+
+    async def _update(self, name: str, **values: Any) -> None:
+        await self.session.execute(
+            update(TaskCheckpoint)
+            .where(TaskCheckpoint.name == name)
+            .values(**values, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await self.commit()
+
+
+__all__ = ["TaskCheckpointRepository"]
@@ -1,16 +1,91 @@
 """User repository encapsulating database operations."""
-from typing import Any, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    Text,
+    column,
+    delete,
+    event,
+    exists,
+    func,
+    insert,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import SessionTransaction
 
+from app.core.cache import USER_CACHE_CHANNEL, AsyncLRUCache
 from app.models.user import User
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, uuid_array
 from app.schemas.user import UserCreate
 
+# Three bound columns per row keeps each ``VALUES`` list under asyncpg's 32767 parameters.
+_STAGE_CHANGE_ROWS = 10_000
+# ``session.info`` key: users updated or deleted in the session's open transaction.
+_WRITTEN_KEY = "user_repository_written"
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Immutable copy of a user row that is safe to share across requests."""
+
+    id: UUID
+    email: str
+    password_hash: str
+    goals: Mapping[str, Any] | None
+    stage: int
+    created_at: datetime
+
+    @classmethod
+    def of(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            password_hash=user.password_hash,
+            goals=MappingProxyType(dict(user.goals)) if user.goals is not None else None,
+            stage=user.stage,
+            created_at=user.created_at,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StageChange:
+    """Move a user from ``from_stage`` to ``to_stage``."""
+
+    user_id: UUID
+    from_stage: int
+    to_stage: int
+
 
 class UserRepository(BaseRepository):
-    """CRUD helpers for user entities."""
+    """CRUD helpers for user entities.
+
+    ``get_snapshot``/``get_snapshot_by_email`` read through an optional ``AsyncLRUCache``
+    keyed by user id, with email lookups cached as an email -> id mapping. ``update`` and
+    ``delete`` invalidate the id immediately and again when the transaction commits or
+    rolls back, and with ``broadcast`` also ``pg_notify`` other processes in the same
+    transaction. Until then, snapshot reads on that session bypass the cache, so rows the
+    transaction has not committed never reach other requests.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        cache: AsyncLRUCache[Any, Any] | None = None,
+        broadcast: bool = False,
+    ) -> None:
+        super().__init__(session)
+        self._cache = cache
+        self._broadcast = broadcast
 
     async def get_by_email(self, email: str) -> Optional[User]:
         result = await self.session.execute(select(User).where(User.email == email))
@@ -20,16 +95,69 @@ class UserRepository(BaseRepository):
         result = await self.session.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_snapshot(self, user_id: UUID) -> Optional[UserSnapshot]:
+        cache = self._read_cache()
+        if cache is None:
+            return await self._load_snapshot(user_id)
+        return await cache.get_or_load(user_id, lambda: self._load_snapshot(user_id))
+
+    async def get_snapshot_by_email(self, email: str) -> Optional[UserSnapshot]:
+        cache = self._read_cache()
+        if cache is None:
+            user = await self.get_by_email(email)
+            return UserSnapshot.of(user) if user is not None else None
+
+        key = ("email", email)
+        user_id = await cache.get_or_load(key, lambda: self._load_id_by_email(email))
+        if user_id is None:
+            return None
+        snapshot = await self.get_snapshot(user_id)
+        if snapshot is None or snapshot.email != email:
+            # The address moved to another account or the user was deleted since we cached it.
+            cache.invalidate(key)
+            return None
+        return snapshot
+
+    async def email_exists(self, email: str) -> bool:
+        result = await self.session.execute(select(exists().where(User.email == email)))
+        return bool(result.scalar())
+
     async def create(self, payload: UserCreate, password_hash: str) -> User:
-        user = User(
-            email=payload.email,
-            password_hash=password_hash,
-            goals=payload.goals,
-            stage=payload.stage,
+        result = await self.session.execute(
+            insert(User)
+            .values(
+                email=payload.email,
+                password_hash=password_hash,
+                goals=payload.goals,
+                stage=payload.stage,
+            )
+            .returning(User)
+        )
+        user = result.scalar_one()
+        await self.commit()
+        return user
+
+    async def create_if_absent(self, payload: UserCreate, password_hash: str) -> Optional[User]:
+        """Insert the user in one statement, returning ``None`` if the email is taken.
+
+        Uses ``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING`` so concurrent signups for
+        the same address cannot race between a lookup and the insert.
+        """
+
+        stmt = (
+            self.upsert_insert(User)
+            .values(
+                email=payload.email,
+                password_hash=password_hash,
+                goals=payload.goals,
+                stage=payload.stage,
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
         )
-        self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        result = await self.session.execute(stmt)
+        user = result.scalar_one_or_none()
+        await self.commit()
         return user
 
     async def update(self, user_id: UUID, **fields: Any) -> Optional[User]:
@@ -40,23 +168,105 @@ class UserRepository(BaseRepository):
         if not updates:
             return await self.get(user_id)
 
-        user = await self.get(user_id)
-        if user is None:
-            return None
-
-        for key, value in updates.items():
-            setattr(user, key, value)
-
-        await self.session.commit()
-        await self.session.refresh(user)
+        result = await self.session.execute(
+            update(User).where(User.id == user_id).values(**updates).returning(User)
+        )
+        user = result.scalar_one_or_none()
+        await self._invalidate(user_id)
+        await self.commit()
         return user
 
     async def delete(self, user_id: UUID) -> None:
+        await self.session.execute(delete(User).where(User.id == user_id))
+        await self._invalidate(user_id)
+        await self.commit()
+
+    async def apply_stage_changes(self, changes: Sequence[StageChange]) -> list[UUID]:
+        """Apply ``changes`` with one ``UPDATE ... FROM (VALUES ...)``; returns who changed.
+
+        A change is skipped if the user is no longer on its ``from_stage``, so re-applying
+        a batch, or racing another writer, never moves a user twice.
+        """
+
+        changed: list[UUID] = []
+        for start in range(0, len(changes), _STAGE_CHANGE_ROWS):
+            rows = values(
+                column("user_id", PG_UUID(as_uuid=True)),
+                column("from_stage", Integer),
+                column("to_stage", Integer),
+                name="stage_changes",
+            ).data(
+                [
+                    (change.user_id, change.from_stage, change.to_stage)
+                    for change in changes[start : start + _STAGE_CHANGE_ROWS]
+                ]
+            )
+            result = await self.session.execute(
+                update(User)
+                .where(User.id == rows.c.user_id, User.stage == rows.c.from_stage)
+                .values(stage=rows.c.to_stage)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            )
+            changed.extend(result.scalars())
+        await self._invalidate_many(changed)
+        await self.commit()
+        return changed
+
+    async def _load_snapshot(self, user_id: UUID) -> Optional[UserSnapshot]:
         user = await self.get(user_id)
-        if user is None:
+        return UserSnapshot.of(user) if user is not None else None
+
+    async def _load_id_by_email(self, email: str) -> Optional[UUID]:
+        result = await self.session.execute(select(User.id).where(User.email == email))
+        return result.scalar_one_or_none()
+
+    def _read_cache(self) -> AsyncLRUCache[Any, Any] | None:
+        """The cache, unless this session has uncommitted user writes that reads could see."""
+
+        return None if self.session.info.get(_WRITTEN_KEY) else self._cache
+
+    async def _invalidate(self, user_id: UUID) -> None:
+        """Drop ``user_id`` from the local cache and, with ``broadcast``, every other process's.
+
+        Broadcasts even without a local cache.
+        """
+
+        await self._invalidate_many([user_id])
+
+    async def _invalidate_many(self, user_ids: Sequence[UUID]) -> None:
+        """Invalidate ``user_ids`` now and at the end of the transaction, whichever way it ends.
+
+        A concurrent reader may cache the old row before the commit, and a rollback leaves
+        the old row current again. Broadcasts use a single ``pg_notify`` statement.
+        """
+
+        if not user_ids:
             return
-        await self.session.delete(user)
-        await self.session.commit()
+        info = self.session.info
+        info.setdefault(_WRITTEN_KEY, set()).update(user_ids)
+        cache = self._cache
+
+        def invalidate() -> None:
+            if cache is not None:
+                for user_id in user_ids:
+                    cache.invalidate(user_id)
+
+        def on_commit(_: object) -> None:
+            info.pop(_WRITTEN_KEY, None)
+            invalidate()
+
+        def on_rollback(_: object, previous: SessionTransaction) -> None:
+            if not previous.nested:
+                on_commit(_)
 
+        invalidate()
+        event.listen(self.session.sync_session, "after_commit", on_commit, once=True)
+        event.listen(self.session.sync_session, "after_soft_rollback", on_rollback)
+        if self._broadcast:
+            ids = func.unnest(uuid_array(user_ids)).table_valued("user_id").render_derived()
+            await self.session.execute(
+                select(func.pg_notify(USER_CACHE_CHANNEL, ids.c.user_id.cast(Text)))
+            )
 
-__all__ = ["UserRepository"]
+__all__ = ["StageChange", "UserRepository", "UserSnapshot"]
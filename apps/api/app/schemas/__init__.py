@@ -1,4 +1,5 @@
 """Pydantic schema exports."""
+from .chat import ChatSendRequest
 from .user import SignupResponse, UserCreate, UserRead
 
-__all__ = ["UserCreate", "UserRead", "SignupResponse"]
+__all__ = ["UserCreate", "UserRead", "SignupResponse", "ChatSendRequest"]
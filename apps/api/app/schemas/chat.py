@@ -0,0 +1,9 @@
+"""Pydantic schemas for chat resources."""
+from pydantic import BaseModel, Field
+
+
+class ChatSendRequest(BaseModel):
+    message: str = Field(min_length=1, max_length=2000)
+
+
+__all__ = ["ChatSendRequest"]
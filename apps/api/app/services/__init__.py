@@ -1,13 +1,32 @@
 """Service exports."""
 from .analysis_service import AnalysisService
+from .chat_service import ChatService
 from .conversation_service import ConversationService
-from .exceptions import DomainError, EmailAlreadyExistsError
+from .crisis_detection_service import CrisisAssessment, CrisisDetectionService
+from .crisis_event_log import CrisisEventLog
+from .exceptions import (
+    DomainError,
+    EmailAlreadyExistsError,
+    LLMError,
+    LLMUnavailableError,
+    UserNotFoundError,
+)
+from .trends import TrendConfig, TrendSummary
 from .user_service import UserService
 
 __all__ = [
     "UserService",
     "ConversationService",
     "AnalysisService",
+    "ChatService",
+    "CrisisAssessment",
+    "CrisisDetectionService",
+    "CrisisEventLog",
     "DomainError",
     "EmailAlreadyExistsError",
+    "LLMError",
+    "LLMUnavailableError",
+    "TrendConfig",
+    "TrendSummary",
+    "UserNotFoundError",
 ]
@@ -1,23 +1,53 @@
 """Service managing analysis results."""
+from datetime import datetime
 from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.uow import unit_of_work
 from app.repositories.analysis import AnalysisRepository
+from app.repositories.analysis_trend import AnalysisTrendRepository
+from app.services.trends import TrendConfig, TrendSummary, rebuild_trends
 
 
 class AnalysisService:
-    """Business logic for analysis records."""
+    """Business logic for analysis records.
 
-    def __init__(self, session: AsyncSession) -> None:
+    Result listings go through ``read_session`` (a replica) when one is given. Every
+    write keeps the user's ``analysis_trends`` row in step within the same transaction:
+    creating a result is one extra upsert, editing or deleting one rebuilds the trend.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        read_session: AsyncSession | None = None,
+        trend_config: TrendConfig | None = None,
+    ) -> None:
+        self._session = session
         self._repo = AnalysisRepository(session)
+        self._reads = AnalysisRepository(read_session) if read_session is not None else self._repo
+        self._trends = AnalysisTrendRepository(session)
+        self._trend_config = trend_config or TrendConfig()
 
     async def create_result(self, user_id: UUID, chat_score: int, message_range: str | None = None):
-        return await self._repo.create(user_id=user_id, chat_score=chat_score, message_range=message_range)
+        async with unit_of_work(self._session):
+            record = await self._repo.create(
+                user_id=user_id, chat_score=chat_score, message_range=message_range
+            )
+            await self._trends.record(
+                user_id,
+                chat_score,
+                record.timestamp,
+                alpha=self._trend_config.alpha,
+                window=self._trend_config.window,
+            )
+        return record
 
     async def list_results(self, user_id: UUID) -> Sequence:
-        return await self._repo.list_for_user(user_id)
+        return await self._reads.list_for_user(user_id)
 
     async def get_result(self, analysis_id: UUID):
         return await self._repo.get(analysis_id)
@@ -29,10 +59,25 @@ class AnalysisService:
         chat_score: int | None = None,
         message_range: str | None = None,
     ):
-        return await self._repo.update(analysis_id, chat_score=chat_score, message_range=message_range)
+        async with unit_of_work(self._session):
+            record = await self._repo.update(
+                analysis_id, chat_score=chat_score, message_range=message_range
+            )
+            if record is not None and chat_score is not None:
+                await rebuild_trends(self._session, [record.user_id], self._trend_config)
+        return record
 
     async def delete_result(self, analysis_id: UUID) -> None:
-        await self._repo.delete(analysis_id)
+        async with unit_of_work(self._session):
+            user_id = await self._repo.delete(analysis_id)
+            if user_id is not None:
+                await rebuild_trends(self._session, [user_id], self._trend_config)
+
+    async def get_trend(self, user_id: UUID, now: datetime | None = None) -> TrendSummary | None:
+        """The user's trend and graduation readiness, read from one ``analysis_trends`` row."""
+
+        trend = await self._trends.get(user_id)
+        return TrendSummary.of(trend, self._trend_config, now) if trend is not None else None
 
 
 __all__ = ["AnalysisService"]
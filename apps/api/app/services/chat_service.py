@@ -0,0 +1,116 @@
+"""Chat service: save the user's message, stream the coach reply, save the reply."""
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from itertools import dropwhile
+from typing import Literal
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.uow import unit_of_work
+from app.models.conversation import Conversation
+from app.repositories.conversation import AnalysisMessage
+from app.services.conversation_service import ConversationService, CrisisHandler
+from app.services.crisis_detection_service import CLEAR, CrisisAssessment, CrisisDetectionService
+from app.services.exceptions import UserNotFoundError
+from app.services.interfaces import ChatMessage, LLMClient
+
+COACH_SYSTEM_PROMPT = (
+    "You are Noria, a warm and practical social coach helping young adults build real-world "
+    "friendships. Keep replies short, conversational and specific to what the user said."
+)
+CRISIS_SYSTEM_PROMPT = (
+    "The user's latest message suggests they may be in crisis. Respond with warmth and "
+    "without judgement, do not try to coach them through it, and gently encourage them to "
+    "reach out to the crisis resources shown alongside this reply or to someone they trust."
+)
+
+_ROLES: dict[str, Literal["user", "assistant"]] = {"user": "user", "coach": "assistant"}
+
+
+@dataclass(frozen=True, slots=True)
+class ChatTurn:
+    """A saved user message and the context the reply is generated from."""
+
+    user_id: UUID
+    message_id: UUID
+    context: tuple[ChatMessage, ...]
+    crisis: CrisisAssessment = CLEAR
+
+
+class ChatService:
+    """Runs one exchange as two short transactions around the model call.
+
+    Sessions come from ``session_factory`` rather than the request, so no database
+    connection is held while the reply streams.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        llm: LLMClient,
+        *,
+        history_messages: int = 20,
+        crisis_detector: CrisisDetectionService | None = None,
+        on_crisis: CrisisHandler | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._llm = llm
+        self._history_messages = history_messages
+        self._crisis_detector = crisis_detector
+        self._on_crisis = on_crisis
+
+    async def start_turn(self, user_id: UUID, message_text: str) -> ChatTurn:
+        """Save the user's message and load recent history, including it, as model context.
+
+        The message is checked for crisis language as it is saved, before the model is called.
+        A detection is passed to ``on_crisis`` once the message is committed.
+        """
+
+        crisis: list[tuple[Conversation, CrisisAssessment]] = []
+        try:
+            async with self._session_factory() as session, unit_of_work(session):
+                conversations = ConversationService(
+                    session,
+                    crisis_detector=self._crisis_detector,
+                    on_crisis=lambda message, assessment: crisis.append((message, assessment)),
+                )
+                message = await conversations.create_message(user_id, message_text, "user")
+                # Primary, not replica: the message just written must be part of the context.
+                history = await conversations.get_messages_for_analysis(
+                    user_id, self._history_messages
+                )
+        except IntegrityError as exc:
+            raise UserNotFoundError(f"User {user_id} does not exist") from exc
+        assessment = CLEAR
+        if crisis:
+            _, assessment = crisis[0]
+            if self._on_crisis is not None:
+                self._on_crisis(message, assessment)
+        return ChatTurn(user_id, message.id, _to_context(history), assessment)
+
+    def stream_reply(self, turn: ChatTurn) -> AsyncIterator[str]:
+        system = COACH_SYSTEM_PROMPT
+        if turn.crisis.detected:
+            system = f"{COACH_SYSTEM_PROMPT}\n\n{CRISIS_SYSTEM_PROMPT}"
+        return self._llm.stream_reply(turn.context, system=system)
+
+    async def save_reply(self, turn: ChatTurn, reply_text: str) -> Conversation:
+        async with self._session_factory() as session, unit_of_work(session):
+            return await ConversationService(session).create_message(
+                turn.user_id, reply_text, "coach"
+            )
+
+
+def _to_context(history: Sequence[AnalysisMessage]) -> tuple[ChatMessage, ...]:
+    messages = (
+        ChatMessage(_ROLES[m.sender_type], m.message_text)
+        for m in history
+        if m.sender_type in _ROLES
+    )
+    # The Messages API requires the conversation to open with a user turn.
+    return tuple(dropwhile(lambda m: m.role != "user", messages))
+
+
+__all__ = ["COACH_SYSTEM_PROMPT", "CRISIS_SYSTEM_PROMPT", "ChatService", "ChatTurn"]
@@ -1,23 +1,100 @@
 """Service managing conversations."""
+import logging
+from collections.abc import AsyncIterator, Callable, Iterable
+from functools import partial
 from typing import Sequence
 from uuid import UUID
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import SessionTransaction
 
-from app.repositories.conversation import ConversationRepository
+from app.core.logging import log_event
+from app.core.uow import unit_of_work
+from app.models.conversation import Conversation
+from app.repositories.conversation import (
+    AnalysisMessage,
+    ConversationRepository,
+    MessageCursor,
+)
+from app.services.crisis_detection_service import CLEAR, CrisisAssessment, CrisisDetectionService
+
+CrisisHandler = Callable[[Conversation, CrisisAssessment], None]
 
 
 class ConversationService:
-    """Wrapper around the conversation repository."""
+    """Wrapper around the conversation repository.
+
+    History listing, streaming and analysis reads go through ``read_session`` (a replica)
+    when one is given; writes and single-message lookups stay on the primary ``session``.
+
+    With a ``crisis_detector``, every user message is assessed inline as it is created;
+    a detection is logged and passed to ``on_crisis`` with the saved message once it is
+    committed, so a rolled-back message never reaches the handler.
+    """
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        read_session: AsyncSession | None = None,
+        crisis_detector: CrisisDetectionService | None = None,
+        on_crisis: CrisisHandler | None = None,
+    ) -> None:
         self._repo = ConversationRepository(session)
+        self._reads = (
+            ConversationRepository(read_session) if read_session is not None else self._repo
+        )
+        self._crisis_detector = crisis_detector
+        self._on_crisis = on_crisis
 
     async def create_message(self, user_id: UUID, message_text: str, sender_type: str):
-        return await self._repo.create(user_id=user_id, message_text=message_text, sender_type=sender_type)
+        assessment = CLEAR
+        if sender_type == "user" and self._crisis_detector is not None:
+            assessment = self._crisis_detector.assess(message_text)
+        session = self._repo.session
+        async with unit_of_work(session):
+            message = await self._repo.create(
+                user_id=user_id, message_text=message_text, sender_type=sender_type
+            )
+            if assessment.detected:
+                # Never log the message text itself.
+                log_event(
+                    "crisis_detected",
+                    level=logging.WARNING,
+                    user_id=str(user_id),
+                    message_id=str(message.id),
+                    severity=assessment.severity,
+                    trigger_type=assessment.trigger_type,
+                )
+                if self._on_crisis is not None:
+                    _after_commit(session, partial(self._on_crisis, message, assessment))
+        return message
 
-    async def list_messages(self, user_id: UUID) -> Sequence:
-        return await self._repo.list_for_user(user_id)
+    async def list_messages(
+        self,
+        user_id: UUID,
+        *,
+        limit: int | None = None,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> Sequence:
+        return await self._reads.list_for_user(user_id, limit=limit, before=before, after=after)
+
+    def stream_messages(
+        self, user_id: UUID, *, batch_size: int = 500
+    ) -> AsyncIterator[Conversation]:
+        return self._reads.stream_for_user(user_id, batch_size=batch_size)
+
+    async def get_messages_for_analysis(
+        self,
+        user_id: UUID,
+        count: int,
+        sender_types: Iterable[str] | None = None,
+    ) -> list[AnalysisMessage]:
+        return await self._reads.get_messages_for_analysis(
+            user_id, count, sender_types=sender_types
+        )
 
     async def get_message(self, conversation_id: UUID):
         return await self._repo.get(conversation_id)
@@ -29,10 +106,34 @@ class ConversationService:
         message_text: str | None = None,
         sender_type: str | None = None,
     ):
-        return await self._repo.update(conversation_id, message_text=message_text, sender_type=sender_type)
+        return await self._repo.update(
+            conversation_id, message_text=message_text, sender_type=sender_type
+        )
 
     async def delete_message(self, conversation_id: UUID) -> None:
         await self._repo.delete(conversation_id)
 
 
-__all__ = ["ConversationService"]
+def _after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run ``callback`` when the session's current transaction commits, never on rollback.
+
+    With a unit of work open that is when the outermost one exits.
+    """
+
+    settled = False
+
+    def on_commit(_: object) -> None:
+        nonlocal settled
+        if not settled:
+            settled = True
+            callback()
+
+    def on_rollback(_: object, previous: SessionTransaction) -> None:
+        nonlocal settled
+        settled = settled or not previous.nested
+
+    event.listen(session.sync_session, "after_commit", on_commit, once=True)
+    event.listen(session.sync_session, "after_soft_rollback", on_rollback)
+
+
+__all__ = ["ConversationService", "CrisisHandler"]
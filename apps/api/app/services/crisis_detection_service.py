@@ -0,0 +1,371 @@
+"""Crisis keyword detection over a compiled Aho-Corasick automaton.
+
+The lexicon (``crisis_lexicon.json`` by default) lists phrases per crisis type and
+severity, benign phrases that suppress matches they contain ("killing it", "suicide
+prevention"), negations that suppress a non-critical match they directly precede ("not
+suicidal"), and the resources to show. It is compiled once into an Aho-Corasick automaton, so
+assessing a message is a single pass over its normalized words whatever the lexicon
+size. Messages are normalized to words before matching: accents, case, zero-width
+characters, common homoglyphs and digit/symbol substitutions, spaced-out letters
+("k i l l") and stretched letters ("diiie") are all folded.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import re
+import unicodedata
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal
+
+from app.core.config import get_settings
+from app.core.logging import log_event
+
+CrisisType = Literal[
+    "suicide_ideation",
+    "self_harm",
+    "severe_depression",
+    "abuse_disclosure",
+    "eating_disorder",
+    "substance_abuse",
+]
+Severity = Literal["low", "moderate", "high", "critical"]
+
+SEVERITY_RANK: dict[str, int] = {"low": 1, "moderate": 2, "high": 3, "critical": 4}
+DEFAULT_LEXICON_PATH = Path(__file__).with_name("crisis_lexicon.json")
+
+# Zero-width characters, soft hyphens and apostrophes vanish; a few Cyrillic/Greek
+# homoglyphs that survive NFKD map to their Latin look-alikes.
+_FOLD = str.maketrans(
+    {
+        **dict.fromkeys("\u200b\u200c\u200d\u2060\ufeff\u00ad'\u2019\u2018`\u00b4"),
+        **dict(zip("аеорсухіјѕԁοαντι", "aeopcyxijsdoavti", strict=True)),
+    }
+)
+# ASCII-only text takes one translate: apostrophes vanish, other punctuation separates.
+_ASCII_FOLD = str.maketrans(
+    {
+        **{chr(code): " " for code in range(128) if not chr(code).isalnum()},
+        **dict.fromkeys("'`"),
+    }
+)
+_LEET = str.maketrans("013457@$", "oieastas")
+_LEET_CHAR = re.compile(r"[0-9@$]")
+_LEET_RUN = re.compile(r"(?<=[a-z])[0-9@$]+|[0-9@$]+(?=[a-z])")
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+_REPEATS = re.compile(r"(.)\1+")
+# Cheap pre-check so ordinary messages skip the word-by-word merge below.
+_SPACED_LETTERS = re.compile(r" \S \S \S ")
+
+_detector: "CrisisDetectionService | None" = None
+
+
+def normalize(text: str) -> str:
+    """Fold ``text`` to the space-separated words patterns are matched against."""
+
+    return " ".join(_words(text))
+
+
+def _words(text: str) -> list[str]:
+    if text.isascii():
+        text = text.casefold()
+    else:
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+        text = text.casefold().translate(_FOLD)
+    if _LEET_CHAR.search(text):
+        text = _LEET_RUN.sub(lambda m: m.group().translate(_LEET), text)
+    if text.isascii():
+        text = text.translate(_ASCII_FOLD)
+    else:
+        text = _SEPARATORS.sub(" ", text)
+    words = text.split()
+    if _SPACED_LETTERS.search(f" {' '.join(words)} "):
+        words = _join_spaced_letters(words)
+    return list(map(_collapse_repeats, words))
+
+
+@lru_cache(maxsize=65536)
+def _collapse_repeats(word: str) -> str:
+    # Stretched letters ("diiie", "sooo") fold to one; words repeat a lot, hence the cache.
+    return _REPEATS.sub(r"\1", word)
+
+
+def _join_spaced_letters(words: list[str]) -> list[str]:
+    """Merge runs of three or more single letters ("k i l l") into one word."""
+
+    joined: list[str] = []
+    start = 0
+    for index, word in enumerate([*words, ""]):
+        if len(word) == 1:
+            continue
+        run = words[start:index]
+        if len(run) >= 3:
+            joined.append("".join(run))
+        else:
+            joined.extend(run)
+        if word:
+            joined.append(word)
+        start = index + 1
+    return joined
+
+
+@dataclass(frozen=True, slots=True)
+class CrisisResource:
+    type: str
+    name: str
+    contact: str
+    description: str
+    availability: str
+
+
+@dataclass(frozen=True, slots=True)
+class CrisisMatch:
+    phrase: str
+    trigger_type: CrisisType
+    severity: Severity
+
+
+@dataclass(frozen=True, slots=True)
+class CrisisAssessment:
+    """Matches found in one message; empty when nothing was detected."""
+
+    matches: tuple[CrisisMatch, ...] = ()
+    resources: tuple[CrisisResource, ...] = ()
+
+    @property
+    def detected(self) -> bool:
+        return bool(self.matches)
+
+    @property
+    def top(self) -> CrisisMatch | None:
+        return max(self.matches, key=lambda m: SEVERITY_RANK[m.severity], default=None)
+
+    @property
+    def severity(self) -> Severity | None:
+        top = self.top
+        return top.severity if top else None
+
+    @property
+    def trigger_type(self) -> CrisisType | None:
+        top = self.top
+        return top.trigger_type if top else None
+
+    @property
+    def keywords(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(m.phrase for m in self.matches))
+
+
+CLEAR = CrisisAssessment()
+
+
+@dataclass(frozen=True, slots=True)
+class _Pattern:
+    words: tuple[str, ...]
+    match: CrisisMatch | None  # None for benign phrases and negations
+    negation: bool = False
+
+
+class CrisisLexicon:
+    """A lexicon compiled into an Aho-Corasick automaton (immutable once built).
+
+    The automaton steps over normalized words rather than characters, so phrases only
+    match whole words. Failure links are resolved at compile time: each state keeps the
+    non-root transitions it inherits, and anything else restarts from the root, so a
+    word costs at most two dictionary lookups.
+    """
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        patterns: list[_Pattern] = []
+        for trigger_type, by_severity in data["patterns"].items():
+            for severity, phrases in by_severity.items():
+                if severity not in SEVERITY_RANK:
+                    raise ValueError(f"unknown severity {severity!r}")
+                for phrase in phrases:
+                    patterns.append(
+                        _pattern(phrase, CrisisMatch(phrase, trigger_type, severity))
+                    )
+        patterns.extend(_pattern(phrase, None) for phrase in data.get("benign", []))
+        patterns.extend(
+            _pattern(phrase, None, negation=True) for phrase in data.get("negations", [])
+        )
+        self.version = data.get("version")
+        self.resources = tuple(CrisisResource(**item) for item in data.get("resources", []))
+        self._patterns = patterns
+        self._transitions, self._outputs = _compile(p.words for p in patterns)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def scan(self, text: str) -> CrisisAssessment:
+        transitions, outputs = self._transitions, self._outputs
+        root = transitions[0]
+        state = 0
+        hits: list[tuple[int, int]] = []
+        for end, word in enumerate(_words(text)):
+            state = transitions[state].get(word) or root.get(word, 0)
+            if state in outputs:
+                hits.append((end, state))
+        if not hits:
+            return CLEAR
+
+        found: list[tuple[int, int, CrisisMatch]] = []
+        benign: list[tuple[int, int]] = []
+        negated: set[int] = set()  # word positions directly after a negation
+        for end, state in hits:
+            for index in outputs[state]:
+                pattern = self._patterns[index]
+                span = (end - len(pattern.words) + 1, end)
+                if pattern.match is not None:
+                    found.append((*span, pattern.match))
+                elif pattern.negation:
+                    negated.add(end + 1)
+                else:
+                    benign.append(span)
+        matches = tuple(
+            match
+            for start, end, match in found
+            # A negation never clears a critical match ("not going to kill myself").
+            if not (start in negated and match.severity != "critical")
+            and not any(b_start <= start and end <= b_end for b_start, b_end in benign)
+        )
+        return CrisisAssessment(matches, self.resources) if matches else CLEAR
+
+
+def _pattern(phrase: str, match: CrisisMatch | None, *, negation: bool = False) -> _Pattern:
+    words = tuple(_words(phrase))
+    if not words:
+        raise ValueError(f"phrase {phrase!r} is empty after normalization")
+    return _Pattern(words, match, negation)
+
+
+def _compile(
+    phrases: Iterable[tuple[str, ...]],
+) -> tuple[list[dict[str, int]], dict[int, tuple[int, ...]]]:
+    """Build the goto trie and fold its failure links into per-state transition tables."""
+
+    goto: list[dict[str, int]] = [{}]
+    ends: list[list[int]] = [[]]
+    for index, phrase in enumerate(phrases):
+        state = 0
+        for word in phrase:
+            nxt = goto[state].get(word)
+            if nxt is None:
+                nxt = goto[state][word] = len(goto)
+                goto.append({})
+                ends.append([])
+            state = nxt
+        ends[state].append(index)
+
+    # transitions[state] = goto edges plus those inherited through non-root failure
+    # links; the root's own edges are looked up separately when these miss.
+    root = goto[0]
+    fail = [0] * len(goto)
+    transitions: list[dict[str, int]] = [root] + [{} for _ in goto[1:]]
+    queue = deque(root.values())
+    while queue:
+        state = queue.popleft()
+        ends[state].extend(ends[fail[state]])
+        if fail[state]:
+            transitions[state].update(transitions[fail[state]])
+        transitions[state].update(goto[state])
+        for word, nxt in goto[state].items():
+            if state:
+                fail[nxt] = transitions[fail[state]].get(word) or root.get(word, 0)
+            queue.append(nxt)
+    outputs = {state: tuple(indexes) for state, indexes in enumerate(ends) if indexes}
+    return transitions, outputs
+
+
+class CrisisDetectionService:
+    """Assess messages against the lexicon at ``lexicon_path``; reloadable while running.
+
+    :meth:`assess` is synchronous and allocation-light, so it runs inline before a
+    message is stored. :meth:`reload` compiles a new automaton and swaps it in with one
+    assignment; an invalid lexicon is logged and the previous one stays active.
+    """
+
+    def __init__(self, lexicon_path: Path | str = DEFAULT_LEXICON_PATH) -> None:
+        self._path = Path(lexicon_path)
+        self._mtime = self._path.stat().st_mtime_ns
+        self._lexicon = CrisisLexicon(json.loads(self._path.read_text()))
+        self._watcher: asyncio.Task[None] | None = None
+
+    @property
+    def lexicon(self) -> CrisisLexicon:
+        return self._lexicon
+
+    def assess(self, text: str) -> CrisisAssessment:
+        return self._lexicon.scan(text)
+
+    def reload(self) -> bool:
+        """Recompile the lexicon file. Returns False (keeping the old one) if it is invalid."""
+
+        try:
+            mtime = self._path.stat().st_mtime_ns
+            lexicon = CrisisLexicon(json.loads(self._path.read_text()))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            log_event(
+                "crisis_lexicon_reload_failed",
+                level=logging.ERROR,
+                path=str(self._path),
+                error=repr(exc),
+            )
+            return False
+        self._lexicon, self._mtime = lexicon, mtime
+        log_event("crisis_lexicon_reloaded", version=lexicon.version, patterns=len(lexicon))
+        return True
+
+    def reload_if_changed(self) -> bool:
+        try:
+            changed = self._path.stat().st_mtime_ns != self._mtime
+        except OSError:
+            return False
+        return changed and self.reload()
+
+    def start_watcher(self, interval_seconds: float) -> None:
+        """Poll the lexicon file every ``interval_seconds`` and reload it when it changes."""
+
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch_forever(interval_seconds))
+
+    async def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watcher
+            self._watcher = None
+
+    async def _watch_forever(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.reload_if_changed()
+
+
+def get_crisis_detector() -> CrisisDetectionService:
+    """Return the process-wide detector, compiling the configured lexicon on first use."""
+
+    global _detector
+    if _detector is None:
+        path = get_settings().crisis_lexicon_path or DEFAULT_LEXICON_PATH
+        _detector = CrisisDetectionService(path)
+    return _detector
+
+
+__all__ = [
+    "CLEAR",
+    "CrisisAssessment",
+    "CrisisDetectionService",
+    "CrisisLexicon",
+    "CrisisMatch",
+    "CrisisResource",
+    "CrisisType",
+    "SEVERITY_RANK",
+    "Severity",
+    "get_crisis_detector",
+    "normalize",
+]
@@ -0,0 +1,198 @@
+"""Buffered, batched writes of detected crisis events.
+
+Recording an event only appends to an in-process queue, so it adds no database work to
+the chat request. A background task writes the queue with one multi-row ``INSERT`` per
+batch, as soon as a batch fills or every ``flush_interval`` seconds otherwise. Stopping
+the log writes whatever is still queued, so a graceful shutdown loses nothing; events
+that cannot be written at all are logged as ``crisis_event_dropped`` with their IDs.
+"""
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+from app.core.logging import log_event
+from app.core.uow import unit_of_work
+from app.models.conversation import Conversation
+from app.repositories.crisis_event import CrisisEventRepository, NewCrisisEvent
+from app.services.crisis_detection_service import CrisisAssessment
+
+_log: "CrisisEventLog | None" = None
+
+
+@dataclass
+class CrisisEventLogStats:
+    pending: int = 0
+    written: int = 0
+    batches: int = 0
+    failures: int = 0
+    dropped: int = 0
+
+
+class CrisisEventLog:
+    """Queue crisis events in memory and write them in batches.
+
+    At most ``max_pending`` events are held while the database is unreachable; beyond
+    that the oldest are dropped (and logged) rather than growing without bound.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        batch_size: int = 100,
+        max_pending: int = 10_000,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        self._pending: deque[NewCrisisEvent] = deque()
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._closing = False
+        self._stats = CrisisEventLogStats()
+
+    @property
+    def stats(self) -> CrisisEventLogStats:
+        self._stats.pending = len(self._pending)
+        return self._stats
+
+    def record(self, message: Conversation, assessment: CrisisAssessment) -> None:
+        """Queue an event for ``message``; usable as ``ConversationService``'s ``on_crisis``."""
+
+        self.append(
+            NewCrisisEvent(
+                user_id=message.user_id,
+                message_id=message.id,
+                trigger_type=assessment.trigger_type or "unknown",
+                severity_level=assessment.severity or "low",
+                keywords_detected=assessment.keywords,
+                resources_shown=tuple(asdict(resource) for resource in assessment.resources),
+            )
+        )
+
+    def append(self, event: NewCrisisEvent) -> None:
+        if len(self._pending) >= self._max_pending:
+            self._drop(self._pending.popleft(), reason="buffer_full")
+        self._pending.append(event)
+        if len(self._pending) >= self._batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> int:
+        """Write everything queued, one ``INSERT`` per batch. Returns how many were written.
+
+        If a batch fails to write it is put back and flushing stops until the next call.
+        """
+
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                count = min(self._batch_size, len(self._pending))
+                batch = [self._pending.popleft() for _ in range(count)]
+                try:
+                    written += await self._write(batch)
+                except (SQLAlchemyError, OSError) as exc:
+                    self._pending.extendleft(reversed(batch))
+                    self._stats.failures += 1
+                    log_event(
+                        "crisis_event_flush_failed",
+                        level=logging.ERROR,
+                        events=len(batch),
+                        error=repr(exc),
+                    )
+                    break
+        return written
+
+    async def _write(self, batch: list[NewCrisisEvent]) -> int:
+        try:
+            async with self._session_factory() as session, unit_of_work(session):
+                written = await CrisisEventRepository(session).add_many(batch)
+        except IntegrityError:
+            # The message behind an event was rolled back or deleted. Write the rest of
+            # the batch one by one so that event cannot hold up the others.
+            if len(batch) == 1:
+                self._drop(batch[0], reason="integrity_error")
+                return 0
+            written = 0
+            for event in batch:
+                written += await self._write([event])
+            return written
+        self._stats.batches += 1
+        self._stats.written += written
+        return written
+
+    def _drop(self, event: NewCrisisEvent, *, reason: str) -> None:
+        self._stats.dropped += 1
+        log_event(
+            "crisis_event_dropped",
+            level=logging.ERROR,
+            reason=reason,
+            user_id=str(event.user_id),
+            message_id=str(event.message_id),
+            severity=event.severity_level,
+            trigger_type=event.trigger_type,
+        )
+
+    def start(self, flush_interval_seconds: float) -> None:
+        """Flush in the background whenever a batch fills, or every ``flush_interval_seconds``."""
+
+        if self._flusher is None:
+            self._closing = False
+            self._flusher = asyncio.create_task(self._flush_forever(flush_interval_seconds))
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write whatever is still queued."""
+
+        if self._flusher is not None:
+            self._closing = True
+            self._batch_ready.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+        for event in self._pending:
+            self._drop(event, reason="shutdown")
+        self._pending.clear()
+
+    async def _flush_forever(self, interval_seconds: float) -> None:
+        while not self._closing:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_ready.wait(), interval_seconds)
+            self._batch_ready.clear()
+            await self.flush()
+
+
+def get_crisis_event_log() -> CrisisEventLog:
+    """Return the process-wide event log, creating it on first use."""
+
+    global _log
+    if _log is None:
+        settings = get_settings()
+        _log = CrisisEventLog(
+            get_session_factory(),
+            batch_size=settings.crisis_event_batch_size,
+            max_pending=settings.crisis_event_max_pending,
+        )
+    return _log
+
+
+def peek_crisis_event_log() -> CrisisEventLog | None:
+    """Return the process-wide event log if one has been created, without creating it."""
+
+    return _log
+
+
+__all__ = [
+    "CrisisEventLog",
+    "CrisisEventLogStats",
+    "get_crisis_event_log",
+    "peek_crisis_event_log",
+]
@@ -9,4 +9,22 @@ class EmailAlreadyExistsError(DomainError):
     """Raised when attempting to create a user with an existing email."""
 
 
-__all__ = ["DomainError", "EmailAlreadyExistsError"]
+class UserNotFoundError(DomainError):
+    """Raised when an operation references a user that does not exist."""
+
+
+class LLMError(DomainError):
+    """Raised when the language model provider fails or returns an unusable response."""
+
+
+class LLMUnavailableError(LLMError):
+    """Raised without calling the provider: the circuit breaker is open or no slot freed up."""
+
+
+__all__ = [
+    "DomainError",
+    "EmailAlreadyExistsError",
+    "LLMError",
+    "LLMUnavailableError",
+    "UserNotFoundError",
+]
@@ -0,0 +1,12 @@
+"""Clients for external services."""
+from .claude import ClaudeClient, LLMClientStats, close_llm_client, get_llm_client
+from .resilience import CircuitBreaker, TokenBucket
+
+__all__ = [
+    "CircuitBreaker",
+    "ClaudeClient",
+    "LLMClientStats",
+    "TokenBucket",
+    "close_llm_client",
+    "get_llm_client",
+]
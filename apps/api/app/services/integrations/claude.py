@@ -0,0 +1,265 @@
+"""Anthropic Messages API client streaming coach replies.
+
+One client (and one pooled ``httpx.AsyncClient``, HTTP/2 when available) is shared by the
+whole process. Every call passes through, in order: a concurrency semaphore, so a slow
+provider cannot pile up unbounded coroutines; a circuit breaker that fails fast while
+the provider keeps erroring; and a token bucket pacing requests to the provider's
+requests-per-minute budget. Overloads, rate limits and transport errors are retried
+with jittered exponential backoff, but only until the first token has been yielded.
+"""
+import asyncio
+import json
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.exceptions import LLMError, LLMUnavailableError
+from app.services.integrations.resilience import CircuitBreaker, TokenBucket, backoff_delay
+from app.services.interfaces import ChatMessage
+
+ANTHROPIC_VERSION = "2023-06-01"
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504, 529})
+RETRYABLE_ERROR_TYPES = frozenset({"overloaded_error", "rate_limit_error", "api_error"})
+
+_client: "ClaudeClient | None" = None
+
+
+@dataclass
+class LLMClientStats:
+    """Call counters; ``requests`` counts HTTP attempts, including retries."""
+
+    in_flight: int = 0
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+
+
+class _RetryableError(Exception):
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ClaudeClient:
+    """``LLMClient`` for the Anthropic Messages API (or anything speaking its SSE format).
+
+    ``http`` is owned by the client and closed by :meth:`aclose`; tests pass one whose
+    transport is the bundled fake server.
+    """
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        *,
+        model: str,
+        max_tokens: int,
+        api_key: str | None = None,
+        max_concurrency: int = 10,
+        queue_timeout: float = 10.0,
+        pacer: TokenBucket | None = None,
+        breaker: CircuitBreaker | None = None,
+        max_retries: int = 2,
+        retry_base_seconds: float = 0.5,
+        retry_max_seconds: float = 8.0,
+    ) -> None:
+        self._http = http
+        self._model = model
+        self._max_tokens = max_tokens
+        self._headers = {"anthropic-version": ANTHROPIC_VERSION}
+        if api_key:
+            self._headers["x-api-key"] = api_key
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._queue_timeout = queue_timeout
+        self._pacer = pacer
+        self._breaker = breaker or CircuitBreaker()
+        self._max_retries = max_retries
+        self._retry_base = retry_base_seconds
+        self._retry_max = retry_max_seconds
+        self._stats = LLMClientStats()
+
+    @property
+    def stats(self) -> LLMClientStats:
+        return self._stats
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def stream_reply(
+        self, messages: Sequence[ChatMessage], *, system: str | None = None
+    ) -> AsyncIterator[str]:
+        payload: dict[str, Any] = {
+            "model": self._model,
+            "max_tokens": self._max_tokens,
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            "stream": True,
+        }
+        if system:
+            payload["system"] = system
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._queue_timeout)
+        except TimeoutError:
+            self._stats.rejected += 1
+            raise LLMUnavailableError("Too many LLM calls in flight") from None
+        self._stats.in_flight += 1
+        try:
+            if not self._breaker.allow():
+                self._stats.rejected += 1
+                raise LLMUnavailableError("LLM circuit breaker is open")
+            async for text in self._call(payload):
+                yield text
+        finally:
+            self._stats.in_flight -= 1
+            self._slots.release()
+
+    async def _call(self, payload: dict[str, Any]) -> AsyncIterator[str]:
+        outcome_recorded = False
+        try:
+            for attempt in range(self._max_retries + 1):
+                if self._pacer is not None:
+                    await self._pacer.acquire()
+                self._stats.requests += 1
+                yielded = False
+                try:
+                    async for text in self._request(payload):
+                        yielded = True
+                        yield text
+                except _RetryableError as exc:
+                    if yielded or attempt == self._max_retries:
+                        self._breaker.record_failure()
+                        outcome_recorded = True
+                        self._stats.failures += 1
+                        raise LLMError(str(exc)) from exc
+                    self._stats.retries += 1
+                    delay = backoff_delay(attempt, self._retry_base, self._retry_max)
+                    if exc.retry_after is not None:
+                        delay = min(max(delay, exc.retry_after), self._retry_max)
+                    await asyncio.sleep(delay)
+                except LLMError:
+                    # The provider answered; the request itself was bad.
+                    self._breaker.record_success()
+                    outcome_recorded = True
+                    self._stats.failures += 1
+                    raise
+                else:
+                    self._breaker.record_success()
+                    outcome_recorded = True
+                    return
+        finally:
+            if not outcome_recorded:
+                self._breaker.abandon()
+
+    async def _request(self, payload: dict[str, Any]) -> AsyncIterator[str]:
+        try:
+            async with self._http.stream(
+                "POST", "/v1/messages", json=payload, headers=self._headers
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    message = f"LLM request failed with status {response.status_code}"
+                    if response.status_code in RETRYABLE_STATUSES:
+                        raise _RetryableError(message, _retry_after(response))
+                    raise LLMError(message)
+                async for event, data in _sse_events(response.aiter_lines()):
+                    if event == "content_block_delta" and data["delta"].get("type") == "text_delta":
+                        yield data["delta"]["text"]
+                    elif event == "error":
+                        error = data.get("error", {})
+                        message = error.get("message", "LLM stream error")
+                        if error.get("type") in RETRYABLE_ERROR_TYPES:
+                            raise _RetryableError(message)
+                        raise LLMError(message)
+                    elif event == "message_stop":
+                        return
+        except httpx.TransportError as exc:
+            raise _RetryableError(f"LLM transport error: {exc!r}") from exc
+        except (httpx.HTTPError, ValueError, KeyError) as exc:
+            raise LLMError(f"LLM request failed: {exc!r}") from exc
+        raise _RetryableError("LLM stream ended before message_stop")
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _sse_events(lines: AsyncIterator[str]) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    event = "message"
+    data: list[str] = []
+    async for line in lines:
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+
+
+def get_llm_client() -> ClaudeClient:
+    """Return the process-wide client, creating it on first use."""
+
+    global _client
+    if _client is None:
+        settings = get_settings()
+        http = httpx.AsyncClient(
+            base_url=settings.llm_api_url,
+            http2=settings.llm_http2,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_concurrency,
+                max_keepalive_connections=settings.llm_max_concurrency,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=5.0),
+        )
+        _client = ClaudeClient(
+            http,
+            model=settings.llm_model,
+            max_tokens=settings.llm_max_tokens,
+            api_key=settings.llm_api_key,
+            max_concurrency=settings.llm_max_concurrency,
+            queue_timeout=settings.llm_queue_timeout_seconds,
+            pacer=TokenBucket(
+                settings.llm_requests_per_minute / 60, burst=settings.llm_max_concurrency
+            ),
+            breaker=CircuitBreaker(
+                settings.llm_breaker_failure_threshold, settings.llm_breaker_reset_seconds
+            ),
+            max_retries=settings.llm_max_retries,
+            retry_base_seconds=settings.llm_retry_base_seconds,
+            retry_max_seconds=settings.llm_retry_max_seconds,
+        )
+    return _client
+
+
+def peek_llm_client() -> ClaudeClient | None:
+    """Return the process-wide client if one has been created, without creating it."""
+
+    return _client
+
+
+async def close_llm_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+__all__ = [
+    "ANTHROPIC_VERSION",
+    "ClaudeClient",
+    "LLMClientStats",
+    "close_llm_client",
+    "get_llm_client",
+    "peek_llm_client",
+]
@@ -0,0 +1 @@
+"""In-process fakes of external services for tests and offline benchmarks."""
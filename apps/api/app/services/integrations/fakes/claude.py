@@ -0,0 +1,100 @@
+"""Local stand-in for the Anthropic Messages API streaming endpoint.
+
+Replies echo the last user message word by word using the real SSE event sequence, so
+``ClaudeClient`` can be exercised offline. Use it in-process through
+``httpx.ASGITransport`` or serve it for manual runs::
+
+    uv run uvicorn app.services.integrations.fakes.claude:app --port 8081
+"""
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+def create_fake_claude_app(
+    *,
+    first_token_delay: float = 0.0,
+    token_delay: float = 0.0,
+    fail_after_tokens: int | None = None,
+    fail_first_requests: int = 0,
+    failure_status: int = 529,
+) -> Starlette:
+    """Build the fake server.
+
+    ``first_token_delay`` and ``token_delay`` simulate model latency; with
+    ``fail_after_tokens`` the stream emits an ``error`` event after that many tokens. The
+    first ``fail_first_requests`` requests are answered with ``failure_status``.
+    ``app.state`` counts ``requests`` and records ``in_flight`` / ``max_in_flight``.
+    """
+
+    async def messages(request: Request) -> Response:
+        state = request.app.state
+        state.requests += 1
+        if state.requests <= fail_first_requests:
+            return JSONResponse(
+                {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+                status_code=failure_status,
+            )
+        payload = await request.json()
+        if not payload.get("messages"):
+            return JSONResponse(
+                {"type": "error", "error": {"type": "invalid_request_error", "message": "empty"}},
+                status_code=400,
+            )
+        last_user = next(
+            (m["content"] for m in reversed(payload["messages"]) if m["role"] == "user"), ""
+        )
+        words = f"You said: {last_user}".split()
+        tokens = words[:1] + [f" {word}" for word in words[1:]]
+        return StreamingResponse(
+            _tracked(state, _stream(payload["model"], tokens)), media_type="text/event-stream"
+        )
+
+    async def _stream(model: str, tokens: list[str]) -> AsyncIterator[str]:
+        yield _event("message_start", {"message": {"model": model, "role": "assistant"}})
+        yield _event("content_block_start", {"index": 0, "content_block": {"type": "text"}})
+        await asyncio.sleep(first_token_delay)
+        for count, token in enumerate(tokens):
+            if fail_after_tokens is not None and count == fail_after_tokens:
+                yield _event(
+                    "error", {"error": {"type": "overloaded_error", "message": "Overloaded"}}
+                )
+                return
+            if count:
+                await asyncio.sleep(token_delay)
+            delta = {"type": "text_delta", "text": token}
+            yield _event("content_block_delta", {"index": 0, "delta": delta})
+        yield _event("content_block_stop", {"index": 0})
+        yield _event("message_delta", {"delta": {"stop_reason": "end_turn"}})
+        yield _event("message_stop", {})
+
+    fake = Starlette(routes=[Route("/v1/messages", messages, methods=["POST"])])
+    fake.state.requests = 0
+    fake.state.in_flight = 0
+    fake.state.max_in_flight = 0
+    return fake
+
+
+async def _tracked(state: Any, events: AsyncIterator[str]) -> AsyncIterator[str]:
+    state.in_flight += 1
+    state.max_in_flight = max(state.max_in_flight, state.in_flight)
+    try:
+        async for event in events:
+            yield event
+    finally:
+        state.in_flight -= 1
+
+
+def _event(name: str, data: dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps({'type': name, **data})}\n\n"
+
+
+app = create_fake_claude_app()
+
+__all__ = ["app", "create_fake_claude_app"]
@@ -0,0 +1,130 @@
+"""Pacing, retry and circuit-breaker primitives for outbound integration calls."""
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class TokenBucket:
+    """Paces callers to ``rate`` acquisitions per second with bursts of up to ``burst``.
+
+    ``acquire`` reserves a token and sleeps until it is due, so waiters are served in
+    arrival order without polling.
+    """
+
+    def __init__(
+        self, rate: float, burst: int = 1, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        self._interval = 1.0 / rate
+        self._burst_window = burst * self._interval
+        self._clock = clock
+        self._tat = 0.0  # theoretical arrival time, as in the GCRA rate limiter
+
+    def reserve(self) -> float:
+        """Take the next token and return how long to wait before using it."""
+
+        now = self._clock()
+        self._tat = max(self._tat, now) + self._interval
+        return max(0.0, self._tat - self._burst_window - now)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class CircuitBreakerStats:
+    state: BreakerState = "closed"
+    opened: int = 0
+    rejected: int = 0
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive failures.
+
+    After ``reset_timeout`` seconds one trial call is let through (half-open): success
+    closes the breaker, failure opens it again for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._stats = CircuitBreakerStats()
+
+    @property
+    def state(self) -> BreakerState:
+        return self.stats.state
+
+    @property
+    def stats(self) -> CircuitBreakerStats:
+        if self._stats.state == "open" and self._clock() - self._opened_at >= self._reset_timeout:
+            self._stats.state = "half_open"
+            self._trial_running = False
+        return self._stats
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed; counts rejections."""
+
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        self._stats.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_running = False
+        self._stats.state = "closed"
+
+    def abandon(self) -> None:
+        """The call ended without an outcome (e.g. it was cancelled); allow a new trial."""
+
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_running = False
+        if self._stats.state == "half_open" or self._failures >= self._threshold:
+            if self._stats.state != "open":
+                self._stats.opened += 1
+            self._stats.state = "open"
+            self._opened_at = self._clock()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in ``[0, min(cap, base * 2**attempt)]``."""
+
+    return random.uniform(0.0, min(cap, base * 2**attempt))
+
+
+__all__ = [
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitBreakerStats",
+    "TokenBucket",
+    "backoff_delay",
+]
@@ -0,0 +1,25 @@
+"""Protocols for external integrations, so services and tests can swap implementations."""
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Literal, Protocol
+
+
+@dataclass(frozen=True, slots=True)
+class ChatMessage:
+    """One turn of conversation context sent to the language model."""
+
+    role: Literal["user", "assistant"]
+    content: str
+
+
+class LLMClient(Protocol):
+    """Streaming text generation used for coach replies."""
+
+    def stream_reply(
+        self, messages: Sequence[ChatMessage], *, system: str | None = None
+    ) -> AsyncIterator[str]:
+        """Yield the reply as text fragments in order; raise ``LLMError`` on failure."""
+        ...
+
+
+__all__ = ["ChatMessage", "LLMClient"]
@@ -0,0 +1,209 @@
+"""ChAT score trends and the Stage 1 graduation check.
+
+A user's ``analysis_trends`` row is updated with one upsert whenever a result is created
+(``AnalysisTrendRepository.record``), so reading a trend or checking graduation never
+loads the result history. ``aggregate_trends`` computes the same aggregates from full
+histories with NumPy, one vectorized pass over many users at once. It rebuilds trends
+after results are edited or deleted, and backfills them in bulk (``app.tasks.trends``).
+
+The slope is a least-squares fit of score against days since ``first_seen``, kept as
+running sums so adding a result is O(1).
+"""
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.models.analysis_trend import AnalysisTrend
+from app.repositories.analysis import AnalysisRepository, ScoreHistory
+from app.repositories.analysis_trend import AnalysisTrendRepository
+
+_DAY_SECONDS = 86_400.0
+# Below this relative spread of result times the slope is not meaningful (e.g. every
+# result in the same second), so it is reported as flat.
+_MIN_TIME_SPREAD = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class TrendConfig:
+    """Trend parameters and Stage 1 graduation criteria.
+
+    Graduation needs a full window of ``window`` results averaging at least
+    ``min_score``, an EWMA still at that level, a non-negative slope, and
+    ``min_engagement_days`` since the first result.
+    """
+
+    window: int = 5
+    alpha: float = 0.3
+    min_score: float = 10.5
+    min_engagement_days: float = 21.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> "TrendConfig":
+        settings = settings or get_settings()
+        return cls(
+            window=settings.trend_window,
+            alpha=settings.trend_ewma_alpha,
+            min_score=settings.graduation_min_score,
+            min_engagement_days=settings.graduation_min_engagement_days,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TrendSummary:
+    """A user's trend as shown to clients. ``velocity`` is ChAT points per week."""
+
+    user_id: UUID
+    analysis_count: int
+    window_mean: float
+    ewma: float
+    velocity: float
+    first_seen: datetime
+    last_seen: datetime
+    engaged_days: float
+    graduation_ready: bool
+
+    @classmethod
+    def of(
+        cls, trend: AnalysisTrend, config: TrendConfig, now: datetime | None = None
+    ) -> "TrendSummary":
+        now = now or datetime.now(timezone.utc)
+        recent = trend.recent_scores
+        window_mean = sum(recent) / len(recent) if recent else 0.0
+        slope = float(
+            least_squares_slope(
+                trend.analysis_count, trend.sum_t, trend.sum_tt, trend.sum_score, trend.sum_t_score
+            )
+        )
+        engaged_days = (now - trend.first_seen).total_seconds() / _DAY_SECONDS
+        return cls(
+            user_id=trend.user_id,
+            analysis_count=trend.analysis_count,
+            window_mean=window_mean,
+            ewma=trend.ewma,
+            velocity=slope * 7,
+            first_seen=trend.first_seen,
+            last_seen=trend.last_seen,
+            engaged_days=engaged_days,
+            graduation_ready=bool(
+                meets_graduation_criteria(
+                    len(recent), window_mean, trend.ewma, slope, engaged_days, config
+                )
+            ),
+        )
+
+
+def least_squares_slope(n, sum_t, sum_tt, sum_score, sum_t_score):
+    """Score change per day from the running sums; works on scalars and arrays alike."""
+
+    n, sum_t, sum_tt, sum_score, sum_t_score = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (n, sum_t, sum_tt, sum_score, sum_t_score))
+    )
+    spread = n * sum_tt - sum_t * sum_t
+    return np.divide(
+        n * sum_t_score - sum_t * sum_score,
+        spread,
+        out=np.zeros(spread.shape),
+        where=spread > _MIN_TIME_SPREAD * n * sum_tt,
+    )
+
+
+def meets_graduation_criteria(window_size, window_mean, ewma, slope, engaged_days, config):
+    """Stage 1 graduation check; works on scalars and arrays alike."""
+
+    return (
+        (np.asarray(window_size) >= config.window)
+        & (np.asarray(window_mean) >= config.min_score)
+        & (np.asarray(ewma) >= config.min_score)
+        & (np.asarray(slope) >= 0)
+        & (np.asarray(engaged_days) >= config.min_engagement_days)
+    )
+
+
+def aggregate_trends(
+    histories: Sequence[ScoreHistory], config: TrendConfig
+) -> list[dict[str, Any]]:
+    """Trend rows for ``histories``, ready for ``AnalysisTrendRepository.replace_many``.
+
+    All users are computed together on flat arrays, segmented with ``np.add.reduceat``,
+    so the Python work is one row dict per user rather than per result.
+    """
+
+    if not histories:
+        return []
+    counts = np.fromiter((len(h.scores) for h in histories), dtype=np.int64, count=len(histories))
+    total = int(counts.sum())
+    epochs = np.fromiter(chain.from_iterable(h.epochs for h in histories), float, count=total)
+    scores = np.fromiter(chain.from_iterable(h.scores for h in histories), float, count=total)
+
+    starts = np.cumsum(counts) - counts
+    owner = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(total) - starts[owner]
+    from_end = (counts - 1)[owner] - position
+    days = (epochs - epochs[starts][owner]) / _DAY_SECONDS
+
+    # EWMA seeded with the first score: e = (1-a)^(n-1) s_0 + sum_k a (1-a)^(n-1-k) s_k.
+    weights = (1 - config.alpha) ** from_end * np.where(position == 0, 1.0, config.alpha)
+    ewma = np.add.reduceat(weights * scores, starts)
+    sum_t = np.add.reduceat(days, starts)
+    sum_tt = np.add.reduceat(days * days, starts)
+    sum_score = np.add.reduceat(scores, starts)
+    sum_t_score = np.add.reduceat(days * scores, starts)
+
+    recent = from_end < config.window
+    recent_scores = np.split(
+        scores[recent].astype(int), np.cumsum(np.minimum(counts, config.window))[:-1]
+    )
+
+    rows: list[dict[str, Any]] = [
+        {"user_id": h.user_id, "first_seen": h.first_seen, "last_seen": h.last_seen}
+        for h in histories
+    ]
+    columns = {
+        "analysis_count": counts.tolist(),
+        "recent_scores": [window_scores.tolist() for window_scores in recent_scores],
+        "ewma": ewma.tolist(),
+        "sum_t": sum_t.tolist(),
+        "sum_tt": sum_tt.tolist(),
+        "sum_score": sum_score.tolist(),
+        "sum_t_score": sum_t_score.tolist(),
+    }
+    for column, values in columns.items():
+        for row, value in zip(rows, values, strict=True):
+            row[column] = value
+    return rows
+
+
+async def rebuild_trends(
+    session: AsyncSession, user_ids: Sequence[UUID], config: TrendConfig
+) -> int:
+    """Recompute the trends of ``user_ids`` from their full histories.
+
+    Users left without results lose their trend row. Returns how many rows were written.
+    Call inside a unit of work: the trend rows stay locked until it commits.
+    """
+
+    trends = AnalysisTrendRepository(session)
+    await trends.lock(user_ids)
+    histories = await AnalysisRepository(session).score_histories(user_ids)
+    written = await trends.replace_many(aggregate_trends(histories, config))
+    if len(histories) < len(user_ids):
+        kept = {history.user_id for history in histories}
+        await trends.delete_many([user_id for user_id in user_ids if user_id not in kept])
+    return written
+
+
+__all__ = [
+    "TrendConfig",
+    "TrendSummary",
+    "aggregate_trends",
+    "least_squares_slope",
+    "meets_graduation_criteria",
+    "rebuild_trends",
+]
@@ -4,8 +4,9 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password, validate_password_requirements
-from app.repositories.user import UserRepository
+from app.core.cache import AsyncLRUCache
+from app.core.security import hash_password_async, validate_password_requirements
+from app.repositories.user import UserRepository, UserSnapshot
 from app.schemas.user import UserCreate
 from app.services.exceptions import EmailAlreadyExistsError
 
@@ -13,21 +14,33 @@ from app.services.exceptions import EmailAlreadyExistsError
 class UserService:
     """Business logic for user management."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        cache: AsyncLRUCache[Any, Any] | None = None,
+        broadcast_invalidations: bool = False,
+    ) -> None:
         self._session = session
-        self._users = UserRepository(session)
+        self._users = UserRepository(session, cache=cache, broadcast=broadcast_invalidations)
 
     async def register_user(self, payload: UserCreate):
         validate_password_requirements(payload.password)
-        existing = await self._users.get_by_email(payload.email)
-        if existing:
+        # Cheap pre-check so obvious duplicates never pay for a bcrypt hash; the insert itself
+        # is still conflict-safe if another request claims the email in between.
+        if await self._users.email_exists(payload.email):
+            raise EmailAlreadyExistsError("Email already registered")
+        password_hash = await hash_password_async(payload.password)
+        user = await self._users.create_if_absent(payload, password_hash)
+        if user is None:
             raise EmailAlreadyExistsError("Email already registered")
-        password_hash = hash_password(payload.password)
-        user = await self._users.create(payload, password_hash)
         return user
 
-    async def get_user(self, user_id):
-        return await self._users.get(user_id)
+    async def get_user(self, user_id: UUID) -> UserSnapshot | None:
+        return await self._users.get_snapshot(user_id)
+
+    async def get_user_by_email(self, email: str) -> UserSnapshot | None:
+        return await self._users.get_snapshot_by_email(email)
 
     async def update_user(
         self,
@@ -48,7 +61,7 @@ class UserService:
 
         if password is not None:
             validate_password_requirements(password)
-            updates["password_hash"] = hash_password(password)
+            updates["password_hash"] = await hash_password_async(password)
 
         if goals is not None:
             updates["goals"] = goals
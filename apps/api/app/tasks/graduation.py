@@ -0,0 +1,166 @@
+"""Nightly Stage 1 graduation run over the whole user base.
+
+Schedule it once a day, e.g. from cron::
+
+    uv run python -m app.tasks.graduation
+
+Criteria such as the minimum engagement duration can become true without any new
+analysis, so every Stage 1 user with a trend is re-evaluated. Users are read from
+``analysis_trends`` (which already holds each user's recent scores and slope sums)
+``GRADUATION_BATCH_SIZE`` at a time in ``user_id`` order. Each chunk is evaluated with
+NumPy in one pass, its promotions are applied with one ``UPDATE ... FROM (VALUES ...)``,
+and the run's position is saved in ``task_checkpoints`` in the same transaction. Memory
+stays bounded by the chunk size, and a run that is interrupted resumes after the last
+committed chunk, still evaluating against the clock it started with.
+"""
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import compress
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import AsyncLRUCache
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+from app.core.logging import configure_logging, log_event, shutdown_logging
+from app.core.uow import unit_of_work
+from app.repositories.analysis_trend import AnalysisTrendRepository
+from app.repositories.task_checkpoint import TaskCheckpointRepository
+from app.repositories.user import StageChange, UserRepository
+from app.services.trends import TrendConfig, least_squares_slope, meets_graduation_criteria
+
+CHECKPOINT_NAME = "stage1_graduation"
+FROM_STAGE = 1
+TO_STAGE = 2
+
+_DAY_SECONDS = 86_400.0
+
+
+@dataclass
+class GraduationRun:
+    """What one invocation did; a resumed run only counts its own chunks."""
+
+    started_at: datetime
+    resumed: bool
+    evaluated: int = 0
+    promoted: int = 0
+    chunks: int = 0
+
+
+def graduation_ready(rows: Sequence[Row], now: datetime, config: TrendConfig) -> np.ndarray:
+    """Boolean mask over ``AnalysisTrendRepository.for_stage`` rows, computed in one pass."""
+
+    columns = np.array([row[1:] for row in rows], dtype=float).T
+    window_size, window_mean, ewma, *sums, first_seen = columns
+    engaged_days = (now.timestamp() - first_seen) / _DAY_SECONDS
+    return meets_graduation_criteria(
+        window_size, window_mean, ewma, least_squares_slope(*sums), engaged_days, config
+    )
+
+
+async def run_graduation(
+    session_factory: async_sessionmaker[AsyncSession],
+    config: TrendConfig,
+    *,
+    chunk_size: int = 10_000,
+    cache: AsyncLRUCache[Any, Any] | None = None,
+    broadcast: bool = False,
+    now: datetime | None = None,
+) -> GraduationRun:
+    """Promote every Stage 1 user who meets the graduation criteria.
+
+    Resumes an unfinished run from its checkpoint; otherwise starts a new one at ``now``.
+    ``cache``/``broadcast`` invalidate promoted users' cached snapshots as
+    ``UserRepository`` does for single updates.
+    """
+
+    async with session_factory() as session, unit_of_work(session):
+        checkpoints = TaskCheckpointRepository(session)
+        checkpoint = await checkpoints.get(CHECKPOINT_NAME)
+        if checkpoint is not None and checkpoint.finished_at is None:
+            run = GraduationRun(checkpoint.started_at, resumed=True)
+            after = UUID(checkpoint.position) if checkpoint.position else None
+        else:
+            checkpoint = await checkpoints.start(
+                CHECKPOINT_NAME, now or datetime.now(timezone.utc)
+            )
+            run = GraduationRun(checkpoint.started_at, resumed=False)
+            after = None
+    log_event(
+        "graduation_run_started",
+        resumed=run.resumed,
+        started_at=run.started_at.isoformat(),
+        after=str(after) if after else None,
+    )
+
+    while True:
+        async with session_factory() as session, unit_of_work(session):
+            checkpoints = TaskCheckpointRepository(session)
+            rows = await AnalysisTrendRepository(session).for_stage(
+                FROM_STAGE, after=after, limit=chunk_size
+            )
+            if not rows:
+                await checkpoints.finish(CHECKPOINT_NAME)
+                break
+            ready = graduation_ready(rows, run.started_at, config)
+            changes = [
+                StageChange(row.user_id, FROM_STAGE, TO_STAGE) for row in compress(rows, ready)
+            ]
+            users = UserRepository(session, cache=cache, broadcast=broadcast)
+            promoted = await users.apply_stage_changes(changes)
+            after = rows[-1].user_id
+            await checkpoints.advance(
+                CHECKPOINT_NAME, str(after), processed=len(rows), changed=len(promoted)
+            )
+        run.evaluated += len(rows)
+        run.promoted += len(promoted)
+        run.chunks += 1
+        log_event(
+            "graduation_chunk_applied",
+            evaluated=run.evaluated,
+            promoted=run.promoted,
+            after=str(after),
+        )
+
+    log_event(
+        "graduation_run_finished",
+        resumed=run.resumed,
+        evaluated=run.evaluated,
+        promoted=run.promoted,
+        chunks=run.chunks,
+    )
+    return run
+
+
+async def _main() -> None:
+    configure_logging()
+    settings = get_settings()
+    try:
+        await run_graduation(
+            get_session_factory(),
+            TrendConfig.from_settings(settings),
+            chunk_size=settings.graduation_batch_size,
+            broadcast=settings.user_cache_broadcast,
+        )
+    finally:
+        shutdown_logging()
+
+
+__all__ = [
+    "CHECKPOINT_NAME",
+    "FROM_STAGE",
+    "TO_STAGE",
+    "GraduationRun",
+    "graduation_ready",
+    "run_graduation",
+]
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,15 @@
+"""Job handlers registered with the queue worker, keyed by ``job_queue.name``.
+
+Only names with a real handler belong here: the worker claims just these names, and a
+handler that returns marks its job completed. ``analysis_job`` rows, enqueued by the
+``queue_analysis_check`` trigger every 25 user messages, are deliberately not handled
+until ChAT scoring exists, so they stay pending instead of being completed unscored.
+"""
+from collections.abc import Awaitable, Callable
+
+from app.repositories.job import ClaimedJob
+
+HANDLERS: dict[str, Callable[[ClaimedJob], Awaitable[None]]] = {}
+
+
+__all__ = ["HANDLERS"]
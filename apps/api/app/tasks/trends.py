@@ -0,0 +1,65 @@
+"""Rebuild every user's ``analysis_trends`` row from ``analysis_results``.
+
+Run after migration ``0009_analysis_trends``, or after changing ``TREND_WINDOW`` or
+``TREND_EWMA_ALPHA``::
+
+    uv run python -m app.tasks.trends
+
+Users are walked in ``user_id`` order, ``TREND_RECOMPUTE_CHUNK_SIZE`` at a time, each
+chunk in its own short transaction: lock the chunk's trend rows, load its histories with
+one aggregated query, compute all of its trends in one NumPy pass and write them back
+with multi-row upserts. Results created while the job runs are never lost; the row lock
+makes them wait for, then apply on top of, the rebuilt row.
+"""
+import asyncio
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+from app.core.logging import configure_logging, log_event, shutdown_logging
+from app.core.uow import unit_of_work
+from app.repositories.analysis import AnalysisRepository
+from app.services.trends import TrendConfig, rebuild_trends
+
+
+async def recompute_trends(
+    session_factory: async_sessionmaker[AsyncSession],
+    config: TrendConfig,
+    *,
+    chunk_size: int = 5000,
+    after: UUID | None = None,
+) -> int:
+    """Rebuild the trends of every user with results after ``after``. Returns the count."""
+
+    total = 0
+    while True:
+        async with session_factory() as session, unit_of_work(session):
+            user_ids = await AnalysisRepository(session).user_ids_after(after, chunk_size)
+            if not user_ids:
+                return total
+            total += await rebuild_trends(session, user_ids, config)
+        after = user_ids[-1]
+        log_event("trend_recompute_progress", users=total, after=str(after))
+
+
+async def _main() -> None:
+    configure_logging()
+    settings = get_settings()
+    try:
+        total = await recompute_trends(
+            get_session_factory(),
+            TrendConfig.from_settings(settings),
+            chunk_size=settings.trend_recompute_chunk_size,
+        )
+        log_event("trend_recompute_finished", users=total)
+    finally:
+        shutdown_logging()
+
+
+__all__ = ["recompute_trends"]
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
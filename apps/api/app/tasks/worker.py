@@ -0,0 +1,302 @@
+"""Asyncio worker consuming the ``job_queue`` table.
+
+Run one or more processes with::
+
+    uv run python -m app.tasks.worker
+
+The worker keeps up to ``concurrency`` jobs running. Whenever slots are free it leases
+that many due jobs (at most ``batch_size``) with ``FOR UPDATE SKIP LOCKED`` (see
+``JobRepository.claim``), so one slow job never holds the rest of its batch back. Jobs
+that finish together are settled together: successes are completed in one bulk UPDATE,
+failures are rescheduled with exponential backoff through ``start_after``. Workers share
+nothing but the table, so adding processes scales throughput without double-processing.
+
+When idle, workers block on ``LISTEN job_queue`` (fed by the ``trigger_job_queue_notify``
+trigger) and fall back to a slow poll, shortened to the next pending ``start_after``, for
+delayed jobs and retries.
+"""
+import asyncio
+import logging
+import random
+import signal
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import Settings, get_settings
+from app.core.database import get_engine, get_session_factory
+from app.core.listener import NotificationListener
+from app.core.logging import bind_request_id, configure_logging, log_event, shutdown_logging
+from app.repositories.job import ClaimedJob, JobRepository
+from app.tasks.jobs import HANDLERS
+
+JobHandler = Callable[[ClaimedJob], Awaitable[None]]
+
+JOB_QUEUE_CHANNEL = "job_queue"
+
+
+class QueueListener(NotificationListener):
+    """Holds a dedicated connection subscribed to job queue notifications.
+
+    ``wakeup`` is set on every notification, and on every reconnect so jobs enqueued while
+    the connection was down are claimed straight away (see :class:`NotificationListener`).
+    """
+
+    log_prefix = "job_listener"
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str = JOB_QUEUE_CHANNEL,
+        *,
+        health_check_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        reconnect_delay_max: float = 30.0,
+    ) -> None:
+        super().__init__(
+            engine,
+            channel,
+            health_check_interval=health_check_interval,
+            reconnect_delay=reconnect_delay,
+            reconnect_delay_max=reconnect_delay_max,
+        )
+        self.wakeup = asyncio.Event()
+
+    def _reconnected(self) -> None:
+        self.wakeup.set()
+
+    def _notify(self, connection: object, pid: int, channel: str, payload: str) -> None:
+        self.wakeup.set()
+
+
+class JobWorker:
+    """Claims and executes jobs for the registered handler names."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        handlers: Mapping[str, JobHandler],
+        *,
+        concurrency: int = 8,
+        batch_size: int = 16,
+        poll_interval: float = 1.0,
+        idle_poll_interval: float = 30.0,
+        lease: timedelta = timedelta(minutes=5),
+        backoff_base: timedelta = timedelta(seconds=5),
+        backoff_max: timedelta = timedelta(hours=1),
+        error_backoff: float = 1.0,
+        error_backoff_max: float = 30.0,
+    ) -> None:
+        if not handlers:
+            raise ValueError("at least one job handler is required")
+        self._session_factory = session_factory
+        self._handlers = dict(handlers)
+        self._concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._idle_poll_interval = idle_poll_interval
+        self._lease = lease
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._error_backoff = error_backoff
+        self._error_backoff_max = error_backoff_max
+
+    @classmethod
+    def from_settings(
+        cls,
+        session_factory: async_sessionmaker[AsyncSession],
+        handlers: Mapping[str, JobHandler],
+        settings: Settings,
+    ) -> "JobWorker":
+        return cls(
+            session_factory,
+            handlers,
+            concurrency=settings.job_worker_concurrency,
+            batch_size=settings.job_worker_batch_size,
+            poll_interval=settings.job_worker_poll_interval_seconds,
+            idle_poll_interval=settings.job_worker_idle_poll_seconds,
+            lease=timedelta(seconds=settings.job_worker_lease_seconds),
+            backoff_base=timedelta(seconds=settings.job_retry_backoff_seconds),
+            backoff_max=timedelta(seconds=settings.job_retry_backoff_max_seconds),
+        )
+
+    def backoff_for(self, job: ClaimedJob) -> timedelta:
+        """Exponential backoff for the next attempt of ``job``, capped at ``backoff_max``."""
+
+        return min(self._backoff_base * (2**job.retry_count), self._backoff_max)
+
+    async def run_once(self) -> int:
+        """Claim, execute and settle one batch. Returns the number of jobs claimed."""
+
+        jobs = await self._claim(self._batch_size)
+        if jobs:
+            errors = await asyncio.gather(*(self._execute(job) for job in jobs))
+            await self._settle(list(zip(jobs, errors, strict=True)))
+        return len(jobs)
+
+    async def run(self, stop: asyncio.Event, wakeup: asyncio.Event | None = None) -> None:
+        """Process jobs until ``stop`` is set, then let the running ones finish.
+
+        Free slots are refilled as soon as jobs finish. Once the queue is drained the worker
+        also waits for new work: without ``wakeup`` it polls every ``poll_interval``; with it
+        (see :class:`QueueListener`) it sleeps until notified, or until the next delayed job
+        is due, capped at ``idle_poll_interval``. Database errors while claiming, settling or
+        waiting are logged as ``job_worker_db_error`` and retried after a jittered exponential
+        backoff (``error_backoff`` doubling up to ``error_backoff_max`` seconds); running jobs
+        carry on meanwhile.
+        """
+
+        running: dict[asyncio.Task[str | None], ClaimedJob] = {}
+        failures = 0
+        try:
+            while running or not stop.is_set():
+                try:
+                    await self._cycle(stop, wakeup, running)
+                except (SQLAlchemyError, OSError) as exc:
+                    # A connection reset, failover or statement timeout must not stop the
+                    # worker; finished jobs stay in ``running`` until they are settled.
+                    failures += 1
+                    delay = self._error_delay(failures)
+                    log_event(
+                        "job_worker_db_error",
+                        level=logging.WARNING,
+                        error=repr(exc),
+                        failures=failures,
+                        retry_in=delay,
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    failures = 0
+        finally:
+            # Only non-empty if run() itself is cancelled; the leases return those jobs.
+            for task in running:
+                task.cancel()
+
+    async def _cycle(
+        self,
+        stop: asyncio.Event,
+        wakeup: asyncio.Event | None,
+        running: dict[asyncio.Task[str | None], ClaimedJob],
+    ) -> None:
+        """Fill free slots, wait for work or a finished job, then settle what finished."""
+
+        drained = True
+        free = self._concurrency - len(running)
+        if not stop.is_set() and free > 0:
+            if wakeup is not None:
+                # Cleared before claiming so a notification that races the claim is kept.
+                wakeup.clear()
+            limit = min(free, self._batch_size)
+            jobs = await self._claim(limit)
+            for job in jobs:
+                running[asyncio.create_task(self._execute(job))] = job
+            drained = len(jobs) < limit
+            if not drained and len(running) < self._concurrency:
+                return
+
+        if drained and not stop.is_set():
+            timeout = self._poll_interval if wakeup is None else await self._idle_timeout()
+            await _wait_any((stop, wakeup), timeout, tasks=running)
+        elif running:
+            await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+        finished = [task for task in running if task.done()]
+        if finished:
+            await self._settle([(running[task], task.result()) for task in finished])
+            for task in finished:
+                del running[task]
+
+    def _error_delay(self, failures: int) -> float:
+        """Exponential backoff after ``failures`` consecutive errors, with equal jitter."""
+
+        delay = min(self._error_backoff * 2 ** (failures - 1), self._error_backoff_max)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _claim(self, limit: int) -> list[ClaimedJob]:
+        async with self._session_factory() as session:
+            return await JobRepository(session).claim(self._handlers.keys(), limit, self._lease)
+
+    async def _settle(self, results: list[tuple[ClaimedJob, str | None]]) -> None:
+        """Complete the successes in one UPDATE and reschedule or park the failures."""
+
+        async with self._session_factory() as session:
+            repo = JobRepository(session)
+            await repo.complete_many([job.id for job, error in results if error is None])
+            for job, error in results:
+                if error is not None:
+                    await repo.retry_or_fail(job, error, self.backoff_for(job))
+
+    async def _idle_timeout(self) -> float:
+        async with self._session_factory() as session:
+            due_in = await JobRepository(session).seconds_until_next_due(self._handlers.keys())
+        if due_in is None:
+            return self._idle_poll_interval
+        return min(due_in, self._idle_poll_interval)
+
+    async def _execute(self, job: ClaimedJob) -> str | None:
+        # Each job runs in its own task, so the bound ID never leaks between jobs.
+        async with self._semaphore:
+            with bind_request_id(f"job-{job.id}"):
+                try:
+                    await self._handlers[job.name](job)
+                except Exception as exc:  # noqa: BLE001 - any handler error triggers a retry
+                    log_event("job_failed", job_id=str(job.id), job_name=job.name, error=repr(exc))
+                    return repr(exc)
+        return None
+
+
+async def _wait_any(
+    events: tuple[asyncio.Event | None, ...],
+    timeout: float,
+    *,
+    tasks: Iterable[asyncio.Task[Any]] = (),
+) -> None:
+    """Wait until any event is set or any of ``tasks`` finishes, at most ``timeout``."""
+
+    waiters = [asyncio.ensure_future(event.wait()) for event in events if event is not None]
+    try:
+        await asyncio.wait(
+            [*waiters, *tasks], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def _main() -> None:
+    configure_logging()
+    if not HANDLERS:
+        log_event("job_worker_no_handlers", level=logging.WARNING)
+        shutdown_logging()
+        return
+    settings = get_settings()
+    worker = JobWorker.from_settings(get_session_factory(), HANDLERS, settings)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    listener = QueueListener(get_engine()) if settings.job_worker_listen else None
+    if listener is not None:
+        await listener.start()
+
+    log_event("job_worker_started", handlers=sorted(HANDLERS), listen=listener is not None)
+    try:
+        await worker.run(stop, listener.wakeup if listener is not None else None)
+    finally:
+        if listener is not None:
+            await listener.close()
+        log_event("job_worker_stopped")
+        shutdown_logging()
+
+
+__all__ = ["JOB_QUEUE_CHANNEL", "JobHandler", "JobWorker", "QueueListener"]
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,18 +1,44 @@
-"""Simple in-memory rate limiter for FastAPI endpoints."""
+"""Rate limiters for FastAPI endpoints.
+
+Both backends implement the generic cell rate algorithm (GCRA): each key stores a single
+"theoretical arrival time" (TAT), so state is O(1) per key regardless of the limit. A key
+may burst up to ``limit`` requests and then regains one request every
+``window_seconds / limit`` seconds.
+"""
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import logging
+import math
 import time
-from collections import deque
-from typing import Deque, Dict
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
 
+from sqlalchemy import ColumnElement, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-class RateLimiter:
-    """Token bucket style in-memory limiter.
+from app.core.logging import log_event
+from app.models.rate_limit import RateLimitBucket
 
-    Suitable for single-process development environments. Production deployments should
-    replace this with a shared store (e.g., Redis) to enforce limits across replicas.
-    """
+
+@dataclass
+class RateLimiterStats:
+    """Counters describing limiter decisions and tracked state."""
+
+    allowed: int = 0
+    rejected: int = 0
+    keys: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class BaseRateLimiter(ABC):
+    """Common configuration and GCRA arithmetic shared by limiter backends."""
 
     def __init__(self, limit: int, window_seconds: int) -> None:
         if limit < 1:
@@ -21,8 +47,9 @@ class RateLimiter:
             raise ValueError("window_seconds must be >= 1")
         self._limit = limit
         self._window = window_seconds
-        self._events: Dict[str, Deque[float]] = {}
-        self._lock = asyncio.Lock()
+        self._interval = window_seconds / limit
+        self._stats = RateLimiterStats()
+        self._sweeper: asyncio.Task[None] | None = None
 
     @property
     def limit(self) -> int:
@@ -32,37 +59,222 @@ class RateLimiter:
     def window_seconds(self) -> int:
         return self._window
 
+    @property
+    def stats(self) -> RateLimiterStats:
+        return self._stats
+
+    @abstractmethod
     async def allow(self, key: str) -> bool:
         """Return True if the request is within the rate limit for the provided key."""
 
+    @abstractmethod
+    async def get_remaining(self, key: str) -> int:
+        """Return how many requests remain in the window for the key."""
+
+    @abstractmethod
+    async def _sweep_once(self) -> int:
+        """Drop state for keys whose TAT has passed. Returns how many were removed."""
+
+    def start_sweeper(self, interval_seconds: float) -> None:
+        """Drop expired keys every ``interval_seconds`` on the current event loop."""
+
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever(interval_seconds))
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+
+    async def _sweep_forever(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self._sweep_once()
+
+    def _record(self, allowed: bool) -> bool:
+        if allowed:
+            self._stats.allowed += 1
+        else:
+            self._stats.rejected += 1
+        return allowed
+
+    def _remaining(self, tat: float, now: float) -> int:
+        backlog = max(tat - now, 0.0)
+        fits = math.floor((self._window - backlog) / self._interval + 1e-9)
+        return max(0, min(self._limit, fits))
+
+
+class RateLimiter(BaseRateLimiter):
+    """In-process GCRA limiter with bounded memory.
+
+    Suitable for single-process deployments. Each check is a read-modify-write with no
+    ``await`` in between, so it is atomic on the event loop without a lock and contention
+    does not grow with concurrent requests.
+
+    Keys are kept in least-recently-used order. A key whose TAT has passed is
+    indistinguishable from a fresh one, so expired keys are dropped from the cold end on
+    every check and by :meth:`sweep`. If ``max_keys`` is still exceeded (for example during
+    a scan from many source addresses) the least recently used key is evicted, which at
+    worst grants that client a fresh burst.
+    """
+
+    def __init__(self, limit: int, window_seconds: int, *, max_keys: int = 100_000) -> None:
+        super().__init__(limit, window_seconds)
+        if max_keys < 1:
+            raise ValueError("max_keys must be >= 1")
+        self._max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    @property
+    def max_keys(self) -> int:
+        return self._max_keys
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        self._stats.keys = len(self._tats)
+        return self._stats
+
+    async def allow(self, key: str) -> bool:
         now = time.monotonic()
-        async with self._lock:
-            queue = self._events.setdefault(key, deque())
-            cutoff = now - self._window
-            while queue and queue[0] <= cutoff:
-                queue.popleft()
+        tats = self._tats
+        stored = tats.get(key)
+        tat = (now if stored is None or stored < now else stored) + self._interval
+        if tat - now > self._window:
+            tats.move_to_end(key)
+            return self._record(False)
 
-            if len(queue) >= self._limit:
-                return False
+        tats[key] = tat
+        tats.move_to_end(key)
+        self._expire(now, budget=2)
+        if len(tats) > self._max_keys:
+            tats.popitem(last=False)
+            self._stats.evictions += 1
+        return self._record(True)
+
+    async def get_remaining(self, key: str) -> int:
+        now = time.monotonic()
+        return self._remaining(self._tats.get(key, now), now)
 
-            queue.append(now)
-            return True
+    def sweep(self) -> int:
+        """Drop expired keys from the cold end of the LRU order. Returns how many were removed."""
+
+        return self._expire(time.monotonic(), budget=None)
+
+    async def _sweep_once(self) -> int:
+        return self.sweep()
+
+    def _expire(self, now: float, budget: int | None) -> int:
+        tats = self._tats
+        removed = 0
+        while tats and (budget is None or removed < budget):
+            key, tat = next(iter(tats.items()))
+            if tat > now:
+                break
+            del tats[key]
+            removed += 1
+        self._stats.expirations += removed
+        return removed
+
+
+class PostgresRateLimiter(BaseRateLimiter):
+    """GCRA limiter backed by the UNLOGGED ``rate_limit_buckets`` table.
+
+    A check is one ``INSERT ... ON CONFLICT DO UPDATE ... WHERE ... RETURNING`` statement:
+    the update only applies (and a row is only returned) when the request fits, so
+    concurrent workers cannot over-admit. Time comes from the database clock, which keeps
+    replicas consistent even if their own clocks drift. Expired rows are deleted by
+    :meth:`purge_expired`, which :meth:`start_sweeper` runs periodically.
+    """
+
+    def __init__(self, engine: AsyncEngine, limit: int, window_seconds: int, *, scope: str) -> None:
+        super().__init__(limit, window_seconds)
+        self._engine = engine
+        self._scope = scope
+
+    async def allow(self, key: str) -> bool:
+        now = _db_now()
+        next_tat = func.greatest(RateLimitBucket.tat, now) + self._interval
+        insert = pg_insert(RateLimitBucket).values(key=self._key(key), tat=now + self._interval)
+        stmt = insert.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={"tat": next_tat},
+            where=next_tat - now <= self._window,
+        ).returning(RateLimitBucket.tat)
+        async with self._engine.begin() as conn:
+            result = await conn.execute(stmt)
+            return self._record(result.first() is not None)
 
     async def get_remaining(self, key: str) -> int:
-        """Return how many requests remain in the window for the key."""
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
+                select(RateLimitBucket.tat, _db_now()).where(
+                    RateLimitBucket.key == self._key(key)
+                )
+            )
+            row = result.first()
+        if row is None:
+            return self._limit
+        tat, now = row
+        return self._remaining(tat, float(now))
+
+    async def purge_expired(self) -> int:
+        """Delete buckets whose TAT has passed; they are equivalent to a fresh key."""
+
+        async with self._engine.begin() as conn:
+            result = await conn.execute(
+                delete(RateLimitBucket).where(
+                    RateLimitBucket.key.startswith(f"{self._scope}:"),
+                    RateLimitBucket.tat < _db_now(),
+                )
+            )
+        return result.rowcount
+
+    async def _sweep_once(self) -> int:
+        try:
+            removed = await self.purge_expired()
+        except (OSError, SQLAlchemyError) as exc:
+            # A failed purge only delays cleanup; the next interval tries again.
+            log_event("rate_limit_purge_failed", level=logging.WARNING, error=repr(exc))
+            return 0
+        self._stats.expirations += removed
+        return removed
+
+    def _key(self, key: str) -> str:
+        return f"{self._scope}:{key}"
+
+
+def _db_now() -> ColumnElement[Any]:
+    # statement_timestamp() is fixed for the whole statement, so every reference to "now"
+    # within one check sees the same instant.
+    return func.extract("epoch", func.statement_timestamp())
 
-        now = time.monotonic()
-        async with self._lock:
-            queue = self._events.get(key)
-            if not queue:
-                return self._limit
 
-            cutoff = now - self._window
-            while queue and queue[0] <= cutoff:
-                queue.popleft()
+def create_rate_limiter(
+    backend: str,
+    limit: int,
+    window_seconds: int,
+    *,
+    scope: str,
+    engine: AsyncEngine | None = None,
+    max_keys: int = 100_000,
+) -> BaseRateLimiter:
+    """Build the limiter selected by ``RATE_LIMIT_BACKEND`` (``memory`` or ``postgres``)."""
 
-            remaining = self._limit - len(queue)
-            return remaining if remaining >= 0 else 0
+    if backend == "memory":
+        return RateLimiter(limit, window_seconds, max_keys=max_keys)
+    if backend == "postgres":
+        if engine is None:
+            raise ValueError("the postgres rate limit backend requires an engine")
+        return PostgresRateLimiter(engine, limit, window_seconds, scope=scope)
+    raise ValueError(f"unknown rate limit backend: {backend}")
 
 
-__all__ = ["RateLimiter"]
+__all__ = [
+    "BaseRateLimiter",
+    "PostgresRateLimiter",
+    "RateLimiter",
+    "RateLimiterStats",
+    "create_rate_limiter",
+]
@@ -0,0 +1,100 @@
+"""Measure per-message ``CrisisDetectionService.assess`` latency.
+
+No database is needed::
+
+    uv run python -m benchmarks.crisis_detection --messages 20000
+
+Messages are a mix of everyday chat, figurative phrases the lexicon treats as benign,
+crisis phrases and obfuscated ones, plus maximum-length (2000 character) messages. The
+same corpus is run against the bundled lexicon and against one padded with 5000 extra
+phrases, which should cost the same: matching is one pass over the message whatever
+the lexicon size.
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.crisis_detection_service import (
+    DEFAULT_LEXICON_PATH,
+    CrisisDetectionService,
+)
+from benchmarks.results import BenchmarkResult, latency
+
+SAMPLES = [
+    "Today I went to the coffee shop and tried to start a conversation with someone from "
+    "my class. It went okay but I felt awkward afterwards and I'm not sure what to say.",
+    "I'm killing it at my new job, and I'm dying to tell everyone at the meetup!",
+    "hey",
+    "Can you help me figure out what to say at the climbing gym on Saturday?",
+    "honestly some days I just wanna die, nobody would care if I was gone",
+    "i want to k i l l mys3lf",
+    "I've been cuuutting myself again and I can't stop",
+]
+LONG = ("I talked to a few people at the book club and it went better than I expected. " * 26)[
+    :2000
+]
+
+
+def _corpus(messages: int) -> list[str]:
+    rng = random.Random(7)
+    return [LONG if index % 50 == 0 else rng.choice(SAMPLES) for index in range(messages)]
+
+
+def _write_padded_lexicon(path: Path, extra: int) -> None:
+    data = json.loads(DEFAULT_LEXICON_PATH.read_text())
+    rng = random.Random(11)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    filler = [
+        " ".join("".join(rng.choices(letters, k=rng.randint(3, 8))) for _ in range(3))
+        for _ in range(extra)
+    ]
+    data["patterns"]["severe_depression"]["low"].extend(filler)
+    path.write_text(json.dumps(data))
+
+
+def _time(detector: CrisisDetectionService, corpus: list[str]) -> list[float]:
+    timings = []
+    for text in corpus:
+        started = time.perf_counter()
+        detector.assess(text)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def collect(messages: int) -> dict[str, list[float]]:
+    """Per-message timings (seconds) for each lexicon."""
+
+    corpus = _corpus(messages)
+    timings: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        padded = Path(directory) / "lexicon.json"
+        _write_padded_lexicon(padded, 5000)
+        for name, path in (("bundled_lexicon", DEFAULT_LEXICON_PATH), ("lexicon+5000", padded)):
+            detector = CrisisDetectionService(path)
+            _time(detector, corpus[:1000])  # warm the per-word normalization cache
+            timings[name] = _time(detector, corpus)
+    return timings
+
+
+def measure(messages: int) -> list[BenchmarkResult]:
+    return [
+        latency(f"crisis_assess[{name}]", values, messages=messages)
+        for name, values in collect(messages).items()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    args = parser.parse_args()
+    for name, values in collect(args.messages).items():
+        ordered = sorted(values)
+        p50, p99 = (ordered[int(len(ordered) * q)] * 1e6 for q in (0.50, 0.99))
+        print(f"{name:<16} p50={p50:6.1f} us  p99={p99:6.1f} us  max={ordered[-1] * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure enqueue-to-start latency and idle query load of a listening worker.
+
+Run against a database migrated to head (the notify trigger must be installed)::
+
+    uv run python -m benchmarks.job_latency --samples 200 --idle-seconds 10
+
+A ``JobWorker`` with a ``QueueListener`` runs in-process. Jobs are enqueued one at a time
+on a separate connection and the delay until the handler starts is recorded. The script
+then counts the statements the worker issues while the queue sits empty.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.repositories.job import ClaimedJob, JobRepository
+from app.tasks.worker import JobWorker, QueueListener
+
+JOB_NAME = "benchmark_latency_job"
+
+
+async def run(samples: int, idle_seconds: float) -> None:
+    settings = get_settings()
+    worker_engine = create_async_engine(settings.database_url)
+    producer_engine = create_async_engine(settings.database_url)
+    producer_sessions = async_sessionmaker(producer_engine)
+    statements = 0
+
+    def _count(*_: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(worker_engine.sync_engine, "before_cursor_execute", _count)
+
+    enqueued_at: dict[int, float] = {}
+    latencies: list[float] = []
+    started = asyncio.Event()
+
+    async def handler(job: ClaimedJob) -> None:
+        latencies.append(time.perf_counter() - enqueued_at[job.data["n"]])
+        started.set()
+
+    listener = QueueListener(worker_engine)
+    await listener.start()
+    worker = JobWorker(
+        async_sessionmaker(worker_engine, expire_on_commit=False),
+        {JOB_NAME: handler},
+        idle_poll_interval=settings.job_worker_idle_poll_seconds,
+    )
+    stop = asyncio.Event()
+    running = asyncio.create_task(worker.run(stop, listener.wakeup))
+
+    try:
+        for n in range(samples):
+            started.clear()
+            async with producer_sessions() as session:
+                enqueued_at[n] = time.perf_counter()
+                await JobRepository(session).enqueue(JOB_NAME, {"n": n})
+            await asyncio.wait_for(started.wait(), timeout=30)
+
+        await asyncio.sleep(1)
+        statements = 0
+        await asyncio.sleep(idle_seconds)
+        idle_statements = statements
+    finally:
+        stop.set()
+        await running
+        await listener.close()
+        async with producer_engine.begin() as conn:
+            await conn.execute(text("DELETE FROM job_queue WHERE name = :name"), {"name": JOB_NAME})
+        await producer_engine.dispose()
+        await worker_engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"samples            {len(latencies)}")
+    print(f"latency p50 ms     {statistics.median(latencies) * 1000:.2f}")
+    print(f"latency p95 ms     {quantiles[94] * 1000:.2f}")
+    print(f"latency p99 ms     {quantiles[98] * 1000:.2f}")
+    print(f"idle statements/s  {idle_statements / idle_seconds:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--idle-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.samples, args.idle_seconds))
+
+
+if __name__ == "__main__":
+    main()
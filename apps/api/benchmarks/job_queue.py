@@ -0,0 +1,126 @@
+"""Measure job queue throughput as worker processes are added.
+
+Run against a database migrated to head::
+
+    uv run python -m benchmarks.job_queue --jobs 5000 --workers 1,2,4 --work-ms 5
+
+For each worker count the script enqueues ``--jobs`` jobs, starts that many worker
+processes (each a ``JobWorker`` whose handler sleeps ``--work-ms`` to stand in for I/O),
+waits for the queue to drain and reports jobs/second. It also verifies that every job
+ran exactly once across all processes.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+from datetime import timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.repositories.job import ClaimedJob
+from app.tasks.worker import JobWorker
+
+JOB_NAME = "benchmark_job"
+
+
+async def _enqueue(count: int) -> None:
+    engine = create_async_engine(get_settings().database_url)
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM job_queue WHERE name = :name"), {"name": JOB_NAME})
+        await conn.execute(
+            text(
+                """
+                INSERT INTO job_queue (name, data)
+                SELECT :name, jsonb_build_object('n', n) FROM generate_series(1, :count) AS n
+                """
+            ),
+            {"name": JOB_NAME, "count": count},
+        )
+    await engine.dispose()
+
+
+async def _drain(work_seconds: float, concurrency: int, batch_size: int, ready, go) -> list[str]:
+    engine = create_async_engine(get_settings().database_url)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    ready.put(True)
+    await asyncio.to_thread(go.wait)
+    processed: list[str] = []
+
+    async def handler(job: ClaimedJob) -> None:
+        await asyncio.sleep(work_seconds)
+        processed.append(str(job.id))
+
+    worker = JobWorker(
+        async_sessionmaker(engine, expire_on_commit=False),
+        {JOB_NAME: handler},
+        concurrency=concurrency,
+        batch_size=batch_size,
+        lease=timedelta(minutes=5),
+    )
+    while await worker.run_once():
+        pass
+    await engine.dispose()
+    return processed
+
+
+def _worker_process(
+    work_seconds: float, concurrency: int, batch_size: int, ready, go, results
+) -> None:
+    results.put(asyncio.run(_drain(work_seconds, concurrency, batch_size, ready, go)))
+
+
+def run(
+    jobs: int, worker_counts: list[int], work_ms: float, concurrency: int, batch_size: int
+) -> None:
+    print(f"{'workers':>8} {'seconds':>9} {'jobs/s':>10} {'duplicates':>11}")
+    context = multiprocessing.get_context("spawn")
+    for workers in worker_counts:
+        asyncio.run(_enqueue(jobs))
+        ready, go, results = context.Queue(), context.Event(), context.Queue()
+        processes = [
+            context.Process(
+                target=_worker_process,
+                args=(work_ms / 1000, concurrency, batch_size, ready, go, results),
+            )
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        # Exclude interpreter start-up and connection setup from the measurement.
+        for _ in processes:
+            ready.get()
+        started = time.perf_counter()
+        go.set()
+        processed = [job_id for _ in processes for job_id in results.get()]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+
+        duplicates = len(processed) - len(set(processed))
+        if len(set(processed)) != jobs:
+            raise SystemExit(f"expected {jobs} jobs, processed {len(set(processed))}")
+        print(f"{workers:>8} {elapsed:>9.2f} {jobs / elapsed:>10.0f} {duplicates:>11}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated process counts")
+    parser.add_argument("--work-ms", type=float, default=5.0, help="simulated handler latency")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+    run(
+        args.jobs,
+        [int(count) for count in args.workers.split(",")],
+        args.work_ms,
+        args.concurrency,
+        args.batch_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure streamed-reply throughput through ``ClaudeClient`` against the local fake API.
+
+No database or network access is needed; the fake Messages API is served on a loopback
+port by an in-process uvicorn::
+
+    uv run python -m benchmarks.llm_client --requests 500 --concurrency 50
+
+Replies are streamed once through one shared, pooled client and once with a new
+``httpx.AsyncClient`` per reply (a new connection, and against the real API a new TLS
+handshake, every time). Loopback is HTTP/1.1 because uvicorn does not serve cleartext
+HTTP/2.
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+import uvicorn
+
+from app.services.integrations.claude import ClaudeClient
+from app.services.integrations.fakes.claude import create_fake_claude_app
+from app.services.interfaces import ChatMessage
+from benchmarks.results import BenchmarkResult, latency, throughput
+
+MESSAGES = [ChatMessage("user", "I want to get better at starting conversations with classmates")]
+
+
+@asynccontextmanager
+async def serve_fake(token_delay: float) -> AsyncIterator[str]:
+    """Serve the fake API on an ephemeral loopback port and yield its base URL."""
+
+    config = uvicorn.Config(
+        create_fake_claude_app(token_delay=token_delay),
+        host="127.0.0.1",
+        port=0,
+        log_level="warning",
+        lifespan="off",
+    )
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+def _client(base_url: str, concurrency: int) -> ClaudeClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    http = httpx.AsyncClient(base_url=base_url, limits=limits)
+    return ClaudeClient(
+        http, model="fake-model", max_tokens=256, max_concurrency=concurrency, queue_timeout=60
+    )
+
+
+async def _stream(client: ClaudeClient, first_tokens: list[float]) -> None:
+    started = time.perf_counter()
+    async for _ in client.stream_reply(MESSAGES):
+        if started:
+            first_tokens.append(time.perf_counter() - started)
+            started = 0.0
+
+
+async def measure(requests: int, concurrency: int, token_delay: float) -> list[BenchmarkResult]:
+    params = {"concurrency": concurrency, "token_delay": token_delay}
+    async with serve_fake(token_delay) as base_url:
+        shared = _client(base_url, concurrency)
+        first_tokens: list[float] = []
+        started = time.perf_counter()
+        await asyncio.gather(*(_stream(shared, first_tokens) for _ in range(requests)))
+        pooled = time.perf_counter() - started
+        await shared.aclose()
+
+        slots = asyncio.Semaphore(concurrency)
+
+        async def unpooled() -> None:
+            async with slots:
+                client = _client(base_url, 1)
+                try:
+                    await _stream(client, [])
+                finally:
+                    await client.aclose()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(unpooled() for _ in range(requests)))
+        per_request = time.perf_counter() - started
+    return [
+        throughput("llm_stream[pooled]", requests, pooled, **params),
+        throughput("llm_stream[client_per_request]", requests, per_request, **params),
+        latency("llm_first_token[pooled]", first_tokens, **params),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    args = parser.parse_args()
+    results = asyncio.run(measure(args.requests, args.concurrency, args.token_delay))
+    for result in results:
+        print(f"{result.name:<36} {result.value:>10.1f} {result.unit}")
+
+
+if __name__ == "__main__":
+    main()
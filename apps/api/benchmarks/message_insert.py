@@ -0,0 +1,106 @@
+"""Measure conversation insert latency as a user's history grows.
+
+Run against a database migrated to head so the analysis queue trigger is active::
+
+    uv run python -m benchmarks.message_insert --sizes 100,1000,10000,100000
+
+For every history size the script seeds messages for a throwaway user, then times
+single inserts through ``ConversationRepository.create``. With the O(1) counter
+trigger the per-insert latency should stay flat across sizes.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.repositories.conversation import ConversationRepository
+from benchmarks.results import BenchmarkResult, format_table, latency
+
+
+async def seed(engine: AsyncEngine, user_id: uuid.UUID, count: int) -> None:
+    if count <= 0:
+        return
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                """
+                INSERT INTO conversations (user_id, message_text, sender_type)
+                SELECT :user_id, 'seed message ' || n, 'user'
+                  FROM generate_series(1, :count) AS n
+                """
+            ),
+            {"user_id": user_id, "count": count},
+        )
+
+
+async def _time_inserts(engine: AsyncEngine, user_id: uuid.UUID, samples: int) -> list[float]:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    timings: list[float] = []
+    async with session_factory() as session:
+        repo = ConversationRepository(session)
+        for _ in range(samples):
+            started = time.perf_counter()
+            await repo.create(user_id, "benchmark message", "user")
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def create_user(engine: AsyncEngine) -> uuid.UUID:
+    """Insert a throwaway user; remove it (and its queued jobs) with :func:`drop_user`."""
+
+    user_id = uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO users (id, email, password_hash) VALUES (:id, :email, 'benchmark')"),
+            {"id": user_id, "email": f"bench-{user_id}@example.com"},
+        )
+    return user_id
+
+
+async def drop_user(engine: AsyncEngine, user_id: uuid.UUID) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM job_queue WHERE data ->> 'user_id' = :id"), {"id": str(user_id)}
+        )
+        await conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+
+
+async def measure(engine: AsyncEngine, sizes: list[int], samples: int) -> list[BenchmarkResult]:
+    user_id = await create_user(engine)
+    results: list[BenchmarkResult] = []
+    try:
+        history = 0
+        for size in sorted(sizes):
+            await seed(engine, user_id, size - history)
+            timings = await _time_inserts(engine, user_id, samples)
+            history = size + samples
+            results.append(latency(f"message_insert[history={size}]", timings, history=size))
+    finally:
+        await drop_user(engine, user_id)
+    return results
+
+
+async def run(sizes: list[int], samples: int) -> None:
+    engine = create_async_engine(get_settings().database_url)
+    try:
+        print(format_table(await measure(engine, sizes, samples)))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="100,1000,10000,100000", help="comma-separated history sizes"
+    )
+    parser.add_argument("--samples", type=int, default=200, help="timed inserts per history size")
+    args = parser.parse_args()
+    asyncio.run(run([int(size) for size in args.sizes.split(",")], args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Measure in-memory ``RateLimiter.allow`` throughput and memory with many distinct keys.
+
+No database is needed::
+
+    uv run python -m benchmarks.rate_limiter --keys 1000000 --max-keys 100000
+
+Each key is checked once, which is the worst case for the limiter (every call inserts and,
+once the cap is reached, evicts). Memory is measured with ``tracemalloc`` in a
+second, untimed pass.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.utils.rate_limiter import RateLimiter
+from benchmarks.results import BenchmarkResult, throughput
+
+
+async def _drive(limiter: RateLimiter, names: list[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name in names:
+            await limiter.allow(name)
+    return time.perf_counter() - started
+
+
+async def measure(keys: int, max_keys: int) -> list[BenchmarkResult]:
+    """Throughput for ``keys`` distinct keys and for one hot key checked ``keys`` times."""
+
+    names = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{i}" for i in range(keys)]
+    limiter = RateLimiter(limit=10, window_seconds=60, max_keys=max_keys)
+    distinct = await _drive(limiter, names, 1)
+    hot = await _drive(RateLimiter(limit=10, window_seconds=60), ["10.0.0.1"] * keys, 1)
+    return [
+        throughput("rate_limiter_allow[distinct_keys]", keys, distinct, max_keys=max_keys),
+        throughput("rate_limiter_allow[hot_key]", keys, hot),
+    ]
+
+
+async def run(keys: int, max_keys: int, repeat: int) -> None:
+    names = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{i}" for i in range(keys)]
+
+    limiter = RateLimiter(limit=10, window_seconds=60, max_keys=max_keys)
+    elapsed = await _drive(limiter, names, repeat)
+    stats = limiter.stats
+
+    # Separate pass: tracemalloc slows allocation-heavy code several times over.
+    tracemalloc.start()
+    traced = RateLimiter(limit=10, window_seconds=60, max_keys=max_keys)
+    await _drive(traced, names, repeat)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = keys * repeat
+    print(f"calls={calls} max_keys={max_keys}")
+    print(f"  {calls / elapsed:,.0f} allow()/s ({elapsed * 1e9 / calls:.0f} ns/call)")
+    print(f"  tracked={stats.keys} evictions={stats.evictions} expirations={stats.expirations}")
+    print(f"  traced memory: current={current / 2**20:.1f} MiB peak={peak / 2**20:.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.keys, args.max_keys, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Benchmark result records, JSON persistence and baseline comparison."""
+import json
+import platform
+import statistics
+import subprocess
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal, Sequence
+
+Direction = Literal["lower", "higher"]
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """One measured quantity. ``direction`` says whether lower or higher values are better.
+
+    For latencies ``value`` is the median, which is what baselines are compared on; it is
+    far less sensitive to a stray GC pause or checkpoint than the mean.
+    """
+
+    name: str
+    value: float
+    unit: str
+    direction: Direction
+    mean: float | None = None
+    p95: float | None = None
+    samples: int = 0
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One benchmark across both runs; ``baseline`` or ``current`` is ``None`` when it only
+    ran in the other one, and then there is no ``change``."""
+
+    name: str
+    baseline: float | None
+    current: float | None
+    change: float | None  # relative, positive means worse
+    regressed: bool
+
+
+def latency(name: str, timings: Sequence[float], **params: Any) -> BenchmarkResult:
+    """Summarise per-operation timings (seconds) as a median-latency result in milliseconds."""
+
+    ordered = sorted(timings)
+    return BenchmarkResult(
+        name=name,
+        value=_percentile(ordered, 0.50) * 1000,
+        unit="ms",
+        direction="lower",
+        mean=statistics.fmean(ordered) * 1000,
+        p95=_percentile(ordered, 0.95) * 1000,
+        samples=len(ordered),
+        params=params,
+    )
+
+
+def throughput(name: str, operations: int, seconds: float, **params: Any) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        value=operations / seconds,
+        unit="ops/s",
+        direction="higher",
+        samples=operations,
+        params=params,
+    )
+
+
+def write_results(path: Path, results: Sequence[BenchmarkResult], **meta: Any) -> None:
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "git_commit": _git_commit(),
+            **meta,
+        },
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: Path) -> dict[str, BenchmarkResult]:
+    document = json.loads(path.read_text())
+    return {item["name"]: BenchmarkResult(**item) for item in document["results"]}
+
+
+def compare(
+    current: Sequence[BenchmarkResult],
+    baseline: dict[str, BenchmarkResult],
+    threshold: float,
+) -> list[Comparison]:
+    """Compare the two runs; a change worse than ``threshold`` regresses.
+
+    Benchmarks that ran only once (added, removed, skipped or filtered with ``--only``)
+    are listed without a change, and so is a zero baseline, which has no relative change.
+    """
+
+    comparisons: list[Comparison] = []
+    for result in current:
+        before = baseline.get(result.name)
+        if before is None or before.value == 0:
+            previous = before.value if before is not None else None
+            comparisons.append(Comparison(result.name, previous, result.value, None, False))
+            continue
+        change = (result.value - before.value) / before.value
+        if result.direction == "higher":
+            change = -change
+        comparisons.append(
+            Comparison(result.name, before.value, result.value, change, change > threshold)
+        )
+    names = {result.name for result in current}
+    comparisons.extend(
+        Comparison(name, before.value, None, None, False)
+        for name, before in baseline.items()
+        if name not in names
+    )
+    return comparisons
+
+
+def format_table(results: Sequence[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<40} {'value':>12} {'unit':<6} {'mean':>10} {'p95':>10}"]
+    for result in results:
+        mean = f"{result.mean:.3f}" if result.mean is not None else "-"
+        p95 = f"{result.p95:.3f}" if result.p95 is not None else "-"
+        lines.append(
+            f"{result.name:<40} {result.value:>12.3f} {result.unit:<6} {mean:>10} {p95:>10}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons: Sequence[Comparison]) -> str:
+    lines = [f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for item in comparisons:
+        baseline = f"{item.baseline:.3f}" if item.baseline is not None else "-"
+        current = f"{item.current:.3f}" if item.current is not None else "-"
+        change = f"{item.change:+.1%}" if item.change is not None else "-"
+        if item.regressed:
+            flag = "  REGRESSION"
+        elif item.current is None:
+            flag = "  only in baseline"
+        elif item.baseline is None:
+            flag = "  only in current run"
+        else:
+            flag = ""
+        lines.append(f"{item.name:<40} {baseline:>12} {current:>12} {change:>9}{flag}")
+    return "\n".join(lines)
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _git_commit() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+__all__ = [
+    "BenchmarkResult",
+    "Comparison",
+    "compare",
+    "format_comparisons",
+    "format_table",
+    "latency",
+    "load_results",
+    "throughput",
+    "write_results",
+]
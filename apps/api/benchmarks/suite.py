@@ -0,0 +1,245 @@
+"""Run the API hot-path benchmarks and optionally compare them with a saved baseline.
+
+Run against a database migrated to head (the analysis trigger must be installed)::
+
+    uv run python -m benchmarks.suite --output bench.json
+    uv run python -m benchmarks.suite --baseline bench.json --threshold 0.2
+
+Cases (select with ``--only``):
+
+* ``signup`` – ``POST /api/v1/auth/signup`` through the ASGI app, concurrent clients
+* ``rate_limiter`` – ``RateLimiter.allow`` ops/sec, distinct keys and one hot key
+* ``user_crud`` – ``UserRepository`` create/get/update/delete latency
+* ``list_for_user`` – first page and full history at 10, 1k and 100k messages
+* ``message_insert`` – conversation insert latency with the analysis trigger active
+* ``llm_client`` – streamed replies/sec from the local fake LLM API, pooled vs unpooled
+* ``crisis_detection`` – per-message crisis assessment latency, bundled vs padded lexicon
+
+``rate_limiter``, ``llm_client`` and ``crisis_detection`` need no database. The other
+cases need PostgreSQL: the schema uses JSONB/UUID columns and PL/pgSQL triggers, so they
+are skipped for any other ``DATABASE_URL``. With ``--baseline`` the process exits with
+status 1 when any result is worse than the baseline by more than ``--threshold``
+(relative), which makes it usable as a CI gate.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.repositories.conversation import ConversationRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.utils.rate_limiter import RateLimiter
+from benchmarks import crisis_detection, llm_client, message_insert, rate_limiter
+from benchmarks.results import (
+    BenchmarkResult,
+    compare,
+    format_comparisons,
+    format_table,
+    latency,
+    load_results,
+    throughput,
+    write_results,
+)
+
+Case = Callable[[AsyncEngine | None, argparse.Namespace], Awaitable[list[BenchmarkResult]]]
+
+EMAIL_DOMAIN = "bench.example.com"
+
+
+async def bench_signup(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    from app.main import create_app
+
+    app = create_app()
+    app.state.signup_rate_limiter = RateLimiter(limit=1_000_000, window_seconds=1)
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    timings: list[float] = []
+
+    async def signup(client: AsyncClient, index: int) -> None:
+        payload = {"email": f"signup-{run_id}-{index}@{EMAIL_DOMAIN}", "password": "Password123"}
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/signup", json=payload)
+            timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(signup(client, i) for i in range(args.signups)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await _delete_benchmark_users(engine)
+    return [
+        throughput("signup", args.signups, elapsed, concurrency=args.concurrency),
+        latency("signup_latency", timings, concurrency=args.concurrency),
+    ]
+
+
+async def bench_rate_limiter(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    return await rate_limiter.measure(args.limiter_keys, max_keys=100_000)
+
+
+async def bench_user_crud(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    assert engine is not None
+    timings: dict[str, list[float]] = {"create": [], "get": [], "update": [], "delete": []}
+    run_id = uuid.uuid4().hex[:8]
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            repo = UserRepository(session)
+            for index in range(args.samples):
+                email = f"crud-{run_id}-{index}@{EMAIL_DOMAIN}"
+                payload = UserCreate(email=email, password="Password123")
+                user = await _timed(timings["create"], repo.create(payload, "benchmark"))
+                await _timed(timings["get"], repo.get(user.id))
+                await _timed(timings["update"], repo.update(user.id, stage=2))
+                await _timed(timings["delete"], repo.delete(user.id))
+    finally:
+        await _delete_benchmark_users(engine)
+    return [latency(f"user_{operation}", values) for operation, values in timings.items()]
+
+
+async def bench_list_for_user(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    assert engine is not None
+    user_id = await message_insert.create_user(engine)
+    results: list[BenchmarkResult] = []
+    try:
+        seeded = 0
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            repo = ConversationRepository(session)
+            for size in args.history_sizes:
+                await message_insert.seed(engine, user_id, size - seeded)
+                seeded = size
+                page: list[float] = []
+                for _ in range(args.samples):
+                    await _timed(page, repo.list_for_user(user_id, limit=50))
+                full: list[float] = []
+                for _ in range(max(3, min(args.samples, 100_000 // size))):
+                    await _timed(full, repo.list_for_user(user_id))
+                    session.expunge_all()
+                results.append(latency(f"list_for_user_page[rows={size}]", page, rows=size))
+                results.append(latency(f"list_for_user_full[rows={size}]", full, rows=size))
+    finally:
+        await message_insert.drop_user(engine, user_id)
+    return results
+
+
+async def bench_message_insert(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    assert engine is not None
+    return await message_insert.measure(engine, args.history_sizes, args.samples)
+
+
+async def bench_llm_client(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    return await llm_client.measure(args.llm_requests, args.llm_concurrency, token_delay=0.0)
+
+
+async def bench_crisis_detection(
+    engine: AsyncEngine | None, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    return crisis_detection.measure(args.crisis_messages)
+
+
+CASES: dict[str, tuple[Case, bool]] = {
+    "signup": (bench_signup, True),
+    "rate_limiter": (bench_rate_limiter, False),
+    "user_crud": (bench_user_crud, True),
+    "list_for_user": (bench_list_for_user, True),
+    "message_insert": (bench_message_insert, True),
+    "llm_client": (bench_llm_client, False),
+    "crisis_detection": (bench_crisis_detection, False),
+}
+
+
+async def _timed(timings: list[float], operation: Awaitable):
+    started = time.perf_counter()
+    result = await operation
+    timings.append(time.perf_counter() - started)
+    return result
+
+
+async def _delete_benchmark_users(engine: AsyncEngine | None) -> None:
+    if engine is None:
+        return
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": f"%@{EMAIL_DOMAIN}"}
+        )
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    database_url = get_settings().database_url
+    postgres = make_url(database_url).get_backend_name() == "postgresql"
+    engine = create_async_engine(database_url) if postgres else None
+    results: list[BenchmarkResult] = []
+    try:
+        for name in args.only:
+            case, needs_database = CASES[name]
+            if needs_database and engine is None:
+                print(f"skipping {name}: requires PostgreSQL", file=sys.stderr)
+                continue
+            print(f"running {name}...", file=sys.stderr)
+            results.extend(await case(engine, args))
+    finally:
+        if engine is not None:
+            await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default=",".join(CASES), help="comma-separated cases")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--samples", type=int, default=200, help="timed calls per latency case")
+    parser.add_argument("--signups", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limiter-keys", type=int, default=1_000_000)
+    parser.add_argument("--history-sizes", default="10,1000,100000")
+    parser.add_argument("--llm-requests", type=int, default=300)
+    parser.add_argument("--llm-concurrency", type=int, default=30)
+    parser.add_argument("--crisis-messages", type=int, default=20_000)
+    args = parser.parse_args()
+    args.only = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(args.only) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    args.history_sizes = sorted(int(size) for size in args.history_sizes.split(","))
+
+    results = asyncio.run(run(args))
+    print(format_table(results))
+    if args.output:
+        write_results(args.output, results, cases=args.only, samples=args.samples)
+    if args.baseline:
+        comparisons = compare(results, load_results(args.baseline), args.threshold)
+        print()
+        print(format_comparisons(comparisons))
+        if any(item.regressed for item in comparisons):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
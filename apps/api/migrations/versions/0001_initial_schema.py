@@ -131,9 +131,9 @@ def upgrade() -> None:
                 WHERE n.nspname = 'auth' AND p.proname = 'uid'
             ) THEN
                 EXECUTE 'CREATE SCHEMA IF NOT EXISTS auth';
-                EXECUTE $$CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid
+                EXECUTE $ddl$CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid
                     LANGUAGE sql STABLE
-                AS $$ SELECT NULL::uuid $$;$$;
+                AS $fn$ SELECT NULL::uuid $fn$;$ddl$;
             END IF;
         END;
         $$;
@@ -216,15 +216,15 @@ def downgrade() -> None:
     op.execute("DROP TRIGGER IF EXISTS trigger_analysis_queue ON public.conversations")
     op.execute("DROP FUNCTION IF EXISTS public.queue_analysis_check")
 
-    op.execute(
-        """
-        DROP POLICY IF EXISTS "Users can view their own analysis" ON public.analysis_results;
-        DROP POLICY IF EXISTS "Users can insert their own messages" ON public.conversations;
-        DROP POLICY IF EXISTS "Users can view their own conversations" ON public.conversations;
-        DROP POLICY IF EXISTS "Users can update their own data" ON public.users;
-        DROP POLICY IF EXISTS "Users can view their own data" ON public.users;
-        """
-    )
+    # asyncpg rejects multi-statement strings, so each policy is dropped separately.
+    for policy, table in (
+        ("Users can view their own analysis", "analysis_results"),
+        ("Users can insert their own messages", "conversations"),
+        ("Users can view their own conversations", "conversations"),
+        ("Users can update their own data", "users"),
+        ("Users can view their own data", "users"),
+    ):
+        op.execute(f'DROP POLICY IF EXISTS "{policy}" ON public.{table}')
 
     op.execute("ALTER TABLE IF EXISTS public.analysis_results DISABLE ROW LEVEL SECURITY")
     op.execute("ALTER TABLE IF EXISTS public.conversations DISABLE ROW LEVEL SECURITY")
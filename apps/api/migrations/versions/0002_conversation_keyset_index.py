@@ -0,0 +1,48 @@
+"""Composite index backing keyset pagination of conversation history.
+
+`ConversationRepository.list_for_user` pages on `(timestamp, id)` per user, so a
+`(user_id, timestamp, id)` index serves every page with a bounded index range
+scan. It also covers the plain `user_id` lookups, so the single-column index
+from the initial schema is dropped to keep inserts cheap.
+
+`timestamp` now defaults to `clock_timestamp()` rather than `NOW()`: `NOW()` is
+fixed per transaction, so a user message and coach reply written in one unit of
+work would tie and fall back to random UUID order.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002_conversation_keyset_index"
+down_revision: str | None = "0001_initial_schema"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_conversations_user_id_timestamp_id",
+        "conversations",
+        ["user_id", "timestamp", "id"],
+    )
+    op.drop_index("ix_conversations_user_id", table_name="conversations")
+    op.alter_column(
+        "conversations",
+        "timestamp",
+        server_default=sa.text("clock_timestamp()"),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "conversations",
+        "timestamp",
+        server_default=sa.text("NOW()"),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=False,
+    )
+    op.create_index("ix_conversations_user_id", "conversations", ["user_id"])
+    op.drop_index("ix_conversations_user_id_timestamp_id", table_name="conversations")
@@ -0,0 +1,28 @@
+"""Partial index for fetching a user's most recent own messages.
+
+The ChAT analysis job reads the last N messages a user sent. Restricting the
+index to `sender_type = 'user'` lets that query walk backwards through only
+the user's own rows and stop after LIMIT, without filtering coach replies.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003_conversation_analysis_index"
+down_revision: str | None = "0002_conversation_keyset_index"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_conversations_user_messages",
+        "conversations",
+        ["user_id", "timestamp", "id"],
+        postgresql_where=sa.text("sender_type = 'user'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversations_user_messages", table_name="conversations")
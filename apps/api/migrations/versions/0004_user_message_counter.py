@@ -0,0 +1,116 @@
+"""Maintain a per-user message counter for the analysis queue trigger.
+
+`queue_analysis_check` previously ran `SELECT COUNT(*)` over the user's
+conversation history after every insert, which grows linearly with history
+on the hottest write path. The trigger now bumps a `user_message_stats` row
+with a single upsert and reads the new count back via `RETURNING`, so each
+insert costs the same regardless of how many messages the user has sent.
+
+The counter tracks messages ever sent rather than messages currently stored,
+so deleting history no longer re-triggers an analysis at an old multiple of 25.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004_user_message_counter"
+down_revision: str | None = "0003_conversation_analysis_index"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_message_stats",
+        sa.Column("user_id", sa.dialects.postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_message_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO public.user_message_stats (user_id, user_message_count)
+        SELECT user_id, COUNT(*)
+          FROM public.conversations
+         WHERE sender_type = 'user'
+         GROUP BY user_id;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.queue_analysis_check()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            user_message_count bigint;
+        BEGIN
+            INSERT INTO public.user_message_stats AS stats (user_id, user_message_count)
+            VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE
+                SET user_message_count = stats.user_message_count + 1,
+                    updated_at = NOW()
+            RETURNING stats.user_message_count INTO user_message_count;
+
+            IF user_message_count % 25 = 0 THEN
+                INSERT INTO public.job_queue (name, data)
+                VALUES ('analysis_job', jsonb_build_object('user_id', NEW.user_id));
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # Coach and system messages no longer invoke the function at all.
+    op.execute("DROP TRIGGER IF EXISTS trigger_analysis_queue ON public.conversations")
+    op.execute(
+        """
+        CREATE TRIGGER trigger_analysis_queue
+        AFTER INSERT ON public.conversations
+        FOR EACH ROW
+        WHEN (NEW.sender_type = 'user')
+        EXECUTE FUNCTION public.queue_analysis_check();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trigger_analysis_queue ON public.conversations")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.queue_analysis_check()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            user_message_count integer;
+        BEGIN
+            SELECT COUNT(*)
+              INTO user_message_count
+              FROM public.conversations
+             WHERE user_id = NEW.user_id AND sender_type = 'user';
+
+            IF user_message_count > 0 AND user_message_count % 25 = 0 THEN
+                INSERT INTO public.job_queue (name, data)
+                VALUES ('analysis_job', jsonb_build_object('user_id', NEW.user_id));
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trigger_analysis_queue
+        AFTER INSERT ON public.conversations
+        FOR EACH ROW EXECUTE FUNCTION public.queue_analysis_check();
+        """
+    )
+    op.drop_table("user_message_stats")
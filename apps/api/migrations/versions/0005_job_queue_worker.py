@@ -0,0 +1,33 @@
+"""Job queue columns and index for the SKIP LOCKED worker.
+
+`app.tasks.worker` claims pending jobs ordered by priority and `start_after`,
+so a partial index over unfinished jobs keeps each claim a short index scan no
+matter how many completed jobs accumulate. Jobs that exhaust `retry_limit` are
+parked with `failed_at` and `last_error` instead of being retried forever.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005_job_queue_worker"
+down_revision: str | None = "0004_user_message_counter"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("job_queue", sa.Column("failed_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("job_queue", sa.Column("last_error", sa.Text(), nullable=True))
+    op.create_index(
+        "ix_job_queue_pending",
+        "job_queue",
+        ["name", sa.text("priority DESC"), "start_after"],
+        postgresql_where=sa.text("completed_at IS NULL AND failed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_queue_pending", table_name="job_queue")
+    op.drop_column("job_queue", "last_error")
+    op.drop_column("job_queue", "failed_at")
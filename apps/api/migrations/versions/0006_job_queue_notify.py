@@ -0,0 +1,44 @@
+"""Notify listening workers when a job becomes available.
+
+An AFTER INSERT trigger on `job_queue` calls `pg_notify('job_queue', name)` for
+jobs that are due immediately, so `app.tasks.worker` can block on LISTEN instead
+of polling. Delayed jobs and retries are picked up by the worker's fallback
+poll. Postgres folds duplicate notifications within a transaction, so bulk
+enqueues wake each worker once.
+"""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0006_job_queue_notify"
+down_revision: str | None = "0005_job_queue_worker"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.notify_job_queue()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM pg_notify('job_queue', NEW.name);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trigger_job_queue_notify
+        AFTER INSERT ON public.job_queue
+        FOR EACH ROW
+        WHEN (NEW.start_after <= NOW())
+        EXECUTE FUNCTION public.notify_job_queue();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trigger_job_queue_notify ON public.job_queue")
+    op.execute("DROP FUNCTION IF EXISTS public.notify_job_queue")
@@ -0,0 +1,29 @@
+"""Shared rate limiter state for multi-worker deployments.
+
+`PostgresRateLimiter` keeps one GCRA timestamp per key and updates it with a
+single conditional upsert, so every uvicorn worker and replica enforces the
+same limit. The table is UNLOGGED because the state is disposable and the
+upsert runs on every rate-limited request.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007_rate_limit_buckets"
+down_revision: str | None = "0006_job_queue_notify"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=255), primary_key=True),
+        sa.Column("tat", sa.Float(), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
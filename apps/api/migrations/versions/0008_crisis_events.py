@@ -0,0 +1,100 @@
+"""Crisis event log for follow-up review.
+
+Columns follow `crisis_events` in the architecture docs. Rows are appended in
+batches by `app.services.crisis_event_log`, so besides the documented
+`(user_id, severity_level)` index there are only two partial indexes, both
+serving the review queue: open events ordered most severe first then oldest
+first, and unacknowledged events by age. Each covers only rows still awaiting
+review, so they stay small as resolved events accumulate.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008_crisis_events"
+down_revision: str | None = "0007_rate_limit_buckets"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+SEVERITY_ORDER_SQL = (
+    "CASE severity_level WHEN 'critical' THEN 0 WHEN 'high' THEN 1 "
+    "WHEN 'moderate' THEN 2 ELSE 3 END"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crisis_events",
+        sa.Column(
+            "id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("uuid_generate_v4()"),
+        ),
+        sa.Column("user_id", sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("message_id", sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("trigger_type", sa.Text(), nullable=False),
+        sa.Column("severity_level", sa.Text(), nullable=False),
+        sa.Column(
+            "keywords_detected",
+            sa.dialects.postgresql.ARRAY(sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+        sa.Column(
+            "resources_shown",
+            sa.dialects.postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column("user_acknowledged", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("followup_required", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.Column("resolution_timestamp", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["message_id"], ["conversations.id"], ondelete="CASCADE"),
+        sa.CheckConstraint(
+            "severity_level IN ('low', 'moderate', 'high', 'critical')",
+            name="crisis_events_severity_level_chk",
+        ),
+    )
+    op.create_index(
+        "ix_crisis_events_user_id_severity", "crisis_events", ["user_id", "severity_level"]
+    )
+    op.create_index(
+        "ix_crisis_events_open_by_severity",
+        "crisis_events",
+        [sa.text(f"({SEVERITY_ORDER_SQL})"), "created_at", "id"],
+        postgresql_where=sa.text("resolution_timestamp IS NULL"),
+    )
+    op.create_index(
+        "ix_crisis_events_unacknowledged",
+        "crisis_events",
+        ["created_at", "id"],
+        postgresql_where=sa.text("NOT user_acknowledged"),
+    )
+
+    op.execute("ALTER TABLE public.crisis_events ENABLE ROW LEVEL SECURITY")
+    op.execute(
+        """
+        CREATE POLICY "Users can view their own crisis events" ON public.crisis_events
+            FOR SELECT
+            USING (auth.uid() = user_id);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        'DROP POLICY IF EXISTS "Users can view their own crisis events" ON public.crisis_events'
+    )
+    op.drop_index("ix_crisis_events_unacknowledged", table_name="crisis_events")
+    op.drop_index("ix_crisis_events_open_by_severity", table_name="crisis_events")
+    op.drop_index("ix_crisis_events_user_id_severity", table_name="crisis_events")
+    op.drop_table("crisis_events")
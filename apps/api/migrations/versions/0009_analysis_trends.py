@@ -0,0 +1,61 @@
+"""Per-user ChAT score trend aggregates.
+
+`analysis_trends` keeps one row per user with the count, first and last
+result times, the latest scores of the trend window, an EWMA and the sums
+behind a least-squares slope. `AnalysisService.create_result` updates the row
+with a single upsert, so trend and graduation reads no longer load a user's
+whole `analysis_results` history.
+
+The table starts empty; fill it from existing results with
+`python -m app.tasks.trends` after upgrading.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009_analysis_trends"
+down_revision: str | None = "0008_crisis_events"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_trends",
+        sa.Column("user_id", sa.dialects.postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("analysis_count", sa.Integer(), nullable=False),
+        sa.Column("first_seen", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_seen", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "recent_scores", sa.dialects.postgresql.ARRAY(sa.Integer()), nullable=False
+        ),
+        sa.Column("ewma", sa.Float(), nullable=False),
+        sa.Column("sum_t", sa.Float(), nullable=False),
+        sa.Column("sum_tt", sa.Float(), nullable=False),
+        sa.Column("sum_score", sa.Float(), nullable=False),
+        sa.Column("sum_t_score", sa.Float(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+    )
+
+    op.execute("ALTER TABLE public.analysis_trends ENABLE ROW LEVEL SECURITY")
+    op.execute(
+        """
+        CREATE POLICY "Users can view their own trends" ON public.analysis_trends
+            FOR SELECT
+            USING (auth.uid() = user_id);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        'DROP POLICY IF EXISTS "Users can view their own trends" ON public.analysis_trends'
+    )
+    op.drop_table("analysis_trends")
@@ -0,0 +1,38 @@
+"""Progress checkpoints for resumable batch tasks.
+
+The nightly graduation job (`app.tasks.graduation`) walks every user in
+chunks. Each chunk's stage changes and the job's position in `task_checkpoints`
+are committed together, so a run that is interrupted resumes after the last
+applied chunk instead of starting over.
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0010_task_checkpoints"
+down_revision: str | None = "0009_analysis_trends"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_checkpoints",
+        sa.Column("name", sa.String(length=100), primary_key=True),
+        sa.Column("position", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("changed", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_checkpoints")
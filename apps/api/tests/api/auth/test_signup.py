@@ -1,9 +1,11 @@
 """Signup API tests."""
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
 
 from app.api.dependencies import get_user_service
 from app.main import create_app
+from app.models.user import User
 from app.services.user_service import UserService
 from app.utils.rate_limiter import RateLimiter
 
@@ -29,6 +31,7 @@ async def test_signup_flow(db_session):
         }
         response = await client.post("/api/v1/auth/signup", json=payload)
         assert response.status_code == 201
+        assert response.headers["X-DB-Queries"] == "2"
         body = response.json()
         assert body["user"]["email"] == payload["email"]
 
@@ -97,3 +100,37 @@ async def test_signup_rate_limit_enforced(db_session):
         assert response.status_code == 429
 
     app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_signup_is_committed_before_the_response_starts(committed_session):
+    """With the real session dependency, another connection sees the row by the time
+    the response status is sent."""
+
+    app = create_app()
+    app.state.signup_rate_limiter = RateLimiter(limit=10, window_seconds=60)
+    visible_at_response: list[bool] = []
+
+    async def observed_app(scope, receive, send):
+        async def observing_send(message):
+            if message["type"] == "http.response.start":
+                found = await committed_session.scalar(
+                    select(User.id).where(User.email == "committed@example.com")
+                )
+                visible_at_response.append(found is not None)
+            await send(message)
+
+        await app(scope, receive, observing_send)
+
+    transport = ASGITransport(app=observed_app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        payload = {
+            "email": "committed@example.com",
+            "password": "Password123",
+            "goals": None,
+            "stage": 1,
+        }
+        response = await client.post("/api/v1/auth/signup", json=payload)
+
+    assert response.status_code == 201
+    assert visible_at_response == [True]
@@ -0,0 +1,245 @@
+"""Chat send endpoint tests."""
+import asyncio
+import json
+import time
+from uuid import UUID
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.dependencies import get_chat_service, get_current_user_id
+from app.core.config import get_settings
+from app.main import create_app
+from app.repositories.conversation import ConversationRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.chat_service import ChatService
+from app.services.crisis_detection_service import CrisisDetectionService
+from app.services.integrations.claude import ClaudeClient
+from app.services.integrations.fakes.claude import create_fake_claude_app
+
+
+def _chat_app(db_session, *, crisis_detector=None, on_crisis=None, **fake_options):
+    llm = ClaudeClient(
+        httpx.AsyncClient(
+            transport=ASGITransport(app=create_fake_claude_app(**fake_options)),
+            base_url="http://fake-llm",
+        ),
+        model="fake-model",
+        max_tokens=64,
+    )
+    # Short-lived sessions joining the test's outer transaction on the same connection.
+    factory = async_sessionmaker(
+        bind=db_session.bind, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+    app = create_app()
+
+    async def override_chat_service():
+        return ChatService(factory, llm, crisis_detector=crisis_detector, on_crisis=on_crisis)
+
+    app.dependency_overrides[get_chat_service] = override_chat_service
+    return app
+
+
+async def _create_user(db_session, email: str):
+    signup = UserCreate(email=email, password="Password123")
+    return await UserRepository(db_session).create(signup, password_hash="hashed")
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_send_streams_reply_and_saves_both_messages(db_session):
+    user = await _create_user(db_session, "chat@example.com")
+    app = _chat_app(db_session)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/api/v1/chat/send",
+            json={"message": "I joined a climbing club"},
+            headers={"X-User-ID": str(user.id)},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "start" and names[-1] == "done"
+    assert set(names[1:-1]) == {"delta"} and len(names) > 3
+    reply = "".join(data["text"] for name, data in events if name == "delta")
+    assert reply == "You said: I joined a climbing club"
+    assert events[-1][1]["response"] == reply
+
+    messages = await ConversationRepository(db_session).list_for_user(user.id)
+    assert [(m.sender_type, m.message_text) for m in messages] == [
+        ("user", "I joined a climbing club"),
+        ("coach", reply),
+    ]
+    assert str(messages[0].id) == events[0][1]["message_id"]
+    assert str(messages[1].id) == events[-1][1]["message_id"]
+
+
+@pytest.mark.asyncio
+async def test_start_event_carries_crisis_resources(db_session):
+    user = await _create_user(db_session, "chat-crisis@example.com")
+    recorded = []
+    app = _chat_app(
+        db_session,
+        crisis_detector=CrisisDetectionService(),
+        on_crisis=lambda message, assessment: recorded.append((message.id, assessment.severity)),
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        flagged = await client.post(
+            "/api/v1/chat/send",
+            json={"message": "I don't want to live anymore"},
+            headers={"X-User-ID": str(user.id)},
+        )
+        ordinary = await client.post(
+            "/api/v1/chat/send", json={"message": "hello"}, headers={"X-User-ID": str(user.id)}
+        )
+
+    start = _parse_events(flagged.text)[0][1]
+    assert start["crisis_detected"] is True
+    assert start["severity"] == "high"
+    assert start["resources"][0]["contact"] == "988"
+    assert recorded == [(UUID(start["message_id"]), "high")]
+    ordinary_start = _parse_events(ordinary.text)[0][1]
+    assert ordinary_start["crisis_detected"] is False
+    assert "resources" not in ordinary_start
+
+
+@pytest.mark.asyncio
+async def test_model_failure_keeps_user_message_only(db_session):
+    user = await _create_user(db_session, "chat-fail@example.com")
+    app = _chat_app(db_session, fail_after_tokens=2)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/api/v1/chat/send", json={"message": "hello"}, headers={"X-User-ID": str(user.id)}
+        )
+        missing = await client.post(
+            "/api/v1/chat/send",
+            json={"message": "hello"},
+            headers={"X-User-ID": "00000000-0000-0000-0000-000000000000"},
+        )
+
+    assert [name for name, _ in _parse_events(response.text)] == [
+        "start", "delta", "delta", "error"
+    ]
+    messages = await ConversationRepository(db_session).list_for_user(user.id)
+    assert [m.sender_type for m in messages] == ["user"]
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_failure_saving_the_reply_ends_with_an_error_event(db_session, monkeypatch):
+    user = await _create_user(db_session, "chat-save-fail@example.com")
+    app = _chat_app(db_session)
+
+    async def failing_save(self, turn, reply_text):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(ChatService, "save_reply", failing_save)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/api/v1/chat/send", json={"message": "hello"}, headers={"X-User-ID": str(user.id)}
+        )
+
+    names = [name for name, _ in _parse_events(response.text)]
+    assert names[0] == "start" and names[-1] == "error" and "done" not in names
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("environment", ["production", "staging"])
+async def test_chat_is_not_served_outside_development(monkeypatch, environment):
+    monkeypatch.setenv("ENVIRONMENT", environment)
+    get_settings.cache_clear()
+    try:
+        app = create_app()
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.post(
+                "/api/v1/chat/send",
+                json={"message": "hello"},
+                headers={"X-User-ID": "00000000-0000-0000-0000-000000000000"},
+            )
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_header_identity_is_refused_outside_development(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    get_settings.cache_clear()
+    try:
+        with pytest.raises(HTTPException) as refused:
+            await get_current_user_id(UUID(int=1))
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+    assert refused.value.status_code == 401
+    assert await get_current_user_id(UUID(int=1)) == UUID(int=1)
+
+
+@pytest.mark.asyncio
+async def test_first_byte_does_not_wait_for_the_model(db_session):
+    user = await _create_user(db_session, "chat-ttfb@example.com")
+    app = _chat_app(db_session, first_token_delay=0.5)
+    body = json.dumps({"message": "hi"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/chat/send",
+        "raw_path": b"/api/v1/chat/send",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"x-user-id", str(user.id).encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    chunks: list[tuple[float, bytes]] = []
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    never = asyncio.Event()
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await never.wait()  # a client that stays connected
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append((time.perf_counter(), message["body"]))
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+
+    first_byte = chunks[0][0] - started
+    completed = chunks[-1][0] - started
+    assert chunks[0][1].startswith(b"event: start")
+    assert completed >= 0.5
+    assert first_byte < 0.25
@@ -0,0 +1,78 @@
+"""Metrics endpoint tests."""
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api import metrics as metrics_api
+from app.main import create_app
+from app.repositories.job import JobRepository
+from app.utils.rate_limiter import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests_and_subsystems(committed_session):
+    app = create_app()
+    limiter = RateLimiter(limit=1, window_seconds=60)
+    app.state.signup_rate_limiter = limiter
+    await limiter.allow("ip")
+    await limiter.allow("ip")
+    await JobRepository(committed_session).enqueue("metrics_job")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        assert (await client.get("/health")).status_code == 200
+        assert (await client.get("/missing")).status_code == 404
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    count = 'http_request_duration_seconds_count{method="GET",route="/health",status="200"} 1'
+    assert count in body
+    assert 'route="unmatched",status="404"' in body
+    assert 'http_requests_in_flight{method="GET"} 1' in body  # the scrape itself
+    assert 'rate_limit_decisions_total{scope="signup",decision="rejected"} 1' in body
+    assert "password_hash_pending 0" in body
+    assert 'job_queue_depth{name="metrics_job",state="ready"} 1' in body
+    assert 'metrics_collector_errors{collector="job_queue"} 0' in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_survive_an_unreachable_job_queue(monkeypatch):
+    class Unreachable:
+        async def __aenter__(self):
+            raise ConnectionRefusedError("database is down")
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(metrics_api, "get_session_factory", lambda: Unreachable)
+    app = create_app()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    body = response.text
+    assert 'metrics_collector_errors{collector="job_queue"} 1' in body
+    assert "job_queue_depth" not in body
+    assert "password_hash_pending 0" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_give_up_on_a_stalled_job_queue_query(monkeypatch):
+    async def stalled():
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(metrics_api, "_job_queue_stats", stalled)
+    monkeypatch.setattr(metrics_api, "JOB_QUEUE_TIMEOUT_SECONDS", 0.05)
+    app = create_app()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'metrics_collector_errors{collector="job_queue"} 1' in response.text
@@ -0,0 +1,50 @@
+"""Benchmark baseline comparison tests."""
+import pytest
+
+from benchmarks.results import BenchmarkResult, Comparison, compare, format_comparisons
+
+
+def _result(name: str, value: float, direction: str = "lower") -> BenchmarkResult:
+    unit = "ms" if direction == "lower" else "ops/s"
+    return BenchmarkResult(name=name, value=value, unit=unit, direction=direction)
+
+
+def _baseline(*results: BenchmarkResult) -> dict[str, BenchmarkResult]:
+    return {result.name: result for result in results}
+
+
+@pytest.mark.parametrize(
+    ("direction", "before", "after", "change", "regressed"),
+    [
+        ("lower", 10.0, 11.0, 0.10, False),  # exactly at the threshold
+        ("lower", 10.0, 11.5, 0.15, True),
+        ("lower", 10.0, 8.0, -0.20, False),
+        ("higher", 100.0, 80.0, 0.20, True),  # throughput falling is worse
+        ("higher", 100.0, 125.0, -0.25, False),
+    ],
+)
+def test_compare_applies_direction_and_threshold(direction, before, after, change, regressed):
+    [item] = compare(
+        [_result("case", after, direction)], _baseline(_result("case", before, direction)), 0.10
+    )
+
+    assert item.change == pytest.approx(change)
+    assert item.regressed is regressed
+
+
+def test_compare_reports_cases_from_only_one_run():
+    comparisons = compare(
+        [_result("kept", 5.0), _result("added", 1.0), _result("was_zero", 2.0)],
+        _baseline(_result("kept", 5.0), _result("removed", 3.0), _result("was_zero", 0.0)),
+        0.10,
+    )
+
+    assert comparisons == [
+        Comparison("kept", 5.0, 5.0, 0.0, False),
+        Comparison("added", None, 1.0, None, False),
+        Comparison("was_zero", 0.0, 2.0, None, False),
+        Comparison("removed", 3.0, None, None, False),
+    ]
+    table = format_comparisons(comparisons).splitlines()
+    assert table[2].endswith("only in current run")
+    assert table[4].endswith("only in baseline")
@@ -1,14 +1,22 @@
 """Shared pytest fixtures for the API package."""
-import asyncio
 import os
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
+from typing import Any
 
 import pytest
-from sqlalchemy.engine import make_url
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
+from app.core.instrumentation import (
+    QueryStats,
+    current_query_stats,
+    instrument_engine,
+    track_queries,
+)
 from app.models import Base
 
 
@@ -39,11 +47,71 @@ def _get_database_url() -> str:
     return os.path.expandvars(database_url)
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+_WORKER_BASE_URL: str | None = None
+_READ_WORKER_BASE_URL: str | None = None
+
+
+def _worker_url(url: str, worker: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(database=f"{parsed.database}_{worker}").render_as_string(
+        hide_password=False
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Under pytest-xdist give every worker its own PostgreSQL database.
+
+    ``gw0`` runs against ``<name>_gw0`` and so on. The databases are created on first use
+    and kept between runs, but their schema is dropped and rebuilt every session so it
+    always matches the current models.
+    """
+
+    global _WORKER_BASE_URL, _READ_WORKER_BASE_URL
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker:
+        return
+    database_url = _get_database_url()
+    if make_url(database_url).get_backend_name() == "postgresql":
+        _WORKER_BASE_URL = database_url
+        os.environ["DATABASE_URL"] = _worker_url(database_url, worker)
+    read_url = os.environ.get("TEST_DATABASE_READ_URL")
+    if read_url:
+        _READ_WORKER_BASE_URL = os.path.expandvars(read_url)
+        os.environ["TEST_DATABASE_READ_URL"] = _worker_url(_READ_WORKER_BASE_URL, worker)
+
+
+async def _create_database(maintenance_url: str, name: str | None) -> None:
+    engine = create_async_engine(
+        maintenance_url,
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT",
+        connect_args={"ssl": False},
+    )
+    try:
+        async with engine.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": name}
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{name}"'))
+    finally:
+        await engine.dispose()
+
+
+_SAVEPOINT_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def _uncount_savepoint(conn: Connection, cursor: Any, statement: str, *_: Any) -> None:
+    """Take ``db_session``'s SAVEPOINTs back out of the query counts.
+
+    Code under test runs its transactions as savepoints of the test's outer transaction;
+    the app issues none itself, so without this every count would be off by the
+    savepoints compared with production. Registered after the instrumentation listener.
+    """
+
+    stats = current_query_stats()
+    if stats is not None and statement.startswith(_SAVEPOINT_PREFIXES):
+        stats.statements -= 1
 
 
 @pytest.fixture(scope="session")
@@ -53,16 +121,19 @@ def _database_url() -> str:
 
 @pytest.fixture(scope="session")
 async def _engine(_database_url: str) -> AsyncIterator[tuple[AsyncEngine, str]]:
-    engine = create_async_engine(
-        _database_url,
-        future=True,
-        poolclass=NullPool,
-        execution_options={"isolation_level": "AUTOCOMMIT"},
-        connect_args={"ssl": False},
-    )
     backend = make_url(_database_url).get_backend_name()
+    if backend == "postgresql" and _WORKER_BASE_URL is not None:
+        await _create_database(_WORKER_BASE_URL, make_url(_database_url).database)
+
+    engine = create_async_engine(_database_url, future=True, connect_args={"ssl": False})
+    instrument_engine(engine)
+    event.listen(engine.sync_engine, "after_cursor_execute", _uncount_savepoint)
 
     async with engine.begin() as conn:
+        if _WORKER_BASE_URL is not None:
+            # Worker databases belong to the test run; drop whatever an older checkout left.
+            await conn.execute(text("DROP SCHEMA public CASCADE"))
+            await conn.execute(text("CREATE SCHEMA public"))
         await conn.run_sync(Base.metadata.create_all)
 
     try:
@@ -76,10 +147,38 @@ async def _engine(_database_url: str) -> AsyncIterator[tuple[AsyncEngine, str]]:
 
 @pytest.fixture()
 async def db_session(_engine: tuple[AsyncEngine, str]) -> AsyncIterator[AsyncSession]:
-    engine, backend = _engine
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    """Session inside an outer transaction that is rolled back after the test.
+
+    The connection comes from the shared pool. ``commit()`` and ``rollback()`` in code
+    under test only release or roll back a SAVEPOINT, so nothing is ever persisted and
+    no table cleanup is needed. Other connections cannot see the test's rows; tests that
+    need that use ``committed_session``.
+    """
 
-    async with session_factory() as session:
+    engine, _ = _engine
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await outer.rollback()
+
+
+@pytest.fixture()
+async def committed_session(_engine: tuple[AsyncEngine, str]) -> AsyncIterator[AsyncSession]:
+    """AUTOCOMMIT session whose writes are visible to other connections.
+
+    For workers, LISTEN/NOTIFY and anything else that opens its own connections through
+    ``committed_session.bind``. Every table is emptied afterwards.
+    """
+
+    engine, _ = _engine
+    autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with async_sessionmaker(autocommit, expire_on_commit=False)() as session:
         try:
             yield session
         finally:
@@ -89,3 +188,69 @@ async def db_session(_engine: tuple[AsyncEngine, str]) -> AsyncIterator[AsyncSes
     async with engine.begin() as conn:
         for table in reversed(Base.metadata.sorted_tables):
             await conn.execute(table.delete())
+
+
+@pytest.fixture()
+async def tx_session(
+    committed_session: AsyncSession, _database_url: str
+) -> AsyncIterator[AsyncSession]:
+    """Session with real transactions for tests of commit/rollback or server-side cursors.
+
+    Depends on ``committed_session`` for its table cleanup.
+    """
+
+    engine = create_async_engine(_database_url, poolclass=NullPool, connect_args={"ssl": False})
+    instrument_engine(engine)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture()
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """Session on a second database standing in for a read replica.
+
+    Set ``TEST_DATABASE_READ_URL`` to a separate, empty database to run replica routing tests.
+    """
+
+    read_url = os.environ.get("TEST_DATABASE_READ_URL")
+    if not read_url:
+        pytest.skip("TEST_DATABASE_READ_URL is not set")
+    if _READ_WORKER_BASE_URL is not None:
+        await _create_database(_READ_WORKER_BASE_URL, make_url(read_url).database)
+    engine = create_async_engine(
+        os.path.expandvars(read_url),
+        poolclass=NullPool,
+        execution_options={"isolation_level": "AUTOCOMMIT"},
+        connect_args={"ssl": False},
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+        async with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                await conn.execute(table.delete())
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture()
+def assert_max_queries() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """Fail the test if the block issues more than ``limit`` SQL statements.
+
+    Usage: ``with assert_max_queries(1) as stats: ...``; ``stats`` holds the final counts.
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        assert stats.statements <= limit, (
+            f"expected at most {limit} queries, ran {stats.statements}"
+        )
+
+    return _assert_max_queries
@@ -0,0 +1,141 @@
+"""Async LRU cache tests."""
+import asyncio
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import AsyncLRUCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(50)))
+
+    assert results == ["value"] * 50
+    assert loads == 1
+    assert await cache.get_or_load("k", load) == "value"
+    stats = cache.stats
+    assert (stats.misses, stats.coalesced, stats.hits) == (1, 49, 1)
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_evict_least_recently_used(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    cache = AsyncLRUCache(max_entries=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.peek("a") == 1
+    await cache.get_or_load("a", _fail)  # hit, makes "b" least recently used
+    cache.set("c", 3)
+
+    assert cache.peek("b") is None
+    assert cache.stats.evictions == 1
+
+    clock[0] += 11
+    assert cache.peek("a") is None
+    assert await cache.get_or_load("a", _constant(9)) == 9
+
+
+@pytest.mark.asyncio
+async def test_invalidation_discards_in_flight_load():
+    cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def stale_load():
+        await release.wait()
+        return "stale"
+
+    reader = asyncio.create_task(cache.get_or_load("k", stale_load))
+    await asyncio.sleep(0)
+    cache.invalidate("k")
+    release.set()
+
+    assert await reader == "stale"
+    assert cache.peek("k") is None
+    assert await cache.get_or_load("k", _constant("fresh")) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_load_is_retried_by_waiters():
+    cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+    started = asyncio.Event()
+
+    async def hanging_load():
+        started.set()
+        await asyncio.Event().wait()
+
+    leader = asyncio.create_task(cache.get_or_load("k", hanging_load))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_load("k", _constant("value")))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await waiter == "value"
+    assert cache.peek("k") == "value"
+    assert (cache.stats.misses, cache.stats.coalesced) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_load():
+    cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def slow_load():
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(cache.get_or_load("k", slow_load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("k", _fail))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    release.set()
+
+    assert await leader == "value"
+
+
+@pytest.mark.asyncio
+async def test_loader_errors_reach_every_waiter():
+    cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+
+    async def broken_load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        *(cache.get_or_load("k", broken_load) for _ in range(3)), return_exceptions=True
+    )
+    assert [type(result) for result in results] == [RuntimeError] * 3
+
+
+@pytest.mark.asyncio
+async def test_none_results_are_not_cached():
+    cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+
+    assert await cache.get_or_load("missing", _constant(None)) is None
+    assert await cache.get_or_load("missing", _constant("created")) == "created"
+
+
+def _constant(value):
+    async def load():
+        return value
+
+    return load
+
+
+async def _fail():
+    raise AssertionError("should have been served from cache")
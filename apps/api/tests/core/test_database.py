@@ -0,0 +1,88 @@
+"""Engine configuration and pool instrumentation tests."""
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.core.database import InstrumentedPool, engine_options
+
+
+def _settings(**overrides):
+    return get_settings().model_copy(update=overrides)
+
+
+def test_engine_options_follow_settings():
+    options = engine_options(
+        _settings(
+            database_url="postgresql+asyncpg://u:p@db/app",
+            db_pool_size=7,
+            db_max_overflow=3,
+            db_statement_cache_size=250,
+        )
+    )
+
+    assert options["poolclass"] is InstrumentedPool
+    assert (options["pool_size"], options["max_overflow"]) == (7, 3)
+    assert options["connect_args"]["prepared_statement_cache_size"] == 250
+    assert "prepared_statement_name_func" not in options["connect_args"]
+
+
+def test_pgbouncer_mode_disables_statement_cache():
+    options = engine_options(
+        _settings(database_url="postgresql+asyncpg://u:p@db/app", db_pgbouncer=True)
+    )
+
+    connect_args = options["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_non_asyncpg_urls_get_no_driver_arguments():
+    options = engine_options(_settings(database_url="sqlite+aiosqlite:///:memory:"))
+
+    assert "connect_args" not in options
+
+
+@pytest.mark.asyncio
+async def test_pool_records_overflow_and_timeouts(_database_url):
+    if not _database_url.startswith("postgresql"):
+        pytest.skip("requires PostgreSQL")
+    engine = create_async_engine(
+        _database_url,
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.2,
+        connect_args={"ssl": False},
+    )
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert (stats.checked_out, stats.overflow) == (2, 1)
+            assert stats.overflow_checkouts == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        assert stats.checkouts == 2
+        assert stats.timeouts == 1
+        assert stats.checked_out == 0
+        assert stats.max_checkout_wait_seconds < 0.2
+
+        await asyncio.gather(*(_select_one(engine) for _ in range(6)))
+        assert engine.pool.stats().checkouts == 8
+    finally:
+        await engine.dispose()
+
+
+async def _select_one(engine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT pg_sleep(0.01)"))
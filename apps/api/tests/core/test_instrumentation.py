@@ -0,0 +1,36 @@
+"""Query instrumentation tests."""
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.core.instrumentation import current_query_stats, track_queries
+
+
+@pytest.mark.asyncio
+async def test_counts_statements_rows_and_failures(db_session):
+    assert current_query_stats() is None
+    with track_queries() as stats:
+        await db_session.execute(text("SELECT 1 UNION ALL SELECT 2"))
+        with pytest.raises(exc.DBAPIError):
+            await db_session.execute(text("SELECT * FROM missing_table"))
+
+    assert stats.statements == 2
+    assert stats.rows == 2
+    assert stats.db_seconds > 0
+    assert current_query_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_count_separately(committed_session):
+    engine = committed_session.bind
+
+    async def run(queries: int) -> int:
+        with track_queries() as stats:
+            async with engine.connect() as conn:
+                for _ in range(queries):
+                    await conn.execute(text("SELECT 1"))
+                    await asyncio.sleep(0)
+        return stats.statements
+
+    assert await asyncio.gather(run(1), run(3), run(5)) == [1, 3, 5]
@@ -0,0 +1,131 @@
+"""Structured logging pipeline tests."""
+import json
+import logging
+import queue
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.logging import (
+    DebugSamplingFilter,
+    JsonFormatter,
+    StructuredQueueHandler,
+    TextFormatter,
+    bind_request_id,
+    configure_logging,
+    log_event,
+    request_id_var,
+)
+from app.main import create_app
+
+
+def _record(level: int, msg: str, args=None, **fields) -> logging.LogRecord:
+    record = logging.LogRecord("noria", level, __file__, 1, msg, args, None)
+    record.fields = fields
+    return record
+
+
+def test_json_formatter_includes_request_id_and_fields():
+    record = _record(logging.INFO, "signup_completed", user_id="u-1", elapsed_ms=12.5)
+    record.request_id = "req-1"
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "signup_completed"
+    assert payload["level"] == "INFO"
+    assert payload["request_id"] == "req-1"
+    assert (payload["user_id"], payload["elapsed_ms"]) == ("u-1", 12.5)
+
+
+def test_queued_exceptions_stay_structured():
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger = logging.getLogger("noria.test_queue")
+    handler = StructuredQueueHandler(records)
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        try:
+            raise ValueError("bad input")
+        except ValueError:
+            logger.exception("job_crashed %s", "sync")
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+
+    queued = records.get_nowait()
+    payload = json.loads(JsonFormatter().format(queued))
+    assert payload["message"] == "job_crashed sync"
+    assert payload["exc_info"].startswith("Traceback")
+    assert "ValueError: bad input" in payload["exc_info"]
+    assert "ValueError" in TextFormatter().format(queued)
+
+
+def test_uvicorn_loggers_go_through_the_queue():
+    access = logging.getLogger("uvicorn.access")
+    access.addHandler(logging.StreamHandler())
+    access.propagate = False
+
+    configure_logging()
+
+    assert access.handlers == [] and access.propagate
+    assert logging.getLogger("uvicorn.error").handlers == []
+
+
+def test_debug_sampling_keeps_requested_fraction_per_template():
+    sampler = DebugSamplingFilter(0.25)
+
+    kept = [sampler.filter(_record(logging.DEBUG, "cache_probe")) for _ in range(100)]
+    other = [sampler.filter(_record(logging.DEBUG, "pool_checkout")) for _ in range(8)]
+
+    assert sum(kept) == 25
+    assert sum(other) == 2
+    assert sampler.filter(_record(logging.WARNING, "cache_probe"))
+
+
+def test_debug_sampling_groups_formatted_records_by_template():
+    sampler = DebugSamplingFilter(0.5)
+
+    kept = [sampler.filter(_record(logging.DEBUG, "probe %s", args=(i,))) for i in range(10)]
+
+    assert sum(kept) == 5
+
+
+def test_debug_sampling_tracks_a_bounded_number_of_sites():
+    sampler = DebugSamplingFilter(0.5, max_sites=3)
+
+    for i in range(100):
+        sampler.filter(_record(logging.DEBUG, f"probe {i}"))
+
+    assert len(sampler._credit) == 3
+
+
+def test_log_event_carries_bound_request_id(caplog):
+    caplog.set_level(logging.INFO, logger="noria")
+    with bind_request_id("job-42"):
+        log_event("job_started", attempt=2)
+    assert request_id_var.get() is None
+
+    record = caplog.records[-1]
+    assert record.getMessage() == "job_started"
+    assert record.fields == {"attempt": 2}
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed_and_generated():
+    app = create_app()
+    seen: list[str | None] = []
+
+    @app.get("/probe")
+    async def probe() -> dict[str, str]:
+        seen.append(request_id_var.get())
+        return {}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        supplied = await client.get("/probe", headers={"X-Request-ID": "abc123"})
+        generated = await client.get("/probe")
+
+    assert supplied.headers["x-request-id"] == "abc123"
+    assert seen[0] == "abc123"
+    assert generated.headers["x-request-id"] == seen[1]
+    assert len(seen[1]) == 32
@@ -0,0 +1,44 @@
+"""Metrics registry and exposition format tests."""
+import pytest
+
+from app.core.metrics import MetricFamily, MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/a")
+
+    text = await registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/a"} 4' in text
+    assert 'latency_seconds_sum{route="/a"} 3.65' in text
+
+
+@pytest.mark.asyncio
+async def test_gauges_counters_and_collectors():
+    registry = MetricsRegistry()
+    in_flight = registry.gauge("in_flight", "In flight.")
+    errors = registry.counter("errors_total", "Errors.", ("kind",))
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    errors.inc('say "hi"')
+
+    async def collect():
+        return [MetricFamily("depth", "gauge", "Depth.").add(7)]
+
+    registry.add_collector(collect)
+    text = await registry.render()
+
+    assert "in_flight 1" in text
+    assert 'errors_total{kind="say \\"hi\\""} 1' in text
+    assert "depth 7" in text
+    with pytest.raises(ValueError):
+        registry.gauge("in_flight", "Duplicate.")
@@ -0,0 +1,65 @@
+"""Password hashing pool tests."""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import (
+    HashingPool,
+    PasswordHasherBusyError,
+    hash_password_async,
+    verify_password_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_round_trip():
+    hashed = await hash_password_async("Password123")
+
+    assert await verify_password_async("Password123", hashed)
+    assert not await verify_password_async("Password124", hashed)
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_saturated():
+    pool = HashingPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    blocked = asyncio.create_task(pool.run(release.wait, 5))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusyError):
+        await pool.run(str, "second")
+
+    release.set()
+    assert await blocked is True
+    assert pool.stats.rejected == 1
+    assert pool.stats.completed == 1
+    assert pool.stats.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_its_slot_until_the_hash_finishes():
+    pool = HashingPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    caller = asyncio.create_task(pool.run(release.wait, 5))
+    await asyncio.sleep(0)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    # The thread is still hashing, so the pool is still full.
+    assert pool.stats.pending == 1
+    with pytest.raises(PasswordHasherBusyError):
+        await pool.run(str, "second")
+
+    release.set()
+    for _ in range(100):
+        if pool.stats.pending == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert pool.stats.pending == 0
+    assert await pool.run(str, "third") == "third"
+    pool.shutdown()
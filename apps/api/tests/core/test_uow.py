@@ -0,0 +1,70 @@
+"""Unit-of-work tests."""
+import pytest
+from sqlalchemy import event
+
+from app.core.uow import UnitOfWorkRollbackError, in_unit_of_work, unit_of_work
+from app.repositories.conversation import ConversationRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once(tx_session):
+    commits: list[object] = []
+
+    def _record(session) -> None:
+        commits.append(session)
+
+    event.listen(tx_session.sync_session, "after_commit", _record)
+
+    async with unit_of_work(tx_session):
+        async with unit_of_work(tx_session):
+            user = await UserRepository(tx_session).create(
+                UserCreate(email="uow@example.com", password="Password123"), "hashed"
+            )
+        conversations = ConversationRepository(tx_session)
+        await conversations.create(user.id, "Hello", "user")
+        await conversations.create(user.id, "Hi there", "coach")
+        assert commits == []
+
+    event.remove(tx_session.sync_session, "after_commit", _record)
+    assert len(commits) == 1
+    assert not in_unit_of_work(tx_session)
+    assert len(await conversations.list_for_user(user.id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(tx_session):
+    repo = UserRepository(tx_session)
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(tx_session):
+            signup = UserCreate(email="rollback@example.com", password="Password123")
+            await repo.create(signup, "hashed")
+            raise RuntimeError("boom")
+
+    assert await repo.get_by_email("rollback@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_swallowed_inner_failure_rolls_back_the_outer_unit_of_work(tx_session):
+    repo = UserRepository(tx_session)
+
+    with pytest.raises(UnitOfWorkRollbackError):
+        async with unit_of_work(tx_session):
+            await repo.create(UserCreate(email="outer@example.com", password="Password123"), "x")
+            try:
+                async with unit_of_work(tx_session):
+                    signup = UserCreate(email="inner@example.com", password="Password123")
+                    await repo.create(signup, "hashed")
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+
+    assert not in_unit_of_work(tx_session)
+    assert await repo.get_by_email("inner@example.com") is None
+    assert await repo.get_by_email("outer@example.com") is None
+
+    async with unit_of_work(tx_session):  # the failure does not leak into the next one
+        await repo.create(UserCreate(email="next@example.com", password="Password123"), "x")
+    assert await repo.get_by_email("next@example.com") is not None
@@ -1,7 +1,7 @@
 """Conversation repository tests."""
 import pytest
 
-from app.repositories.conversation import ConversationRepository
+from app.repositories.conversation import AnalysisMessage, ConversationRepository, MessageCursor
 from app.repositories.user import UserRepository
 from app.schemas.user import UserCreate
 
@@ -39,3 +39,48 @@ async def test_update_and_delete_conversation(db_session):
 
     await repo.delete(message.id)
     assert await repo.get(message.id) is None
+
+
+@pytest.mark.asyncio
+async def test_list_for_user_keyset_pages(tx_session):
+    user_repo = UserRepository(tx_session)
+    user = await user_repo.create(
+        UserCreate(email="conv-pages@example.com", password="Password123"), password_hash="hashed"
+    )
+    repo = ConversationRepository(tx_session)
+    for index in range(5):
+        await repo.create(user.id, f"message {index}", "user")
+
+    first = await repo.list_for_user(user.id, limit=2)
+    assert [m.message_text for m in first] == ["message 0", "message 1"]
+
+    second = await repo.list_for_user(user.id, limit=2, after=MessageCursor.of(first[-1]))
+    assert [m.message_text for m in second] == ["message 2", "message 3"]
+
+    older = await repo.list_for_user(user.id, limit=2, before=MessageCursor.of(second[-1]))
+    assert [m.message_text for m in older] == ["message 1", "message 2"]
+
+    streamed = [m.message_text async for m in repo.stream_for_user(user.id, batch_size=2)]
+    assert streamed == [f"message {index}" for index in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_get_messages_for_analysis_returns_latest_rows(db_session, assert_max_queries):
+    user_repo = UserRepository(db_session)
+    user = await user_repo.create(
+        UserCreate(email="conv-analysis@example.com", password="Password123"),
+        password_hash="hashed",
+    )
+    repo = ConversationRepository(db_session)
+    for index in range(4):
+        await repo.create(user.id, f"question {index}", "user")
+        await repo.create(user.id, f"answer {index}", "coach")
+
+    with assert_max_queries(1) as stats:
+        latest = await repo.get_messages_for_analysis(user.id, 3)
+    assert stats.rows == 3
+    assert [m.message_text for m in latest] == ["answer 2", "question 3", "answer 3"]
+
+    own = await repo.get_messages_for_analysis(user.id, 2, sender_types=["user"])
+    assert [m.message_text for m in own] == ["question 2", "question 3"]
+    assert all(isinstance(m, AnalysisMessage) for m in own)
@@ -0,0 +1,91 @@
+"""Crisis event repository tests."""
+import pytest
+from sqlalchemy import text
+
+from app.repositories.conversation import ConversationRepository
+from app.repositories.crisis_event import (
+    CrisisEventRepository,
+    NewCrisisEvent,
+    ReviewCursor,
+    review_queue_query,
+    unacknowledged_query,
+)
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+
+
+async def _messages(db_session, count: int):
+    user = await UserRepository(db_session).create(
+        UserCreate(email="crisis-repo@example.com", password="Password123"), "hashed"
+    )
+    conversations = ConversationRepository(db_session)
+    return [await conversations.create(user.id, f"message {i}", "user") for i in range(count)]
+
+
+def _event(message, severity: str) -> NewCrisisEvent:
+    return NewCrisisEvent(
+        message.user_id,
+        message.id,
+        "suicide_ideation",
+        severity,
+        ("want to die",),
+        ({"type": "hotline", "contact": "988"},),
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_many_writes_one_multi_row_insert(db_session, assert_max_queries):
+    messages = await _messages(db_session, 3)
+    repo = CrisisEventRepository(db_session)
+
+    with assert_max_queries(1):
+        assert await repo.add_many([_event(m, "high") for m in messages]) == 3
+
+    [event, *_] = await repo.list_for_user(messages[0].user_id)
+    assert event.keywords_detected == ["want to die"]
+    assert event.resources_shown == [{"type": "hotline", "contact": "988"}]
+    assert event.user_acknowledged is False and event.resolution_timestamp is None
+
+
+@pytest.mark.asyncio
+async def test_review_queue_orders_by_severity_then_age_and_pages(db_session):
+    messages = await _messages(db_session, 5)
+    repo = CrisisEventRepository(db_session)
+    severities = ["low", "critical", "moderate", "critical", "high"]
+    for message, severity in zip(messages, severities, strict=True):
+        await repo.add_many([_event(message, severity)])
+
+    queue = await repo.review_queue()
+    assert [e.severity_level for e in queue] == ["critical", "critical", "high", "moderate", "low"]
+    assert [e.message_id for e in queue[:2]] == [messages[1].id, messages[3].id]
+
+    first = await repo.review_queue(limit=2)
+    rest = await repo.review_queue(after=ReviewCursor.of(first[-1]))
+    assert [e.id for e in first + list(rest)] == [e.id for e in queue]
+
+    urgent = await repo.review_queue(min_severity="high")
+    assert [e.severity_level for e in urgent] == ["critical", "critical", "high"]
+
+    assert await repo.resolve(queue[0].id, followup_required=True)
+    assert await repo.acknowledge(queue[1].id)
+    assert queue[0].id not in [e.id for e in await repo.review_queue()]
+    unacknowledged = await repo.unacknowledged()
+    assert queue[1].id not in [e.id for e in unacknowledged]
+    assert [e.created_at for e in unacknowledged] == sorted(e.created_at for e in unacknowledged)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("query", "index"),
+    [
+        (review_queue_query(limit=50, min_severity="high"), "ix_crisis_events_open_by_severity"),
+        (unacknowledged_query(limit=50), "ix_crisis_events_unacknowledged"),
+    ],
+)
+async def test_review_queries_read_their_partial_index_in_order(db_session, query, index):
+    sql = query.compile(dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True})
+    await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = (await db_session.execute(text(f"EXPLAIN {sql}"))).scalars().all()
+
+    assert any(index in line for line in plan), plan
+    assert not any("Sort" in line for line in plan), plan
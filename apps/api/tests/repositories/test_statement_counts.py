@@ -0,0 +1,46 @@
+"""Guard the number of SQL statements each repository write issues."""
+import pytest
+
+from app.repositories.analysis import AnalysisRepository
+from app.repositories.conversation import ConversationRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+
+
+@pytest.mark.asyncio
+async def test_user_writes_use_single_statement(db_session, assert_max_queries):
+    repo = UserRepository(db_session)
+
+    with assert_max_queries(1):
+        user = await repo.create(
+            UserCreate(email="count@example.com", password="Password123"), "hashed"
+        )
+    assert user.created_at is not None
+
+    with assert_max_queries(1):
+        updated = await repo.update(user.id, stage=2)
+    assert updated is not None and updated.stage == 2
+
+    with assert_max_queries(1):
+        await repo.delete(user.id)
+
+
+@pytest.mark.asyncio
+async def test_conversation_and_analysis_writes_use_single_statement(
+    db_session, assert_max_queries
+):
+    user = await UserRepository(db_session).create(
+        UserCreate(email="count-chat@example.com", password="Password123"), "hashed"
+    )
+    conversations = ConversationRepository(db_session)
+    analyses = AnalysisRepository(db_session)
+
+    with assert_max_queries(3):
+        message = await conversations.create(user.id, "Hello", "user")
+        await conversations.update(message.id, message_text="Edited")
+        await conversations.delete(message.id)
+
+    with assert_max_queries(3):
+        result = await analyses.create(user.id, chat_score=9)
+        await analyses.update(result.id, chat_score=10)
+        await analyses.delete(result.id)
@@ -0,0 +1,61 @@
+"""Message counter trigger tests, against the schema migration 0004 builds."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import func, select, text
+
+from app.models.job import Job
+from app.models.user_message_stats import UserMessageStats
+from app.repositories.conversation import ConversationRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+
+COUNTER_MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / "migrations"
+    / "versions"
+    / "0004_user_message_counter.py"
+)
+
+
+def _upgrade(connection) -> None:
+    """Replace the ``create_all`` table with the migration's, trigger included."""
+
+    # The trigger inserts into job_queue without an ID; 0001 gives it a server default.
+    connection.execute(text("ALTER TABLE job_queue ALTER COLUMN id SET DEFAULT gen_random_uuid()"))
+    spec = importlib.util.spec_from_file_location("user_message_counter", COUNTER_MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    UserMessageStats.__table__.drop(connection)
+    with Operations.context(MigrationContext.configure(connection)):
+        module.upgrade()
+
+
+@pytest.mark.asyncio
+async def test_user_messages_bump_the_counter_and_queue_analysis(db_session):
+    # DDL is transactional in PostgreSQL, so the test's outer rollback undoes it.
+    await (await db_session.connection()).run_sync(_upgrade)
+    signup = UserCreate(email="counter@example.com", password="Password123")
+    user = await UserRepository(db_session).create(signup, password_hash="hashed")
+    repo = ConversationRepository(db_session)
+
+    for i in range(24):
+        await repo.create(user.id, f"message {i}", "user")
+        await repo.create(user.id, f"reply {i}", "coach")
+    await repo.create(user.id, "Welcome back", "system")
+
+    assert await db_session.scalar(
+        select(UserMessageStats.user_message_count).where(UserMessageStats.user_id == user.id)
+    ) == 24
+    analysis_jobs = select(func.count()).select_from(Job).where(Job.name == "analysis_job")
+    assert await db_session.scalar(analysis_jobs) == 0
+
+    await repo.create(user.id, "message 24", "user")
+
+    stats = await db_session.get(UserMessageStats, user.id, populate_existing=True)
+    assert stats.user_message_count == 25
+    assert await db_session.scalar(analysis_jobs) == 1
+    assert (await db_session.scalar(select(Job.data))) == {"user_id": str(user.id)}
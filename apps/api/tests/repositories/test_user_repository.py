@@ -1,7 +1,14 @@
 """Repository tests for user persistence."""
+import asyncio
+from uuid import UUID
+
 import pytest
+from sqlalchemy import select, text
 
-from app.repositories.user import UserRepository
+from app.core.cache import USER_CACHE_CHANNEL, AsyncLRUCache, CacheInvalidationListener
+from app.core.uow import unit_of_work
+from app.models.user import User
+from app.repositories.user import StageChange, UserRepository
 from app.schemas.user import UserCreate
 
 
@@ -59,3 +66,171 @@ async def test_delete_user(db_session):
     await repo.delete(created.id)
     remaining = await repo.get(created.id)
     assert remaining is None
+
+
+@pytest.mark.asyncio
+async def test_create_if_absent_skips_existing_email(db_session):
+    repo = UserRepository(db_session)
+    payload = UserCreate(email="absent@example.com", password="Password123")
+
+    created = await repo.create_if_absent(payload, password_hash="hashed")
+    assert created is not None
+    assert created.email == payload.email
+    assert await repo.email_exists(payload.email)
+
+    duplicate = await repo.create_if_absent(payload, password_hash="other")
+    assert duplicate is None
+    existing = await repo.get_by_email(payload.email)
+    assert existing is not None
+    assert existing.password_hash == "hashed"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_cache_is_invalidated_by_writes(db_session):
+    cache = AsyncLRUCache(max_entries=100, ttl_seconds=60)
+    repo = UserRepository(db_session, cache=cache)
+    user = await repo.create(
+        UserCreate(email="cached@example.com", password="Password123"), password_hash="hashed"
+    )
+
+    first = await repo.get_snapshot(user.id)
+    assert await repo.get_snapshot_by_email("cached@example.com") is first
+    assert cache.stats.hits == 1
+    with pytest.raises(AttributeError):
+        first.stage = 3
+
+    await repo.update(user.id, stage=3, email="moved@example.com")
+    assert (await repo.get_snapshot(user.id)).stage == 3
+    assert await repo.get_snapshot_by_email("cached@example.com") is None
+    assert (await repo.get_snapshot_by_email("moved@example.com")).id == user.id
+
+    await repo.delete(user.id)
+    assert await repo.get_snapshot(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_writes_never_reach_the_cache(tx_session):
+    cache = AsyncLRUCache(max_entries=100, ttl_seconds=60)
+    repo = UserRepository(tx_session, cache=cache)
+    user_id = (
+        await repo.create(
+            UserCreate(email="rolled-back@example.com", password="Password123"), "hashed"
+        )
+    ).id
+    assert (await repo.get_snapshot(user_id)).stage == 1
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(tx_session):
+            await repo.update(user_id, stage=4)
+            # The transaction reads its own write, but does not cache it for everyone else.
+            assert (await repo.get_snapshot(user_id)).stage == 4
+            assert (await repo.get_snapshot_by_email("rolled-back@example.com")).stage == 4
+            assert cache.peek(user_id) is None
+            raise RuntimeError("rolled back")
+
+    assert cache.peek(user_id) is None
+    assert (await repo.get_snapshot(user_id)).stage == 1
+    assert cache.peek(user_id).stage == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("writer_has_cache", [True, False])
+async def test_broadcast_invalidation_reaches_listener(committed_session, writer_has_cache):
+    if committed_session.get_bind().dialect.name != "postgresql":
+        pytest.skip("requires PostgreSQL LISTEN/NOTIFY")
+    user = await UserRepository(committed_session).create(
+        UserCreate(email="notify@example.com", password="Password123"), password_hash="hashed"
+    )
+    other_process_cache = AsyncLRUCache(max_entries=100, ttl_seconds=60)
+    await UserRepository(committed_session, cache=other_process_cache).get_snapshot(user.id)
+    listener = CacheInvalidationListener(
+        committed_session.bind, other_process_cache, USER_CACHE_CHANNEL, UUID
+    )
+    await listener.start()
+    try:
+        writer_cache = AsyncLRUCache(max_entries=100, ttl_seconds=60) if writer_has_cache else None
+        writer = UserRepository(committed_session, cache=writer_cache, broadcast=True)
+        await writer.update(user.id, stage=2)
+        for _ in range(100):
+            if other_process_cache.peek(user.id) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert other_process_cache.peek(user.id) is None
+    finally:
+        await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_listener_reconnects_and_clears_the_cache(committed_session):
+    if committed_session.get_bind().dialect.name != "postgresql":
+        pytest.skip("requires PostgreSQL LISTEN/NOTIFY")
+    user = await UserRepository(committed_session).create(
+        UserCreate(email="reconnect@example.com", password="Password123"), password_hash="hashed"
+    )
+    cache = AsyncLRUCache(max_entries=100, ttl_seconds=60)
+    reader = UserRepository(committed_session, cache=cache)
+    listener = CacheInvalidationListener(committed_session.bind, cache, USER_CACHE_CHANNEL, UUID)
+    await listener.start()
+    try:
+        await reader.get_snapshot(user.id)
+        terminated = await committed_session.scalar(
+            text(
+                "SELECT count(pg_terminate_backend(pid)) FROM pg_stat_activity"
+                " WHERE datname = current_database()"
+                f" AND query LIKE 'LISTEN%{USER_CACHE_CHANNEL}%'"
+            )
+        )
+        assert terminated == 1
+
+        # Invalidations sent while disconnected are lost, so reconnecting clears everything.
+        await _until(lambda: cache.peek(user.id) is None)
+        await reader.get_snapshot(user.id)
+        await UserRepository(committed_session, broadcast=True).update(user.id, stage=2)
+        await _until(lambda: cache.peek(user.id) is None)
+    finally:
+        await listener.close()
+
+
+async def _until(condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    assert condition()
+
+
+@pytest.mark.asyncio
+async def test_bulk_stage_changes_skip_moved_users_and_broadcast(committed_session):
+    if committed_session.get_bind().dialect.name != "postgresql":
+        pytest.skip("requires PostgreSQL LISTEN/NOTIFY")
+    repo = UserRepository(committed_session)
+    users = [
+        await repo.create(
+            UserCreate(email=f"bulk-stage-{i}@example.com", password="Password123", stage=stage),
+            password_hash="hashed",
+        )
+        for i, stage in enumerate([1, 1, 2])
+    ]
+    other_process_cache = AsyncLRUCache(max_entries=100, ttl_seconds=60)
+    for user in users:
+        await UserRepository(committed_session, cache=other_process_cache).get_snapshot(user.id)
+    listener = CacheInvalidationListener(
+        committed_session.bind, other_process_cache, USER_CACHE_CHANNEL, UUID
+    )
+    await listener.start()
+    try:
+        # A batch job has no cache of its own but still notifies the API processes.
+        writer = UserRepository(committed_session, broadcast=True)
+        changed = await writer.apply_stage_changes([StageChange(u.id, 1, 2) for u in users])
+        assert sorted(changed) == sorted(u.id for u in users[:2])
+        for _ in range(100):
+            if all(other_process_cache.peek(u.id) is None for u in users[:2]):
+                break
+            await asyncio.sleep(0.01)
+        assert [other_process_cache.peek(u.id) is None for u in users] == [True, True, False]
+    finally:
+        await listener.close()
+    result = await committed_session.execute(
+        select(User.stage).where(User.id.in_([u.id for u in users])).order_by(User.email)
+    )
+    assert result.scalars().all() == [2, 2, 2]
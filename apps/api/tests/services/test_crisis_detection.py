@@ -0,0 +1,244 @@
+"""Crisis detection tests: normalization, false positives, severity and hot reload."""
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.core.uow import unit_of_work
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.conversation_service import ConversationService
+from app.services.crisis_detection_service import CrisisDetectionService, normalize
+
+CRISIS_MESSAGES = [
+    "I want to kill myself",
+    "honestly i just wanna die",
+    "I've been cutting myself again",
+    "Sometimes I think everyone would be better off without me",
+    "I have nothing to live for anymore",
+    "I'm going to take all my pills tonight",
+    "my dad hits me when he drinks, I'm scared to go home",
+    "I've been starving myself for a week",
+    "I can't go on like this",
+    "I feel so worthless and hopeless",
+]
+
+# Everyday messages, several using crisis words figuratively.
+BENIGN_MESSAGES = [
+    "I'm killing it at my new job!",
+    "I'm dying to try that new ramen place",
+    "That movie was to die for",
+    "We played cards to kill time before the bus came",
+    "Honestly, it beats me why she left the party early",
+    "I was dead tired after the hike",
+    "I nearly died laughing at his story",
+    "Overdosed on coffee before the exam, lol",
+    "I cut myself a slice of cake and felt better",
+    "Did you see the new Suicide Squad trailer?",
+    "I went to the coffee shop and talked to someone from my class",
+    "My skills are improving, I introduced myself to three people",
+    "The killer whale documentary was amazing",
+    "I'm a bit nervous about the party on Saturday",
+    "I hurt myself laughing at that meme",
+    "Can you help me start a conversation at the gym?",
+    "My therapist says I'm making progress",
+    "I dyed my hair blue yesterday",
+    "The die in the board game kept rolling sixes",
+    "I'm so excited, I could scream",
+]
+
+# Written independently of the lexicon's benign list: ordinary coaching check-ins,
+# negated statements and crisis words used as topics rather than feelings.
+EVERYDAY_MESSAGES = [
+    "I am not suicidal at all, just tired after a long week",
+    "We talked about suicide prevention in my psychology class",
+    "I can't go on the trip with my friends this weekend",
+    "I can't go on a date until my exams are over",
+    "I'm not really depressed anymore, the walks are helping",
+    "Never been so nervous before a presentation",
+    "My roommate and I finally talked about the dishes",
+    "I said hi to my neighbour and we chatted for ten minutes",
+    "Work was stressful but I managed to leave on time",
+    "I keep replaying what I said at lunch, was it weird?",
+    "The gym was packed so I went for a run instead",
+    "I signed up for a pottery class on Thursdays",
+    "My boss beat me to the punchline again",
+    "I binge watched a whole series and skipped the party",
+    "The new guy at work asked me to join their team for trivia",
+    "I'm worried my friends find me boring",
+    "Today I made eye contact with the cashier and smiled",
+    "I'd love some tips on keeping a conversation going",
+    "Traffic was murder this morning",
+    "We did a fundraiser walk for suicide awareness week",
+    "The news had a story about rising suicide rates among teens",
+    "I had pizza for dinner and watched a horror movie",
+    "My cat knocked my phone off the table again",
+    "I'm anxious about calling the dentist",
+    "I finally asked a question in the team meeting",
+    "She said my joke killed, I was so happy",
+    "I stayed home because it was raining all day",
+    "I'm a little homesick since moving to the city",
+    "The hike wore me out but the view was worth it",
+    "Can we practise small talk for my cousin's wedding?",
+]
+
+
+@pytest.fixture(scope="module")
+def detector() -> CrisisDetectionService:
+    return CrisisDetectionService()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I want to KILL MYSELF",
+        "i want to k i l l myself",
+        "i want to k.i.l.l myself",
+        "i want to k1ll mys3lf",
+        "i want to kiiiilllll myselfff",
+        "i want to ｋｉｌｌ ｍｙｓｅｌｆ",  # fullwidth
+        "i want to k\u0456ll myself",  # Cyrillic i
+        "i want to ki\u200bll my\u00adself",  # zero-width space, soft hyphen
+        "i want to kíll mysélf",
+        "I want to kill...myself",
+    ],
+)
+def test_obfuscated_phrases_are_normalized_and_detected(detector, text):
+    assessment = detector.assess(text)
+
+    assert assessment.detected
+    assert assessment.keywords == ("kill myself",)
+
+
+def test_normalize_folds_to_plain_words():
+    assert normalize("  I'm  SOOO   dóne!!! ") == "im so done"
+    assert normalize("a b c d then") == "abcd then"
+    assert normalize("I am a b") == "i am a b"
+
+
+def test_crisis_corpus_is_flagged_and_benign_corpus_is_not(detector):
+    missed = [text for text in CRISIS_MESSAGES if not detector.assess(text).detected]
+    flagged = [text for text in BENIGN_MESSAGES if detector.assess(text).detected]
+
+    assert missed == []
+    assert flagged == []  # well under the 10% false-positive budget
+
+
+def test_everyday_corpus_is_not_flagged(detector):
+    flagged = [text for text in EVERYDAY_MESSAGES if detector.assess(text).detected]
+
+    assert flagged == []
+
+
+@pytest.mark.parametrize(
+    ("text", "severity"),
+    [
+        ("I am not suicidal at all", None),
+        ("I'm not really suicidal", None),
+        ("we talked about suicide prevention", None),
+        ("I can't go on the trip", None),
+        ("I feel suicidal", "high"),
+        ("I can't go on like this", "moderate"),
+        ("I'm not okay, I want to die", "high"),  # the negation is not next to the match
+        ("I'm not suicidal but I want to die", "high"),
+        ("I'm not going to kill myself", "critical"),  # critical matches are never negated
+    ],
+)
+def test_negations_and_contexts_suppress_matches(detector, text, severity):
+    assert detector.assess(text).severity == severity
+
+
+def test_severity_is_the_highest_match(detector):
+    assessment = detector.assess("I feel hopeless and I want to end my life")
+
+    assert assessment.severity == "critical"
+    assert assessment.trigger_type == "suicide_ideation"
+    assert set(assessment.keywords) == {"i feel hopeless", "end my life"}
+    assert assessment.resources and assessment.resources[0].contact == "988"
+    assert not detector.assess("I had a great day").detected
+
+
+def _write_lexicon(path, phrases, *, mtime_ns=None):
+    path.write_text(json.dumps({"version": 1, "patterns": {"self_harm": {"high": phrases}}}))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_reload_swaps_lexicon_and_keeps_old_one_when_invalid(tmp_path):
+    path = tmp_path / "lexicon.json"
+    _write_lexicon(path, ["hurt myself"], mtime_ns=1_000_000_000)
+    detector = CrisisDetectionService(path)
+    assert not detector.reload_if_changed()
+    assert not detector.assess("I want to scratch myself").detected
+
+    _write_lexicon(path, ["hurt myself", "scratch myself"], mtime_ns=2_000_000_000)
+    assert detector.reload_if_changed()
+    assert detector.assess("I want to scratch myself").detected
+
+    path.write_text('{"patterns": ')
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert not detector.reload_if_changed()
+    assert detector.assess("I want to scratch myself").detected
+
+
+@pytest.mark.asyncio
+async def test_watcher_picks_up_lexicon_changes(tmp_path):
+    path = tmp_path / "lexicon.json"
+    _write_lexicon(path, ["hurt myself"], mtime_ns=1_000_000_000)
+    detector = CrisisDetectionService(path)
+    detector.start_watcher(0.01)
+    try:
+        _write_lexicon(path, ["scratch myself"], mtime_ns=2_000_000_000)
+        for _ in range(100):
+            if detector.assess("scratch myself").detected:
+                break
+            await asyncio.sleep(0.01)
+        assert detector.assess("scratch myself").detected
+        assert not detector.assess("hurt myself").detected
+    finally:
+        await detector.stop_watcher()
+
+
+@pytest.mark.asyncio
+async def test_create_message_assesses_user_messages_only(db_session, detector, caplog):
+    signup = UserCreate(email="crisis@example.com", password="Password123")
+    user = await UserRepository(db_session).create(signup, password_hash="hashed")
+    flagged = []
+    service = ConversationService(
+        db_session,
+        crisis_detector=detector,
+        on_crisis=lambda message, assessment: flagged.append((message.id, assessment.severity)),
+    )
+
+    message = await service.create_message(user.id, "i want to end it all", "user")
+    await service.create_message(user.id, "It sounds like you want to end it all", "coach")
+    await service.create_message(user.id, "I had a good day", "user")
+
+    assert flagged == [(message.id, "critical")]
+    [record] = [r for r in caplog.records if r.getMessage() == "crisis_detected"]
+    assert record.fields["message_id"] == str(message.id)
+    assert "end it all" not in json.dumps(record.fields)
+
+
+@pytest.mark.asyncio
+async def test_on_crisis_waits_for_commit_and_skips_rolled_back_messages(db_session, detector):
+    signup = UserCreate(email="crisis-commit@example.com", password="Password123")
+    user_id = (await UserRepository(db_session).create(signup, password_hash="hashed")).id
+    flagged = []
+    service = ConversationService(
+        db_session,
+        crisis_detector=detector,
+        on_crisis=lambda message, assessment: flagged.append(message.message_text),
+    )
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(db_session):
+            await service.create_message(user_id, "i want to kill myself", "user")
+            assert flagged == []  # not committed yet
+            raise RuntimeError("rolled back")
+    async with unit_of_work(db_session):
+        await service.create_message(user_id, "i feel suicidal", "user")
+        assert flagged == []
+
+    assert flagged == ["i feel suicidal"]
@@ -0,0 +1,140 @@
+"""Crisis event log tests: batching, failure handling and flush on stop."""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.instrumentation import track_queries
+from app.models.crisis_event import CrisisEvent
+from app.repositories.conversation import ConversationRepository
+from app.repositories.crisis_event import NewCrisisEvent
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.crisis_detection_service import CrisisDetectionService
+from app.services.crisis_event_log import CrisisEventLog
+
+
+def _factory(db_session):
+    # Short-lived sessions joining the test's outer transaction on the same connection.
+    return async_sessionmaker(
+        bind=db_session.bind, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+
+
+async def _message(db_session):
+    user = await UserRepository(db_session).create(
+        UserCreate(email=f"crisis-log-{uuid.uuid4().hex[:8]}@example.com", password="Password123"),
+        "hashed",
+    )
+    return await ConversationRepository(db_session).create(user.id, "I want to die", "user")
+
+
+def _event(message) -> NewCrisisEvent:
+    return NewCrisisEvent(message.user_id, message.id, "suicide_ideation", "high")
+
+
+async def _count(db_session) -> int:
+    return (await db_session.execute(select(func.count()).select_from(CrisisEvent))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_one_insert_per_batch(db_session):
+    message = await _message(db_session)
+    log = CrisisEventLog(_factory(db_session), batch_size=100)
+    for _ in range(250):
+        log.append(_event(message))
+
+    with track_queries() as stats:
+        assert await log.flush() == 250
+
+    assert stats.statements == 3
+    assert await _count(db_session) == 250
+    assert (log.stats.pending, log.stats.written, log.stats.batches) == (0, 250, 3)
+
+
+@pytest.mark.asyncio
+async def test_record_keeps_assessment_details(db_session):
+    message = await _message(db_session)
+    log = CrisisEventLog(_factory(db_session))
+
+    log.record(message, CrisisDetectionService().assess("i want to end my life"))
+    await log.flush()
+
+    [event] = (await db_session.execute(select(CrisisEvent))).scalars().all()
+    assert (event.message_id, event.severity_level) == (message.id, "critical")
+    assert event.trigger_type == "suicide_ideation"
+    assert event.keywords_detected == ["end my life"]
+    assert event.resources_shown[0]["contact"] == "988"
+
+
+@pytest.mark.asyncio
+async def test_orphaned_event_does_not_block_its_batch(db_session):
+    message = await _message(db_session)
+    log = CrisisEventLog(_factory(db_session), batch_size=10)
+    log.append(_event(message))
+    log.append(NewCrisisEvent(message.user_id, uuid.uuid4(), "self_harm", "high"))
+    log.append(_event(message))
+
+    assert await log.flush() == 2
+    assert await _count(db_session) == 2
+    assert log.stats.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_events_for_the_next_attempt(db_session):
+    message = await _message(db_session)
+    factory = _factory(db_session)
+    database_down = True
+
+    def flaky_factory():
+        if database_down:
+            raise OperationalError("INSERT", {}, ConnectionRefusedError())
+        return factory()
+
+    log = CrisisEventLog(flaky_factory, batch_size=2)
+    for _ in range(3):
+        log.append(_event(message))
+
+    assert await log.flush() == 0
+    assert (log.stats.pending, log.stats.failures) == (3, 1)
+
+    database_down = False
+    assert await log.flush() == 3
+    assert log.stats.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_max_pending_drops_oldest(db_session):
+    message = await _message(db_session)
+    log = CrisisEventLog(_factory(db_session), batch_size=10, max_pending=2)
+    for _ in range(3):
+        log.append(_event(message))
+
+    assert (log.stats.pending, log.stats.dropped) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_background_flush_on_full_batch_and_on_stop(db_session):
+    message = await _message(db_session)
+    log = CrisisEventLog(_factory(db_session), batch_size=3)
+    log.start(flush_interval_seconds=60)
+    try:
+        for _ in range(3):
+            log.append(_event(message))
+        for _ in range(100):
+            if log.stats.written == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert log.stats.written == 3
+
+        log.append(_event(message))  # below the batch size: only written by stop()
+        await asyncio.sleep(0.05)
+        assert log.stats.pending == 1
+    finally:
+        await log.stop()
+
+    assert await _count(db_session) == 4
+    assert log.stats.pending == 0
@@ -0,0 +1,113 @@
+"""LLM client resilience tests against the fake Messages API."""
+import asyncio
+
+import httpx
+import pytest
+from httpx import ASGITransport
+
+from app.services.exceptions import LLMError, LLMUnavailableError
+from app.services.integrations.claude import ClaudeClient
+from app.services.integrations.fakes.claude import create_fake_claude_app
+from app.services.integrations.resilience import CircuitBreaker, TokenBucket
+from app.services.interfaces import ChatMessage
+
+HELLO = [ChatMessage("user", "hello")]
+
+
+def _client(fake, **options) -> ClaudeClient:
+    http = httpx.AsyncClient(transport=ASGITransport(app=fake), base_url="http://fake-llm")
+    options.setdefault("retry_base_seconds", 0.001)
+    return ClaudeClient(http, model="fake-model", max_tokens=64, **options)
+
+
+async def _reply(client: ClaudeClient) -> str:
+    return "".join([text async for text in client.stream_reply(HELLO)])
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = [100.0]
+    bucket = TokenBucket(rate=10, burst=3, clock=lambda: clock[0])
+    assert [round(bucket.reserve(), 3) for _ in range(5)] == [0.0, 0.0, 0.0, 0.1, 0.2]
+    clock[0] += 1.0
+    assert bucket.reserve() == 0.0
+
+
+def test_circuit_breaker_opens_and_recovers_through_half_open():
+    clock = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: clock[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock[0] += 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats.opened == 2
+    assert breaker.stats.rejected == 2
+
+
+@pytest.mark.asyncio
+async def test_overloaded_responses_are_retried():
+    fake = create_fake_claude_app(fail_first_requests=2)
+    client = _client(fake, max_retries=2)
+
+    assert await _reply(client) == "You said: hello"
+    assert fake.state.requests == 3
+    assert client.stats.retries == 2
+    assert client.breaker.state == "closed"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_breaker_fails_fast_once_open():
+    fake = create_fake_claude_app(fail_first_requests=100)
+    client = _client(fake, max_retries=1, breaker=CircuitBreaker(failure_threshold=2))
+
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            await _reply(client)
+    assert fake.state.requests == 4
+    with pytest.raises(LLMUnavailableError):
+        await _reply(client)
+    assert fake.state.requests == 4
+    assert client.stats.failures == 2
+    assert client.stats.rejected == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_errors_after_first_token_are_not_retried():
+    fake = create_fake_claude_app(fail_after_tokens=1)
+    client = _client(fake, max_retries=3)
+
+    with pytest.raises(LLMError):
+        await _reply(client)
+    assert fake.state.requests == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_and_excess_callers_time_out():
+    fake = create_fake_claude_app(token_delay=0.02)
+    client = _client(fake, max_concurrency=2, queue_timeout=5)
+
+    replies = await asyncio.gather(*(_reply(client) for _ in range(6)))
+    assert set(replies) == {"You said: hello"}
+    assert fake.state.max_in_flight == 2
+
+    slow_fake = create_fake_claude_app(first_token_delay=0.3)
+    slow = _client(slow_fake, max_concurrency=1, queue_timeout=0.05)
+    results = await asyncio.gather(_reply(slow), _reply(slow), return_exceptions=True)
+    assert sum(isinstance(result, LLMUnavailableError) for result in results) == 1
+    assert slow.stats.rejected == 1
+    await client.aclose()
+    await slow.aclose()
@@ -0,0 +1,40 @@
+"""Replica routing tests for services with a separate read session."""
+import pytest
+
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.analysis_service import AnalysisService
+from app.services.conversation_service import ConversationService
+
+
+@pytest.mark.asyncio
+async def test_history_reads_use_replica_and_writes_use_primary(db_session, read_session):
+    signup = UserCreate(email="replica@example.com", password="Password123")
+    user = await UserRepository(db_session).create(signup, password_hash="hashed")
+    replica_user = await UserRepository(read_session).create(signup, password_hash="hashed")
+    service = ConversationService(db_session, read_session=read_session)
+
+    written = await service.create_message(user.id, "Hello", "user")
+
+    assert await service.list_messages(user.id) == []
+    assert await service.get_messages_for_analysis(user.id, 25) == []
+    assert (await service.get_message(written.id)).message_text == "Hello"
+
+    replica_service = ConversationService(read_session)
+    await replica_service.create_message(replica_user.id, "Replicated", "user")
+    history = await service.list_messages(replica_user.id)
+    assert [message.message_text for message in history] == ["Replicated"]
+
+
+@pytest.mark.asyncio
+async def test_analysis_listing_uses_replica(db_session, read_session):
+    user = await UserRepository(db_session).create(
+        UserCreate(email="scores@example.com", password="Password123"), password_hash="hashed"
+    )
+    service = AnalysisService(db_session, read_session=read_session)
+
+    created = await service.create_result(user.id, chat_score=40)
+
+    assert await service.list_results(user.id) == []
+    assert (await service.get_result(created.id)).chat_score == 40
+    assert [r.chat_score for r in await AnalysisService(db_session).list_results(user.id)] == [40]
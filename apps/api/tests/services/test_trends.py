@@ -0,0 +1,158 @@
+"""Trend engine tests: O(1) updates, NumPy rebuilds and the graduation check."""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+
+from app.models.analysis import AnalysisResult
+from app.repositories.analysis import AnalysisRepository, ScoreHistory
+from app.repositories.analysis_trend import AnalysisTrendRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.analysis_service import AnalysisService
+from app.services.trends import TrendConfig, aggregate_trends, least_squares_slope
+
+CONFIG = TrendConfig()
+START = datetime(2026, 3, 2, 9, 30, tzinfo=timezone.utc)
+SUMS = ("analysis_count", "sum_t", "sum_tt", "sum_score", "sum_t_score")
+# (days after START, ChAT score): climbing from 6 to 12 over four weeks.
+IMPROVING = [(0, 6), (2.5, 7), (6, 7), (9, 9), (13, 10), (17, 11), (20, 10), (24, 12), (28, 12)]
+
+
+async def _user(db_session, name: str):
+    return await UserRepository(db_session).create(
+        UserCreate(email=f"{name}@example.com", password="Password123"), "hashed"
+    )
+
+
+async def _record_history(db_session, user_id, points) -> None:
+    """Insert results at the given times, folding each into the trend as it arrives."""
+
+    trends = AnalysisTrendRepository(db_session)
+    for days, score in points:
+        timestamp = START + timedelta(days=days)
+        await db_session.execute(
+            insert(AnalysisResult).values(user_id=user_id, chat_score=score, timestamp=timestamp)
+        )
+        await trends.record(user_id, score, timestamp, alpha=CONFIG.alpha, window=CONFIG.window)
+
+
+def _history(user_id, points) -> ScoreHistory:
+    times = [START + timedelta(days=days) for days, _ in points]
+    return ScoreHistory(
+        user_id,
+        times[0],
+        times[-1],
+        [time.timestamp() for time in times],
+        [score for _, score in points],
+    )
+
+
+def test_least_squares_slope_recovers_a_line():
+    t = np.array([0.0, 1.5, 4.0, 7.0])
+    scores = 0.5 * t + 6
+
+    slope = least_squares_slope(len(t), t.sum(), (t * t).sum(), scores.sum(), (t * scores).sum())
+
+    assert float(slope) == pytest.approx(0.5)
+    assert float(least_squares_slope(3, 0.0, 0.0, 30.0, 0.0)) == 0.0
+
+
+def test_aggregate_trends_segments_users():
+    rows = aggregate_trends(
+        [
+            _history("a", [(0, 4), (1, 5)]),
+            _history("b", [(0, 9)]),
+            _history("c", [(day, day + 1) for day in range(7)]),
+        ],
+        CONFIG,
+    )
+
+    assert [row["user_id"] for row in rows] == ["a", "b", "c"]
+    assert [row["recent_scores"] for row in rows] == [[4, 5], [9], [3, 4, 5, 6, 7]]
+    assert [row["ewma"] for row in rows[:2]] == pytest.approx([4 + CONFIG.alpha, 9])
+    slopes = least_squares_slope(*(np.array([row[c] for row in rows]) for c in SUMS))
+    assert slopes.tolist() == pytest.approx([1.0, 0.0, 1.0])
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_bulk_aggregate(db_session):
+    user = await _user(db_session, "trend-incremental")
+    await _record_history(db_session, user.id, IMPROVING)
+
+    trend = await AnalysisTrendRepository(db_session).get(user.id)
+    histories = await AnalysisRepository(db_session).score_histories([user.id])
+    [rebuilt] = aggregate_trends(histories, CONFIG)
+
+    assert trend.analysis_count == rebuilt["analysis_count"] == len(IMPROVING)
+    assert trend.recent_scores == rebuilt["recent_scores"] == [10, 11, 10, 12, 12]
+    assert (trend.first_seen, trend.last_seen) == (rebuilt["first_seen"], rebuilt["last_seen"])
+    for column in ("ewma", "sum_t", "sum_tt", "sum_score", "sum_t_score"):
+        assert getattr(trend, column) == pytest.approx(rebuilt[column]), column
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("points", "days_later", "ready"),
+    [
+        (IMPROVING, 0, True),
+        (IMPROVING[:4] + [(9.5, 11), (10, 11), (11, 12), (12, 12), (13, 12)], 0, False),
+        (IMPROVING[:4] + [(9.5, 11), (10, 11), (11, 12), (12, 12), (13, 12)], 8, True),
+        ([(0, 13), (6, 13), (12, 12), (18, 11), (24, 10), (28, 11)], 0, False),
+        (IMPROVING[:-1] + [(28, 9)], 0, False),
+    ],
+    ids=["improving", "too-soon", "engaged-long-enough", "declining", "recent-dip"],
+)
+async def test_graduation_check(db_session, points, days_later, ready):
+    user = await _user(db_session, "trend-graduation")
+    await _record_history(db_session, user.id, points)
+    now = START + timedelta(days=points[-1][0] + days_later)
+
+    summary = await AnalysisService(db_session).get_trend(user.id, now=now)
+
+    assert summary.graduation_ready is ready
+
+
+@pytest.mark.asyncio
+async def test_summary_reports_velocity_per_week(db_session):
+    user = await _user(db_session, "trend-velocity")
+    await _record_history(db_session, user.id, [(0, 6), (7, 7), (14, 8)])
+
+    summary = await AnalysisService(db_session).get_trend(user.id, now=START + timedelta(days=14))
+
+    assert summary.velocity == pytest.approx(1.0)
+    assert summary.window_mean == pytest.approx(7.0)
+    assert summary.engaged_days == pytest.approx(14.0)
+
+
+@pytest.mark.asyncio
+async def test_create_result_adds_one_statement(db_session, assert_max_queries):
+    user = await _user(db_session, "trend-create")
+    service = AnalysisService(db_session)
+
+    with assert_max_queries(2):
+        await service.create_result(user.id, chat_score=9)
+    await service.create_result(user.id, chat_score=11)
+
+    summary = await service.get_trend(user.id)
+    assert (summary.analysis_count, summary.window_mean) == (2, 10.0)
+    assert summary.ewma == pytest.approx(9 + CONFIG.alpha * 2)
+
+
+@pytest.mark.asyncio
+async def test_edits_and_deletes_rebuild_the_trend(db_session):
+    user = await _user(db_session, "trend-rebuild")
+    service = AnalysisService(db_session)
+    first = await service.create_result(user.id, chat_score=8)
+    second = await service.create_result(user.id, chat_score=10)
+
+    await service.update_result(second.id, chat_score=12)
+    assert (await service.get_trend(user.id)).window_mean == 10.0
+
+    await service.delete_result(first.id)
+    summary = await service.get_trend(user.id)
+    assert (summary.analysis_count, summary.ewma) == (1, 12.0)
+
+    await service.delete_result(second.id)
+    assert await service.get_trend(user.id) is None
@@ -0,0 +1,114 @@
+"""Nightly graduation job tests: chunked promotion, statement counts and resume."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.instrumentation import track_queries
+from app.models.user import User
+from app.repositories.analysis import ScoreHistory
+from app.repositories.analysis_trend import AnalysisTrendRepository
+from app.repositories.task_checkpoint import TaskCheckpointRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.trends import TrendConfig, aggregate_trends
+from app.tasks.graduation import CHECKPOINT_NAME, run_graduation
+
+CONFIG = TrendConfig()
+START = datetime(2026, 3, 2, tzinfo=timezone.utc)
+NOW = START + timedelta(days=30)
+READY = [(0, 7), (4, 9), (8, 10), (12, 11), (16, 11), (20, 12), (24, 12)]
+TOO_RECENT = [(20 + i, 12) for i in range(6)]
+LOW = [(0, 8), (7, 9), (14, 9), (21, 10), (28, 10)]
+
+
+def _factory(db_session):
+    return async_sessionmaker(
+        bind=db_session.bind, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+
+
+async def _users_with_trends(db_session, histories, *, stage: int = 1):
+    users = [
+        await UserRepository(db_session).create(
+            UserCreate(email=f"grad-{stage}-{i}@example.com", password="Password123", stage=stage),
+            "hashed",
+        )
+        for i in range(len(histories))
+    ]
+    times = [[START + timedelta(days=days) for days, _ in points] for points in histories]
+    await AnalysisTrendRepository(db_session).replace_many(
+        aggregate_trends(
+            [
+                ScoreHistory(
+                    user.id,
+                    at[0],
+                    at[-1],
+                    [t.timestamp() for t in at],
+                    [score for _, score in points],
+                )
+                for user, at, points in zip(users, times, histories, strict=True)
+            ],
+            CONFIG,
+        )
+    )
+    return users
+
+
+async def _stages(db_session, users) -> list[int]:
+    result = await db_session.execute(
+        select(User.id, User.stage).execution_options(populate_existing=True)
+    )
+    stages = dict(result.all())
+    return [stages[user.id] for user in users]
+
+
+@pytest.mark.asyncio
+async def test_promotes_ready_stage_one_users_in_chunks(db_session):
+    users = await _users_with_trends(db_session, [READY, TOO_RECENT, LOW, READY, READY])
+    [already] = await _users_with_trends(db_session, [READY], stage=2)
+
+    with track_queries() as stats:
+        run = await run_graduation(_factory(db_session), CONFIG, chunk_size=2, now=NOW)
+
+    assert await _stages(db_session, [*users, already]) == [2, 1, 1, 2, 2, 2]
+    assert (run.evaluated, run.promoted, run.chunks, run.resumed) == (5, 3, 3, False)
+    # Start (read + upsert), then per chunk a read, at most one UPDATE ... FROM (VALUES ...)
+    # and the checkpoint, then the empty read and the finish.
+    assert stats.statements <= 2 + 3 * 3 + 2
+    checkpoint = await TaskCheckpointRepository(db_session).get(CHECKPOINT_NAME)
+    assert (checkpoint.processed, checkpoint.changed) == (5, 3)
+    assert checkpoint.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint(db_session):
+    users = await _users_with_trends(db_session, [READY] * 5)
+    factory = _factory(db_session)
+    sessions = 0
+
+    def failing_factory():
+        nonlocal sessions
+        sessions += 1
+        if sessions == 3:  # the start, one chunk, then the database goes away
+            raise OperationalError("SELECT", {}, ConnectionRefusedError())
+        return factory()
+
+    with pytest.raises(OperationalError):
+        await run_graduation(failing_factory, CONFIG, chunk_size=2, now=NOW)
+    assert sorted(await _stages(db_session, users)) == [1, 1, 1, 2, 2]
+
+    later = NOW + timedelta(days=1)
+    run = await run_graduation(factory, CONFIG, chunk_size=2, now=later)
+
+    assert run.resumed and run.started_at == NOW
+    assert (run.evaluated, run.promoted) == (3, 3)
+    assert await _stages(db_session, users) == [2] * 5
+    checkpoint = await TaskCheckpointRepository(db_session).get(CHECKPOINT_NAME)
+    assert (checkpoint.processed, checkpoint.changed) == (5, 5)
+
+    fresh = await run_graduation(factory, CONFIG, chunk_size=2, now=later)
+    assert not fresh.resumed and fresh.started_at == later
+    assert (fresh.evaluated, fresh.promoted) == (0, 0)
@@ -0,0 +1,66 @@
+"""Bulk trend recompute tests."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.analysis import AnalysisResult
+from app.models.analysis_trend import AnalysisTrend
+from app.repositories.analysis_trend import AnalysisTrendRepository
+from app.repositories.user import UserRepository
+from app.schemas.user import UserCreate
+from app.services.trends import TrendConfig
+from app.tasks.trends import recompute_trends
+
+START = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_recompute_rebuilds_every_user_in_chunks(db_session):
+    users = [
+        await UserRepository(db_session).create(
+            UserCreate(email=f"recompute-{i}@example.com", password="Password123"), "hashed"
+        )
+        for i in range(5)
+    ]
+    await db_session.execute(
+        insert(AnalysisResult).values(
+            [
+                {
+                    "user_id": user.id,
+                    "chat_score": score,
+                    "timestamp": START + timedelta(days=score),
+                }
+                for i, user in enumerate(users)
+                for score in range(i + 1)
+            ]
+        )
+    )
+    # A stale row, as left by results written before the trends table existed.
+    config = TrendConfig()
+    await AnalysisTrendRepository(db_session).record(
+        users[2].id, 14, users[2].created_at, alpha=config.alpha, window=config.window
+    )
+    factory = async_sessionmaker(
+        bind=db_session.bind, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+
+    assert await recompute_trends(factory, config, chunk_size=2) == 5
+
+    trends = {
+        trend.user_id: trend
+        for trend in (
+            await db_session.execute(
+                select(AnalysisTrend).execution_options(populate_existing=True)
+            )
+        ).scalars()
+    }
+    assert {user.id: trends[user.id].analysis_count for user in users} == {
+        user.id: i + 1 for i, user in enumerate(users)
+    }
+    assert trends[users[2].id].sum_score == 0 + 1 + 2
+    assert trends[users[4].id].recent_scores == [0, 1, 2, 3, 4]
+
+    last = max(user.id for user in users)
+    assert await recompute_trends(factory, config, chunk_size=2, after=last) == 0
@@ -0,0 +1,255 @@
+"""Job queue worker tests."""
+import asyncio
+import importlib.util
+from datetime import timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.job import Job
+from app.repositories.job import ClaimedJob, JobRepository
+from app.tasks.worker import JOB_QUEUE_CHANNEL, JobWorker, QueueListener
+
+NOTIFY_MIGRATION = (
+    Path(__file__).resolve().parents[2] / "migrations" / "versions" / "0006_job_queue_notify.py"
+)
+
+
+def _run_migration(step: str):
+    """Apply ``upgrade``/``downgrade`` of the job_queue notify migration on a sync connection."""
+
+    spec = importlib.util.spec_from_file_location("job_queue_notify", NOTIFY_MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def run(connection) -> None:
+        with Operations.context(MigrationContext.configure(connection)):
+            getattr(module, step)()
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_and_retries_jobs(committed_session):
+    repo = JobRepository(committed_session)
+    ok_id = await repo.enqueue("test_job", {"fail": False})
+    failing_id = await repo.enqueue("test_job", {"fail": True}, retry_limit=1)
+    other_id = await repo.enqueue("other_job")
+    seen: list[ClaimedJob] = []
+
+    async def handler(job: ClaimedJob) -> None:
+        seen.append(job)
+        if job.data["fail"]:
+            raise RuntimeError("boom")
+
+    worker = JobWorker(
+        async_sessionmaker(committed_session.bind, expire_on_commit=False),
+        {"test_job": handler},
+        backoff_base=timedelta(seconds=30),
+    )
+
+    assert await worker.run_once() == 2
+    assert {job.id for job in seen} == {ok_id, failing_id}
+
+    jobs = {job.id: job for job in (await committed_session.execute(select(Job))).scalars()}
+    assert jobs[ok_id].completed_at is not None
+    assert jobs[failing_id].completed_at is None
+    assert jobs[failing_id].retry_count == 1
+    assert jobs[failing_id].start_after > jobs[failing_id].created_at + timedelta(seconds=25)
+    assert "boom" in jobs[failing_id].last_error
+    assert jobs[other_id].retry_count == 0
+
+    # Backed-off and unknown jobs are not due; nothing else gets claimed.
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_jobs_past_retry_limit_are_parked(committed_session):
+    repo = JobRepository(committed_session)
+    job_id = await repo.enqueue("test_job", retry_limit=0)
+
+    async def handler(job: ClaimedJob) -> None:
+        raise RuntimeError("permanent")
+
+    worker = JobWorker(async_sessionmaker(committed_session.bind), {"test_job": handler})
+    assert await worker.run_once() == 1
+
+    job = (await committed_session.execute(select(Job).where(Job.id == job_id))).scalar_one()
+    assert job.failed_at is not None
+    assert job.completed_at is None
+
+
+def test_backoff_is_exponential_and_capped():
+    worker = JobWorker(
+        async_sessionmaker(),
+        {"test_job": lambda job: None},
+        backoff_base=timedelta(seconds=5),
+        backoff_max=timedelta(seconds=60),
+    )
+
+    def attempt(retry_count: int) -> ClaimedJob:
+        return ClaimedJob(
+            id=uuid4(), name="test_job", data={}, retry_count=retry_count, retry_limit=20
+        )
+
+    assert worker.backoff_for(attempt(0)) == timedelta(seconds=5)
+    assert worker.backoff_for(attempt(2)) == timedelta(seconds=20)
+    assert worker.backoff_for(attempt(10)) == timedelta(seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_worker_refills_slots_while_a_slow_job_runs(committed_session):
+    repo = JobRepository(committed_session)
+    await repo.enqueue("test_job", {"slow": True}, priority=1)
+    fast_ids = {await repo.enqueue("test_job", {"slow": False}) for _ in range(3)}
+    release = asyncio.Event()
+    finished: set = set()
+    all_fast_done = asyncio.Event()
+
+    async def handler(job: ClaimedJob) -> None:
+        if job.data["slow"]:
+            await release.wait()
+            return
+        finished.add(job.id)
+        if finished == fast_ids:
+            all_fast_done.set()
+
+    worker = JobWorker(
+        async_sessionmaker(committed_session.bind, expire_on_commit=False),
+        {"test_job": handler},
+        concurrency=2,
+        batch_size=2,
+    )
+    stop = asyncio.Event()
+    running = asyncio.create_task(worker.run(stop))
+    try:
+        # With two slots and the slow job holding one, the other must be refilled twice.
+        await asyncio.wait_for(all_fast_done.wait(), timeout=5)
+    finally:
+        release.set()
+        stop.set()
+        await running
+
+    jobs = (await committed_session.execute(select(Job))).scalars().all()
+    assert len(jobs) == 4 and all(job.completed_at is not None for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_database_errors(committed_session):
+    repo = JobRepository(committed_session)
+    job_ids = {await repo.enqueue("test_job") for _ in range(2)}
+    done = asyncio.Event()
+    finished: set = set()
+
+    async def handler(job: ClaimedJob) -> None:
+        finished.add(job.id)
+        if finished == job_ids:
+            done.set()
+
+    worker = JobWorker(
+        async_sessionmaker(committed_session.bind, expire_on_commit=False),
+        {"test_job": handler},
+        batch_size=1,
+        poll_interval=0.01,
+        error_backoff=0.01,
+    )
+    claim, settle = worker._claim, worker._settle
+    failures = {"claim": 1, "settle": 1}
+
+    async def failing(step, original, *args):
+        if failures[step]:
+            failures[step] -= 1
+            raise OperationalError("SELECT", {}, ConnectionResetError())
+        return await original(*args)
+
+    worker._claim = lambda limit: failing("claim", claim, limit)
+    worker._settle = lambda results: failing("settle", settle, results)
+    stop = asyncio.Event()
+    running = asyncio.create_task(worker.run(stop))
+    try:
+        await asyncio.wait_for(done.wait(), timeout=5)
+    finally:
+        stop.set()
+        await asyncio.wait_for(running, timeout=5)
+
+    assert failures == {"claim": 0, "settle": 0}
+    jobs = (await committed_session.execute(select(Job))).scalars().all()
+    assert len(jobs) == 2 and all(job.completed_at is not None for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_worker_wakes_on_notification(committed_session):
+    engine = committed_session.bind
+    listener = QueueListener(engine)
+    await listener.start()
+    started = asyncio.Event()
+
+    async def handler(job: ClaimedJob) -> None:
+        started.set()
+
+    worker = JobWorker(
+        async_sessionmaker(engine, expire_on_commit=False),
+        {"test_job": handler},
+        idle_poll_interval=60,
+    )
+    stop = asyncio.Event()
+    running = asyncio.create_task(worker.run(stop, listener.wakeup))
+    try:
+        await asyncio.sleep(0.2)
+        await JobRepository(committed_session).enqueue("test_job")
+        await committed_session.execute(text(f"NOTIFY {JOB_QUEUE_CHANNEL}, 'test_job'"))
+        await asyncio.wait_for(started.wait(), timeout=5)
+    finally:
+        stop.set()
+        await running
+        await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_insert_trigger_wakes_listening_worker(committed_session):
+    engine = committed_session.bind
+    async with engine.begin() as conn:
+        await conn.run_sync(_run_migration("upgrade"))
+    listener = QueueListener(engine)
+    await listener.start()
+    try:
+        listener.wakeup.clear()
+        await JobRepository(committed_session).enqueue("test_job")
+        await asyncio.wait_for(listener.wakeup.wait(), timeout=5)
+
+        listener.wakeup.clear()
+        await JobRepository(committed_session).enqueue("test_job", delay=timedelta(hours=1))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(listener.wakeup.wait(), timeout=0.3)
+    finally:
+        await listener.close()
+        async with engine.begin() as conn:
+            await conn.run_sync(_run_migration("downgrade"))
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_after_losing_its_connection(committed_session):
+    listener = QueueListener(committed_session.bind, health_check_interval=0.1)
+    await listener.start()
+    try:
+        terminated = await committed_session.scalar(
+            text(
+                "SELECT count(pg_terminate_backend(pid)) FROM pg_stat_activity"
+                " WHERE datname = current_database() AND query LIKE 'LISTEN%job_queue%'"
+            )
+        )
+        assert terminated == 1
+
+        # Reconnecting sets wakeup for anything missed; then LISTEN must be live again.
+        await asyncio.wait_for(listener.wakeup.wait(), timeout=5)
+        listener.wakeup.clear()
+        await committed_session.execute(text(f"NOTIFY {JOB_QUEUE_CHANNEL}, 'test_job'"))
+        await asyncio.wait_for(listener.wakeup.wait(), timeout=5)
+    finally:
+        await listener.close()
@@ -0,0 +1,113 @@
+"""Rate limiter backend tests."""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.models.rate_limit import RateLimitBucket
+from app.utils import rate_limiter as rate_limiter_module
+from app.utils.rate_limiter import PostgresRateLimiter, RateLimiter, create_rate_limiter
+
+
+@pytest.mark.asyncio
+async def test_memory_limiter_bursts_then_refills(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(limit=3, window_seconds=60)
+
+    assert [await limiter.allow("ip") for _ in range(4)] == [True, True, True, False]
+    assert await limiter.get_remaining("ip") == 0
+    assert await limiter.allow("other")
+
+    clock[0] += 20  # one emission interval (60s / 3)
+    assert await limiter.get_remaining("ip") == 1
+    assert await limiter.allow("ip")
+    assert not await limiter.allow("ip")
+
+    clock[0] += 60
+    assert await limiter.get_remaining("ip") == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_limiter_caps_tracked_keys(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(limit=2, window_seconds=60, max_keys=3)
+
+    for key in ("a", "b", "c"):
+        assert await limiter.allow(key)
+    assert await limiter.allow("a")  # refreshes "a", leaving "b" least recently used
+    assert await limiter.allow("d")
+
+    assert limiter.stats.keys == 3
+    assert limiter.stats.evictions == 1
+    assert await limiter.get_remaining("b") == 2
+    assert not await limiter.allow("a")
+    assert limiter.stats.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_limiter_sweeps_expired_keys(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(limit=2, window_seconds=60)
+
+    for key in range(10):
+        assert await limiter.allow(str(key))
+    assert limiter.stats.keys == 10
+
+    clock[0] += 31  # past every TAT
+    assert limiter.sweep() == 10
+    assert limiter.stats.keys == 0
+    assert limiter.stats.expirations == 10
+    assert limiter.stats.evictions == 0
+
+
+@pytest.mark.asyncio
+async def test_postgres_limiter_is_atomic_under_concurrency(committed_session):
+    limiter = PostgresRateLimiter(committed_session.bind, limit=5, window_seconds=60, scope="test")
+
+    results = await asyncio.gather(*(limiter.allow("10.0.0.1") for _ in range(20)))
+
+    assert results.count(True) == 5
+    assert await limiter.get_remaining("10.0.0.1") == 0
+    assert await limiter.get_remaining("10.0.0.2") == 5
+
+    other_scope = PostgresRateLimiter(
+        committed_session.bind, limit=5, window_seconds=60, scope="other"
+    )
+    assert await other_scope.allow("10.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_postgres_sweeper_purges_expired_buckets(committed_session):
+    committed_session.add_all(
+        [
+            RateLimitBucket(key="test:expired", tat=0.0),
+            RateLimitBucket(key="other:expired", tat=0.0),
+        ]
+    )
+    await committed_session.commit()
+    limiter = PostgresRateLimiter(committed_session.bind, limit=5, window_seconds=60, scope="test")
+    assert await limiter.allow("live")
+
+    limiter.start_sweeper(0.05)
+    try:
+        for _ in range(100):
+            if limiter.stats.expirations:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await limiter.stop_sweeper()
+
+    keys = await committed_session.scalars(select(RateLimitBucket.key))
+    assert sorted(keys) == ["other:expired", "test:live"]
+    assert limiter.stats.expirations == 1
+
+
+def test_create_rate_limiter_selects_backend():
+    assert isinstance(create_rate_limiter("memory", 10, 60, scope="signup"), RateLimiter)
+    with pytest.raises(ValueError):
+        create_rate_limiter("postgres", 10, 60, scope="signup")
+    with pytest.raises(ValueError):
+        create_rate_limiter("redis", 10, 60, scope="signup")